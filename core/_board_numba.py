@@ -0,0 +1,110 @@
+# Kernels compilados com Numba para as análises do tabuleiro (opcionais)
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def candidates_bitmask(board, box_idx):
+        """
+        Calcula a máscara de candidatos de cada célula (bit v-1 para o número v).
+
+        Args:
+            board: Matriz N x N do tabuleiro (0 para células vazias)
+            box_idx: Matriz N x N com o índice do quadrante de cada célula
+
+        Returns:
+            np.ndarray: Matriz uint16 (N x N); células preenchidas têm máscara 0
+        """
+        n = board.shape[0]
+        row_mask = np.zeros(n, dtype=np.uint16)
+        col_mask = np.zeros(n, dtype=np.uint16)
+        box_mask = np.zeros(n, dtype=np.uint16)
+
+        # Números usados em cada linha, coluna e quadrante
+        for r in range(n):
+            for c in range(n):
+                value = board[r, c]
+                if value > 0:
+                    bit = np.uint16(1 << (np.int64(value) - 1))
+                    row_mask[r] |= bit
+                    col_mask[c] |= bit
+                    box_mask[box_idx[r, c]] |= bit
+
+        full_mask = np.uint16((1 << n) - 1)
+        result = np.zeros((n, n), dtype=np.uint16)
+        for r in range(n):
+            for c in range(n):
+                if board[r, c] == 0:
+                    used = row_mask[r] | col_mask[c] | box_mask[box_idx[r, c]]
+                    result[r, c] = ~used & full_mask
+
+        return result
+
+    @njit(cache=True)
+    def is_valid(board, box_idx):
+        """
+        Verifica, em uma única passada, se algum número se repete em uma unidade.
+
+        Args:
+            board: Matriz N x N do tabuleiro (0 para células vazias)
+            box_idx: Matriz N x N com o índice do quadrante de cada célula
+
+        Returns:
+            bool: True se não há repetições em linhas, colunas e quadrantes
+        """
+        n = board.shape[0]
+        row_mask = np.zeros(n, dtype=np.uint16)
+        col_mask = np.zeros(n, dtype=np.uint16)
+        box_mask = np.zeros(n, dtype=np.uint16)
+
+        for r in range(n):
+            for c in range(n):
+                value = board[r, c]
+                if value > 0:
+                    # Valores de 1 a 16 (`SudokuBoard.is_valid` trata os demais antes)
+                    bit = np.uint16(1 << (np.int64(value) - 1))
+                    box = box_idx[r, c]
+                    if (row_mask[r] | col_mask[c] | box_mask[box]) & bit:
+                        return False
+                    row_mask[r] |= bit
+                    col_mask[c] |= bit
+                    box_mask[box] |= bit
+
+        return True
+
+    @njit(cache=True)
+    def unit_value_counts(board, box_idx):
+        """
+        Conta as ocorrências de cada número em cada unidade.
+
+        Args:
+            board: Matriz N x N do tabuleiro (0 para células vazias)
+            box_idx: Matriz N x N com o índice do quadrante de cada célula
+
+        Returns:
+            np.ndarray: Matriz (3N x 256) de contagens; as linhas são as N linhas,
+            as N colunas e os N quadrantes, e a coluna v + 128 conta o número v
+            (qualquer valor int8 diferente de 0)
+        """
+        n = board.shape[0]
+        counts = np.zeros((3 * n, 256), dtype=np.int32)
+
+        for r in range(n):
+            for c in range(n):
+                value = np.int64(board[r, c])
+                if value != 0:
+                    column = value + 128
+                    counts[r, column] += 1
+                    counts[n + c, column] += 1
+                    counts[2 * n + box_idx[r, c], column] += 1
+
+        return counts
+else:
+    candidates_bitmask = None
+    is_valid = None
+    unit_value_counts = None
@@ -0,0 +1,151 @@
+# Solver clássico (backtracking com máscaras de bits) usado como referência exata
+import numpy as np
+
+from core.sudoku_board import _unit_layout
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """
+        Substituto de numba.njit: sem Numba o kernel roda como Python puro.
+        """
+        def decorator(function):
+            return function
+        return decorator
+
+@njit(cache=True)
+def _popcount(mask):
+    """
+    Conta os bits ligados de uma máscara.
+    """
+    count = 0
+    while mask:
+        mask &= mask - 1
+        count += 1
+    return count
+
+@njit(cache=True)
+def solve_bitmask(board, box_idx):
+    """
+    Resolve o tabuleiro no próprio array com backtracking e escolha da célula
+    mais restrita (menor número de candidatos) a cada passo.
+
+    Args:
+        board: Matriz N x N int8 (0 para células vazias); recebe a solução
+        box_idx: Matriz N x N com o índice do quadrante de cada célula
+
+    Returns:
+        bool: True se uma solução foi encontrada (e escrita em `board`)
+    """
+    n = board.shape[0]
+    cells = n * n
+    full_mask = (1 << n) - 1
+    row_mask = np.zeros(n, dtype=np.int64)
+    col_mask = np.zeros(n, dtype=np.int64)
+    box_mask = np.zeros(n, dtype=np.int64)
+
+    # Máscaras iniciais; repetições ou valores fora de 1..N tornam o tabuleiro insolúvel
+    for r in range(n):
+        for c in range(n):
+            value = int(board[r, c])
+            if value != 0:
+                if value < 0 or value > n:
+                    return False
+                bit = 1 << (value - 1)
+                box = box_idx[r, c]
+                if (row_mask[r] | col_mask[c] | box_mask[box]) & bit:
+                    return False
+                row_mask[r] |= bit
+                col_mask[c] |= bit
+                box_mask[box] |= bit
+
+    # Pilha de decisões: posição da célula e candidatos ainda não testados
+    stack_pos = np.zeros(cells, dtype=np.int64)
+    stack_mask = np.zeros(cells, dtype=np.int64)
+    depth = 0
+
+    while True:
+        # Escolher a célula vazia com menos candidatos
+        best = -1
+        best_count = n + 1
+        best_mask = 0
+        for pos in range(cells):
+            r = pos // n
+            c = pos % n
+            if board[r, c] == 0:
+                mask = full_mask & ~(row_mask[r] | col_mask[c] | box_mask[box_idx[r, c]])
+                count = _popcount(mask)
+                if count < best_count:
+                    best = pos
+                    best_count = count
+                    best_mask = mask
+                    if count == 0:
+                        break
+
+        if best == -1:
+            return True  # Nenhuma célula vazia: resolvido
+
+        if best_count > 0:
+            stack_pos[depth] = best
+            stack_mask[depth] = best_mask
+            depth += 1
+
+        # Colocar o próximo candidato do topo da pilha, desfazendo decisões esgotadas
+        placed = False
+        while depth > 0:
+            pos = stack_pos[depth - 1]
+            r = pos // n
+            c = pos % n
+            box = box_idx[r, c]
+
+            value = int(board[r, c])
+            if value != 0:
+                bit = 1 << (value - 1)
+                row_mask[r] ^= bit
+                col_mask[c] ^= bit
+                box_mask[box] ^= bit
+                board[r, c] = 0
+
+            mask = stack_mask[depth - 1]
+            if mask == 0:
+                depth -= 1
+                continue
+
+            bit = mask & -mask
+            stack_mask[depth - 1] = mask ^ bit
+
+            value = 1
+            while (bit >> (value - 1)) != 1:
+                value += 1
+
+            board[r, c] = value
+            row_mask[r] |= bit
+            col_mask[c] |= bit
+            box_mask[box] |= bit
+            placed = True
+            break
+
+        if not placed:
+            return False
+
+def solve_board(board_data):
+    """
+    Resolve um tabuleiro com o solver exato, sem alterar o original.
+
+    Args:
+        board_data: SudokuBoard ou array N x N
+
+    Returns:
+        np.ndarray: Matriz N x N int8 com a solução, ou None se não houver solução
+    """
+    board_array = getattr(board_data, 'board', board_data)
+    solution = np.array(board_array, dtype=np.int8, order='C')
+    box_idx = _unit_layout(solution.shape[0])[0]
+
+    if solve_bitmask(solution, box_idx):
+        return solution
+    return None
@@ -1,16 +1,57 @@
 # Memory system to track applied heuristics and decisions
 from typing import Dict, List, Tuple, Any
+from collections import deque
+import json
+import struct
 import time
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Capacidade inicial dos arrays de registros (dobrada quando necessário)
+_INITIAL_CAPACITY = 1024
+
+# Quantidade de usos recentes de heurísticas mantidos para consulta rápida
+_RECENT_HEURISTICS = 32
+
+# Movimentos empacotados em 16 bytes: row, col, value, success, confidence, timestamp
+_MOVE_STRUCT = struct.Struct('<bbbBfq')
+_MOVE_DTYPE = np.dtype([
+    ('row', np.int8),
+    ('col', np.int8),
+    ('value', np.int8),
+    ('success', np.uint8),
+    ('confidence', '<f4'),
+    ('timestamp', '<i8'),
+])
+
+# Campos (atributo, dtype) dos usos de heurísticas, armazenados como estrutura de arrays
+_HEURISTIC_FIELDS = (
+    ('_heur_name_id', np.int16),
+    ('_heur_row', np.int8),
+    ('_heur_col', np.int8),
+    ('_heur_val', np.int8),
+    ('_heur_ts', np.int64),
+)
 
 class MemorySystem:
     """
     Sistema de memória para armazenar e rastrear heurísticas aplicadas,
     decisões tomadas e histórico de movimentos no Sudoku.
+
+    Usos de heurísticas são guardados como estrutura de arrays (um array NumPy
+    por campo) e movimentos como registros de 16 bytes em um único buffer;
+    `moves_history` e `heuristics_used` montam as listas de dicionários apenas
+    quando consultados. Os timestamps são
+    inteiros em nanossegundos de `time.perf_counter_ns()` (relógio monotônico).
     """
-    
+
     def __init__(self):
-        self.heuristics_used = []  # Lista de heurísticas aplicadas
-        self.moves_history = []    # Histórico de movimentos
+        self._init_records()
         self.decisions_log = []    # Log de decisões
         self.performance_stats = {
             'total_moves': 0,
@@ -19,13 +60,142 @@ class MemorySystem:
             'start_time': None,
             'end_time': None
         }
-        
+
+    def _init_records(self):
+        """
+        Aloca o buffer de movimentos e os arrays de heurísticas
+        """
+        for name, dtype in _HEURISTIC_FIELDS:
+            setattr(self, name, np.empty(_INITIAL_CAPACITY, dtype=dtype))
+        self._moves_buf = bytearray()
+        self._moves_len = 0
+        self._heur_len = 0
+
+        # Agregados mantidos incrementalmente: usos e sucessos por heurística e pares consecutivos
+        self._heur_usage_counts = {}
+        self._heur_success_counts = {}
+        self._heur_pair_counts = {}
+
+        # Posições com movimento bem-sucedido e usos ainda sem sucesso por posição
+        self._successful_positions = set()
+        self._pending_heuristics_by_pos = {}
+
+        # Índices dos usos de heurísticas mais recentes
+        self._recent_heuristics = deque(maxlen=_RECENT_HEURISTICS)
+
+        # Nomes de heurísticas internados: id -> nome e nome -> id
+        self._heur_names = []
+        self._heur_name_index = {}
+
+    def _ensure_capacity(self, fields, length: int):
+        """
+        Dobra a capacidade dos arrays de um grupo de campos quando estão cheios
+        """
+        if length < len(getattr(self, fields[0][0])):
+            return
+
+        for name, dtype in fields:
+            old = getattr(self, name)
+            new = np.empty(2 * len(old), dtype=dtype)
+            new[:length] = old[:length]
+            setattr(self, name, new)
+
+    def _intern_heuristic(self, heuristic_name: str) -> int:
+        """
+        Retorna o id numérico de uma heurística, registrando-a se for nova
+        """
+        name_id = self._heur_name_index.get(heuristic_name)
+        if name_id is None:
+            name_id = len(self._heur_names)
+            self._heur_names.append(heuristic_name)
+            self._heur_name_index[heuristic_name] = name_id
+        return name_id
+
+    def _append_heuristic(self, heuristic_name: str, position: Tuple[int, int], value: int, timestamp: int):
+        """
+        Acrescenta um uso de heurística aos arrays (sem atualizar estatísticas)
+        """
+        i = self._heur_len
+        self._ensure_capacity(_HEURISTIC_FIELDS, i)
+
+        if i > 0:
+            pair = (self._heur_names[self._heur_name_id[i - 1]], heuristic_name)
+            self._heur_pair_counts[pair] = self._heur_pair_counts.get(pair, 0) + 1
+
+        self._heur_name_id[i] = self._intern_heuristic(heuristic_name)
+        self._heur_row[i], self._heur_col[i] = position
+        self._heur_val[i] = value
+        self._heur_ts[i] = timestamp
+        self._heur_len = i + 1
+        self._recent_heuristics.append(i)
+
+        self._heur_usage_counts[heuristic_name] = self._heur_usage_counts.get(heuristic_name, 0) + 1
+        self._heur_success_counts.setdefault(heuristic_name, 0)
+
+        pos = (int(position[0]), int(position[1]))
+        if pos in self._successful_positions:
+            self._heur_success_counts[heuristic_name] += 1
+        else:
+            self._pending_heuristics_by_pos.setdefault(pos, []).append(heuristic_name)
+
+    def _append_move(self, position: Tuple[int, int], value: int, confidence: float, success: bool, timestamp: int):
+        """
+        Acrescenta um movimento ao buffer (sem atualizar estatísticas)
+        """
+        i = self._moves_len
+        self._moves_buf += _MOVE_STRUCT.pack(position[0], position[1], value, success, confidence, timestamp)
+        self._moves_len = i + 1
+
+        pos = (int(position[0]), int(position[1]))
+        if success and pos not in self._successful_positions:
+            # Usos de heurísticas nesta posição passam a contar como bem-sucedidos
+            self._successful_positions.add(pos)
+            for heuristic_name in self._pending_heuristics_by_pos.pop(pos, ()):
+                self._heur_success_counts[heuristic_name] += 1
+
+    def _heuristic_record(self, i: int) -> Dict[str, Any]:
+        """
+        Monta o dicionário de um uso de heurística a partir dos arrays
+        """
+        return {
+            'heuristic': self._heur_names[self._heur_name_id[i]],
+            'position': (int(self._heur_row[i]), int(self._heur_col[i])),
+            'value': int(self._heur_val[i]),
+            'timestamp': int(self._heur_ts[i])
+        }
+
+    def _move_record(self, fields: Tuple) -> Dict[str, Any]:
+        """
+        Monta o dicionário de um movimento a partir de seus campos empacotados
+        """
+        row, col, value, success, confidence, timestamp = fields
+        return {
+            'position': (row, col),
+            'value': value,
+            'confidence': confidence,
+            'success': bool(success),
+            'timestamp': timestamp
+        }
+
+    @property
+    def heuristics_used(self) -> List[Dict]:
+        """
+        Lista de heurísticas aplicadas (montada a partir dos arrays)
+        """
+        return [self._heuristic_record(i) for i in range(self._heur_len)]
+
+    @property
+    def moves_history(self) -> List[Dict]:
+        """
+        Histórico de movimentos (decodificado a partir do buffer)
+        """
+        return [self._move_record(fields) for fields in _MOVE_STRUCT.iter_unpack(self._moves_buf)]
+
     def clear_memory(self):
         """
         Limpa toda a memória do sistema
         """
-        self.heuristics_used.clear()
-        self.moves_history.clear()
+        self._init_records()
         self.decisions_log.clear()
         self.performance_stats = {
             'total_moves': 0,
@@ -34,58 +204,43 @@ class MemorySystem:
             'start_time': None,
             'end_time': None
         }
-        
+
     def add_heuristic_usage(self, heuristic_name: str, position: Tuple[int, int], value: int):
         """
         Registra o uso de uma heurística
-        
+
         Args:
             heuristic_name: nome da heurística usada
             position: posição (row, col) onde foi aplicada
             value: valor colocado
         """
-        usage_record = {
-            'heuristic': heuristic_name,
-            'position': position,
-            'value': value,
-            'timestamp': time.time()
-        }
-        
-        self.heuristics_used.append(usage_record)
-        
+        self._append_heuristic(heuristic_name, position, value, time.perf_counter_ns())
+
         # Atualizar estatísticas
         if heuristic_name not in self.performance_stats['heuristics_count']:
             self.performance_stats['heuristics_count'][heuristic_name] = 0
         self.performance_stats['heuristics_count'][heuristic_name] += 1
-        
+
     def add_move(self, position: Tuple[int, int], value: int, confidence: float = 1.0, success: bool = True):
         """
         Registra um movimento feito
-        
+
         Args:
             position: posição (row, col) do movimento
             value: valor colocado
             confidence: confiança na decisão (0-1)
             success: se o movimento foi bem-sucedido
         """
-        move_record = {
-            'position': position,
-            'value': value,
-            'confidence': confidence,
-            'success': success,
-            'timestamp': time.time()
-        }
-        
-        self.moves_history.append(move_record)
+        self._append_move(position, value, confidence, success, time.perf_counter_ns())
         self.performance_stats['total_moves'] += 1
-        
+
         if success:
             self.performance_stats['successful_moves'] += 1
-            
+
     def add_decision(self, decision_type: str, context: Dict[str, Any], result: Any):
         """
         Registra uma decisão tomada pelo sistema
-        
+
         Args:
             decision_type: tipo da decisão (ex: 'heuristic_selection', 'value_choice')
             context: contexto da decisão
@@ -95,114 +250,116 @@ class MemorySystem:
             'type': decision_type,
             'context': context,
             'result': result,
-            'timestamp': time.time()
+            'timestamp': time.perf_counter_ns()
         }
-        
+
         self.decisions_log.append(decision_record)
-        
+
     def start_session(self):
         """
         Inicia uma nova sessão de resolução
         """
-        self.performance_stats['start_time'] = time.time()
-        
+        self.performance_stats['start_time'] = time.perf_counter_ns()
+
     def end_session(self):
         """
         Finaliza a sessão atual
         """
-        self.performance_stats['end_time'] = time.time()
-        
+        self.performance_stats['end_time'] = time.perf_counter_ns()
+
     def get_session_duration(self) -> float:
         """
         Retorna a duração da sessão em segundos
         """
-        if self.performance_stats['start_time'] and self.performance_stats['end_time']:
-            return self.performance_stats['end_time'] - self.performance_stats['start_time']
+        start_ns = self.performance_stats['start_time']
+        end_ns = self.performance_stats['end_time']
+        if start_ns is not None and end_ns is not None:
+            return (end_ns - start_ns) * 1e-9
         return 0.0
-        
+
     def get_heuristic_effectiveness(self, heuristic_name: str) -> Dict[str, float]:
         """
         Calcula a efetividade de uma heurística específica
-        
+
         Args:
             heuristic_name: nome da heurística
-            
+
         Returns:
             dicionário com estatísticas de efetividade
         """
-        heuristic_moves = [h for h in self.heuristics_used if h['heuristic'] == heuristic_name]
-        
-        if not heuristic_moves:
+        usage_count = self._heur_usage_counts.get(heuristic_name, 0)
+
+        if usage_count == 0:
             return {'usage_count': 0, 'success_rate': 0.0}
-            
-        # Correlacionar com movimentos bem-sucedidos
-        successful_moves = 0
-        for h_move in heuristic_moves:
-            # Verificar se há movimento correspondente bem-sucedido
-            matching_moves = [m for m in self.moves_history 
-                            if m['position'] == h_move['position'] and m['success']]
-            if matching_moves:
-                successful_moves += 1
-                
-        success_rate = successful_moves / len(heuristic_moves) if heuristic_moves else 0.0
-        
+
+        # Usos com movimento bem-sucedido na mesma posição (contados incrementalmente)
+        successful_moves = self._heur_success_counts[heuristic_name]
+
+        success_rate = successful_moves / usage_count
+
         return {
-            'usage_count': len(heuristic_moves),
+            'usage_count': usage_count,
             'success_rate': success_rate,
-            'avg_confidence': sum(m.get('confidence', 1.0) for m in heuristic_moves) / len(heuristic_moves)
+            # Usos de heurísticas não registram confiança (equivale a 1.0)
+            'avg_confidence': 1.0
         }
-        
+
     def get_memory_summary(self) -> Dict[str, Any]:
         """
         Retorna um resumo completo da memória
         """
         return {
-            'heuristics_count': len(self.heuristics_used),
-            'moves_count': len(self.moves_history),
+            'heuristics_count': self._heur_len,
+            'moves_count': self._moves_len,
             'decisions_count': len(self.decisions_log),
             'performance_stats': self.performance_stats,
             'session_duration': self.get_session_duration(),
             'heuristic_breakdown': self.performance_stats['heuristics_count'],
-            'success_rate': (self.performance_stats['successful_moves'] / 
+            'success_rate': (self.performance_stats['successful_moves'] /
                            max(self.performance_stats['total_moves'], 1)) * 100
         }
-        
+
     def get_recent_heuristics(self, count: int = 5) -> List[Dict]:
         """
         Retorna as heurísticas mais recentemente usadas
-        
+
         Args:
             count: número de heurísticas a retornar
-            
+
         Returns:
             lista das heurísticas mais recentes
         """
-        return self.heuristics_used[-count:] if self.heuristics_used else []
-        
+        if 0 < count <= _RECENT_HEURISTICS:
+            indices = list(self._recent_heuristics)[-count:]
+        else:
+            indices = range(self._heur_len)[-count:]
+
+        return [self._heuristic_record(i) for i in indices]
+
     def get_pattern_analysis(self) -> Dict[str, Any]:
         """
         Analisa padrões no uso de heurísticas
         """
-        if not self.heuristics_used:
+        if self._heur_len == 0:
             return {'patterns': [], 'most_common': None}
-            
-        # Contar sequências de heurísticas
-        sequences = []
-        for i in range(len(self.heuristics_used) - 1):
-            current = self.heuristics_used[i]['heuristic']
-            next_h = self.heuristics_used[i + 1]['heuristic']
-            sequences.append((current, next_h))
-            
+
+        # Sequências de heurísticas (as contagens por par são mantidas incrementalmente)
+        name_ids = self._heur_name_id[:self._heur_len].tolist()
+        sequences = [(self._heur_names[current], self._heur_names[next_h])
+                     for current, next_h in zip(name_ids[:-1], name_ids[1:])]
+
         # Encontrar a heurística mais comum
         heuristic_counts = self.performance_stats['heuristics_count']
         most_common = max(heuristic_counts.items(), key=lambda x: x[1]) if heuristic_counts else None
-        
+
         return {
             'sequences': sequences,
+            'sequence_counts': [(current, next_h, count)
+                                for (current, next_h), count in self._heur_pair_counts.items()],
             'most_common': most_common,
             'total_unique_heuristics': len(heuristic_counts)
         }
-        
+
     def export_memory(self) -> Dict[str, Any]:
         """
         Exporta toda a memória para um dicionário
@@ -215,16 +372,92 @@ class MemorySystem:
             'summary': self.get_memory_summary(),
             'patterns': self.get_pattern_analysis()
         }
-        
+
+    def export_memory_json(self, path: str):
+        """
+        Salva a memória exportada em um arquivo JSON (usa orjson quando disponível)
+
+        Args:
+            path: caminho do arquivo de saída
+        """
+        memory_data = self.export_memory()
+
+        if ORJSON_AVAILABLE:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(memory_data, option=orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(path, 'w') as f:
+                json.dump(memory_data, f)
+
+    def export_memory_npz(self, path: str):
+        """
+        Salva movimentos e heurísticas diretamente como arrays em um arquivo .npz compactado
+
+        Args:
+            path: caminho do arquivo de saída
+        """
+        moves = np.frombuffer(bytes(self._moves_buf), dtype=_MOVE_DTYPE)
+        n = self._heur_len
+
+        np.savez_compressed(
+            path,
+            moves_row=moves['row'],
+            moves_col=moves['col'],
+            moves_val=moves['value'],
+            moves_success=moves['success'].astype(np.bool_),
+            moves_conf=moves['confidence'],
+            moves_ts=moves['timestamp'],
+            heur_name_ids=self._heur_name_id[:n],
+            heur_row=self._heur_row[:n],
+            heur_col=self._heur_col[:n],
+            heur_val=self._heur_val[:n],
+            heur_ts=self._heur_ts[:n],
+            heur_names=np.asarray(self._heur_names, dtype=str),
+            decisions_log=np.asarray(json.dumps(self.decisions_log, default=str)),
+            performance_stats=np.asarray(json.dumps(self.performance_stats))
+        )
+
+    def import_memory_npz(self, path: str):
+        """
+        Carrega a memória de um arquivo gerado por `export_memory_npz`
+
+        Args:
+            path: caminho do arquivo .npz
+        """
+        self._init_records()
+
+        with np.load(path) as data:
+            names = data['heur_names'].tolist()
+            for name_id, row, col, value, timestamp in zip(data['heur_name_ids'].tolist(), data['heur_row'].tolist(),
+                                                           data['heur_col'].tolist(), data['heur_val'].tolist(),
+                                                           data['heur_ts'].tolist()):
+                self._append_heuristic(names[name_id], (row, col), value, timestamp)
+
+            for row, col, value, confidence, success, timestamp in zip(data['moves_row'].tolist(), data['moves_col'].tolist(),
+                                                                        data['moves_val'].tolist(), data['moves_conf'].tolist(),
+                                                                        data['moves_success'].tolist(), data['moves_ts'].tolist()):
+                self._append_move((row, col), value, confidence, success, timestamp)
+
+            self.decisions_log = json.loads(str(data['decisions_log']))
+            self.performance_stats = json.loads(str(data['performance_stats']))
+
     def import_memory(self, memory_data: Dict[str, Any]):
         """
         Importa dados de memória de um dicionário
-        
+
         Args:
             memory_data: dados de memória para importar
         """
-        self.heuristics_used = memory_data.get('heuristics_used', [])
-        self.moves_history = memory_data.get('moves_history', [])
+        self._init_records()
+
+        for record in memory_data.get('heuristics_used', []):
+            self._append_heuristic(record['heuristic'], tuple(record['position']),
+                                   record['value'], record['timestamp'])
+
+        for record in memory_data.get('moves_history', []):
+            self._append_move(tuple(record['position']), record['value'], record['confidence'],
+                              record['success'], int(record['timestamp']))
+
         self.decisions_log = memory_data.get('decisions_log', [])
         self.performance_stats = memory_data.get('performance_stats', {
             'total_moves': 0,
@@ -232,4 +465,4 @@ class MemorySystem:
             'heuristics_count': {},
             'start_time': None,
             'end_time': None
-        }) 
\ No newline at end of file
+        })
@@ -1,11 +1,74 @@
 # Sudoku board representation and basic operations
+import functools
 import numpy as np
 import torch
 
+from core._board_numba import candidates_bitmask as _numba_candidates_bitmask
+from core._board_numba import is_valid as _numba_is_valid
+from core._board_numba import unit_value_counts as _numba_unit_value_counts
+
+def _cached_by_version(method):
+    """
+    Memoriza o resultado de um método sem argumentos enquanto o tabuleiro não muda.
+    
+    O cache é por instância e é invalidado sempre que `_version` é incrementada
+    (por exemplo, via `set_cell`).
+    """
+    name = method.__name__
+    
+    @functools.wraps(method)
+    def wrapper(self):
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == self._version:
+            return entry[1]
+        
+        result = method(self)
+        self._cache[name] = (self._version, result)
+        return result
+    
+    return wrapper
+
+@functools.lru_cache(maxsize=None)
+def _unit_layout(size):
+    """
+    Calcula (uma vez por tamanho) os índices das unidades de um tabuleiro N x N.
+    
+    Os arrays são somente leitura, pois são compartilhados entre instâncias.
+    
+    Args:
+        size: Tamanho do tabuleiro (4 ou 9)
+        
+    Returns:
+        tuple: (box_idx, box_indices, unit_index, unit_names)
+    """
+    box_size = int(np.sqrt(size))
+    
+    # Índice do quadrante de cada célula
+    indices = np.arange(size)
+    box_idx = (indices[:, None] // box_size) * box_size + indices[None, :] // box_size
+    
+    # Índices (na matriz achatada) das células de cada quadrante, em ordem de leitura
+    box_indices = np.argsort(box_idx.ravel(), kind='stable').reshape(size, size)
+    
+    # Índices das células de cada unidade: linhas, colunas e quadrantes
+    cells = np.arange(size * size).reshape(size, size)
+    unit_index = np.concatenate([cells, cells.T, box_indices])
+    unit_names = tuple([f"linha {i}" for i in range(size)] +
+                       [f"coluna {i}" for i in range(size)] +
+                       [f"quadrante ({i // box_size}, {i % box_size})" for i in range(size)])
+    
+    for array in (box_idx, box_indices, unit_index):
+        array.setflags(write=False)
+    
+    return box_idx, box_indices, unit_index, unit_names
+
 class SudokuBoard:
     """
     Classe para representação e operações básicas do tabuleiro Sudoku.
     Responsável por análise imediata e determinística do estado atual.
+    
+    Os resultados das análises são memorizados até a próxima alteração feita via
+    `set_cell`. Escritas diretas em `self.board[...]` não invalidam o cache.
     """
     
     def __init__(self, board_data):
@@ -15,15 +78,109 @@ class SudokuBoard:
         Args:
             board_data: Lista de listas ou array numpy com dados do tabuleiro
         """
-        if isinstance(board_data, list):
-            # Converter lista de strings para inteiros
-            self.board = np.array([[int(cell) for cell in row] for row in board_data], dtype=int)
+        if isinstance(board_data, np.ndarray) or (
+                isinstance(board_data, list) and board_data and isinstance(board_data[0][0], (int, np.integer))):
+            # Dados já numéricos: conversão direta pelo NumPy
+            self.board = np.array(board_data, dtype=np.int8, order='C')
         else:
-            self.board = np.array(board_data, dtype=int)
+            # Dígitos como texto (células '5' ou linhas "530070000"): conversão feita pelo NumPy
+            rows = [list(row) if isinstance(row, str) else row for row in board_data]
+            self.board = np.array(rows).astype(np.int8)
+        
+        self._init_state()
+    
+    @classmethod
+    def from_array(cls, board_array: np.ndarray) -> 'SudokuBoard':
+        """
+        Cria um tabuleiro que compartilha memória com um array N x N (sem cópia).
         
+        Útil para envolver `batch[i]` de um array (N, n, n) int8 contíguo; o array
+        só é copiado se não for int8 contíguo. Alterações feitas via `set_cell`
+        aparecem no array original.
+        
+        Args:
+            board_array: Array N x N com os dados do tabuleiro
+            
+        Returns:
+            SudokuBoard: Tabuleiro sobre o array
+        """
+        board = cls.__new__(cls)
+        board.board = np.ascontiguousarray(board_array, dtype=np.int8)
+        board._init_state()
+        return board
+    
+    def _init_state(self):
+        """
+        Inicializa os atributos derivados de `self.board` (tamanho, índices e caches).
+        """
         self.size = self.board.shape[0]  # Tamanho do tabuleiro (4x4 ou 9x9)
         self.box_size = int(np.sqrt(self.size))  # Tamanho do quadrante (2x2 ou 3x3)
         
+        # Índices das unidades compartilhados entre todos os tabuleiros do mesmo tamanho
+        self._box_idx, self._box_indices, self._unit_index, self._unit_names = _unit_layout(self.size)
+        self._full_mask = (1 << self.size) - 1
+        
+        # Cache das análises, invalidado a cada alteração do tabuleiro
+        self._version = 0
+        self._cache = {}
+        
+        # Máscaras de números usados por linha, coluna e quadrante, mantidas por `set_cell`
+        self._masks = None
+        
+    def set_cell(self, row, col, value):
+        """
+        Altera o valor de uma célula e invalida as análises memorizadas.
+        
+        Args:
+            row: Linha da posição
+            col: Coluna da posição
+            value: Valor a colocar (0 para esvaziar a célula)
+        """
+        previous = self.board[row, col]
+        self.board[row, col] = value
+        
+        if self._masks is not None:
+            if previous == 0 and value > 0:
+                # Preencher uma célula vazia só liga o bit do valor nas três unidades
+                bit = 1 << min(int(value) - 1, 15)
+                row_mask, col_mask, box_mask = self._masks
+                row_mask[row] |= bit
+                col_mask[col] |= bit
+                box_mask[self._box_idx[row, col]] |= bit
+            else:
+                self._refresh_unit_masks(row, col)
+        
+        self._version += 1
+    
+    def undo_cell(self, row, col):
+        """
+        Esvazia uma célula preenchida anteriormente (desfaz um movimento).
+        
+        Args:
+            row: Linha da posição
+            col: Coluna da posição
+        """
+        self.set_cell(row, col, 0)
+    
+    def _refresh_unit_masks(self, row, col):
+        """
+        Recalcula as máscaras da linha, coluna e quadrante de uma célula.
+        
+        Necessário ao esvaziar ou sobrescrever células, pois o mesmo número
+        pode aparecer mais de uma vez na unidade em tabuleiros inválidos.
+        
+        Args:
+            row: Linha da posição
+            col: Coluna da posição
+        """
+        row_mask, col_mask, box_mask = self._masks
+        box = self._box_idx[row, col]
+        flat = self.board.ravel()
+        
+        row_mask[row] = np.bitwise_or.reduce(self._values_to_bits(self.board[row]))
+        col_mask[col] = np.bitwise_or.reduce(self._values_to_bits(self.board[:, col]))
+        box_mask[box] = np.bitwise_or.reduce(self._values_to_bits(flat[self._box_indices[box]]))
+        
     def is_open(self):
         """
         Verifica se o tabuleiro é 'aberto' (tem células vazias representadas por 0).
@@ -42,6 +199,7 @@ class SudokuBoard:
         """
         return np.all(self.board != 0)
     
+    @_cached_by_version
     def get_open_positions(self):
         """
         Retorna lista de posições (row, col) com células vazias.
@@ -52,6 +210,7 @@ class SudokuBoard:
         positions = np.argwhere(self.board == 0)
         return [(int(pos[0]), int(pos[1])) for pos in positions]
     
+    @_cached_by_version
     def is_valid(self):
         """
         Verifica se o tabuleiro atual é válido (sem conflitos).
@@ -59,41 +218,21 @@ class SudokuBoard:
         Returns:
             bool: True se válido, False se há conflitos
         """
-        # Verificar linhas
-        for row in range(self.size):
-            if not self._is_valid_unit(self.board[row]):
-                return False
-        
-        # Verificar colunas
-        for col in range(self.size):
-            if not self._is_valid_unit(self.board[:, col]):
-                return False
+        if self.board.min() < 0 or self.board.max() > 16:
+            # Valores sem bit próprio em uint16: mesma resposta de `find_invalid_numbers`
+            return not self.find_invalid_numbers()
         
-        # Verificar quadrantes
-        for box_row in range(0, self.size, self.box_size):
-            for box_col in range(0, self.size, self.box_size):
-                box = self.board[box_row:box_row+self.box_size, box_col:box_col+self.box_size]
-                if not self._is_valid_unit(box.flatten()):
-                    return False
+        if _numba_is_valid is not None:
+            return bool(_numba_is_valid(self.board, self._box_idx))
         
-        return True
-    
-    def _is_valid_unit(self, unit):
-        """
-        Verifica se uma unidade (linha, coluna ou quadrante) é válida.
-        
-        Args:
-            unit: Array numpy representando a unidade
-            
-        Returns:
-            bool: True se válida, False caso contrário
-        """
-        # Remover zeros (células vazias)
-        filled_cells = unit[unit != 0]
+        # Bits de todas as unidades (linhas, colunas e quadrantes) de uma só vez
+        bits = self._cell_bits().ravel()[self._unit_index]
         
-        # Verificar se não há duplicatas
-        return len(filled_cells) == len(np.unique(filled_cells))
+        # Sem repetições, a soma dos bits de cada unidade é igual ao OU entre eles
+        or_mask = np.bitwise_or.reduce(bits, axis=1)
+        return bool(np.array_equal(bits.sum(axis=1, dtype=np.int64), or_mask))
     
+    @_cached_by_version
     def find_invalid_numbers(self):
         """
         Identifica quais números estão causando invalidade no tabuleiro.
@@ -101,55 +240,50 @@ class SudokuBoard:
         Returns:
             list: Lista de dicionários com informações sobre conflitos
         """
-        conflicts = []
-        
-        # Verificar conflitos em linhas
-        for row in range(self.size):
-            row_conflicts = self._find_conflicts_in_unit(self.board[row], f"linha {row}")
-            conflicts.extend(row_conflicts)
-        
-        # Verificar conflitos em colunas
-        for col in range(self.size):
-            col_conflicts = self._find_conflicts_in_unit(self.board[:, col], f"coluna {col}")
-            conflicts.extend(col_conflicts)
-        
-        # Verificar conflitos em quadrantes
-        for box_row in range(0, self.size, self.box_size):
-            for box_col in range(0, self.size, self.box_size):
-                box = self.board[box_row:box_row+self.box_size, box_col:box_col+self.box_size]
-                box_name = f"quadrante ({box_row//self.box_size}, {box_col//self.box_size})"
-                box_conflicts = self._find_conflicts_in_unit(box.flatten(), box_name)
-                conflicts.extend(box_conflicts)
-        
-        return conflicts
+        if _numba_unit_value_counts is not None:
+            counts = _numba_unit_value_counts(self.board, self._box_idx)
+            unit_ids, values = np.nonzero(counts > 1)
+            return [
+                {
+                    'numero': int(value) - 128,
+                    'local': self._unit_names[unit],
+                    'ocorrencias': int(counts[unit, value])
+                }
+                for unit, value in zip(unit_ids, values)
+            ]
+        
+        # Ordenar cada unidade (linhas, colunas e quadrantes): repetições ficam adjacentes.
+        # Qualquer valor diferente de 0 conta como preenchido, inclusive fora de 1..N
+        units = np.sort(self.board.ravel()[self._unit_index], axis=1)
+        dup_mask = (units[:, 1:] == units[:, :-1]) & (units[:, 1:] != 0)
+        unit_ids, positions = np.nonzero(dup_mask)
+        
+        # Cada par (unidade, número) aparece uma vez a menos que suas ocorrências;
+        # o número (int8) entra na chave deslocado para 0..255
+        keys = unit_ids * 256 + units[unit_ids, positions + 1].astype(np.intp) + 128
+        keys, repeats = np.unique(keys, return_counts=True)
+        
+        return [
+            {
+                'numero': int(key % 256) - 128,
+                'local': self._unit_names[key // 256],
+                'ocorrencias': int(count + 1)
+            }
+            for key, count in zip(keys, repeats)
+        ]
     
-    def _find_conflicts_in_unit(self, unit, unit_name):
+    @_cached_by_version
+    def validate(self):
         """
-        Encontra conflitos em uma unidade específica.
+        Verifica a validade e lista os conflitos com uma única varredura das unidades.
         
-        Args:
-            unit: Array numpy representando a unidade
-            unit_name: Nome da unidade para identificação
-            
         Returns:
-            list: Lista de conflitos encontrados
+            tuple: (True se válido, lista de conflitos no formato de `find_invalid_numbers`)
         """
-        conflicts = []
-        filled_cells = unit[unit != 0]
-        
-        # Encontrar números duplicados
-        unique_numbers, counts = np.unique(filled_cells, return_counts=True)
-        duplicates = unique_numbers[counts > 1]
-        
-        for duplicate in duplicates:
-            conflicts.append({
-                'numero': int(duplicate),
-                'local': unit_name,
-                'ocorrencias': int(counts[unique_numbers == duplicate][0])
-            })
-        
-        return conflicts
+        conflicts = self.find_invalid_numbers()
+        return not conflicts, conflicts
     
+    @_cached_by_version
     def count_remaining_numbers(self):
         """
         Conta quantos números de cada tipo ainda podem ser jogados.
@@ -157,11 +291,9 @@ class SudokuBoard:
         Returns:
             dict: Dicionário com contagem de números restantes
         """
-        remaining = {}
-        
-        for num in range(1, self.size + 1):
-            used_count = np.sum(self.board == num)
-            remaining[num] = self.size - used_count
+        # Uma única passada pelo tabuleiro conta todas as ocorrências
+        counts = np.bincount(self.board.ravel().astype(np.intp), minlength=self.size + 1)
+        remaining = {num: int(self.size - counts[num]) for num in range(1, self.size + 1)}
         
         return remaining
     
@@ -176,27 +308,109 @@ class SudokuBoard:
         Returns:
             set: Conjunto de números possíveis
         """
+        return self._mask_to_set(self.possible_mask(row, col))
+    
+    def possible_mask(self, row, col):
+        """
+        Retorna a máscara dos números possíveis para uma posição específica.
+        
+        Args:
+            row: Linha da posição
+            col: Coluna da posição
+            
+        Returns:
+            int: Máscara de bits (bit v-1 ligado se o número v é possível; 0 se a célula está preenchida)
+        """
         if self.board[row, col] != 0:
-            return set()  # Célula já preenchida
+            return 0  # Célula já preenchida
+        
+        row_mask, col_mask, box_mask = self._unit_masks()
+        used = int(row_mask[row]) | int(col_mask[col]) | int(box_mask[self._box_idx[row, col]])
+        
+        return self._full_mask & ~used
+    
+    @staticmethod
+    def _values_to_bits(values):
+        """
+        Converte valores para sua representação em bit (bit v-1 para o número v).
+        
+        Args:
+            values: Array numpy com valores de células
+            
+        Returns:
+            np.ndarray: Array uint16 com o bit de cada valor (0 para células vazias)
+        """
+        shifts = np.clip(values.astype(np.intp) - 1, 0, 15)
+        return np.where(values > 0, np.left_shift(1, shifts), 0).astype(np.uint16)
+    
+    def _cell_bits(self):
+        """
+        Converte cada célula para sua representação em bit (bit v-1 para o número v).
+        
+        Returns:
+            np.ndarray: Matriz uint16 com o bit de cada célula (0 para células vazias)
+        """
+        return self._values_to_bits(self.board)
+    
+    def _unit_masks(self):
+        """
+        Retorna as máscaras de números usados em cada linha, coluna e quadrante.
         
-        # Números já usados na linha
-        used_in_row = set(self.board[row][self.board[row] != 0])
+        São calculadas na primeira chamada e depois atualizadas por `set_cell`.
+        
+        Returns:
+            tuple: (row_mask, col_mask, box_mask), cada um um array uint16 de tamanho N
+        """
+        if self._masks is None:
+            bits = self._cell_bits()
+            
+            row_mask = np.bitwise_or.reduce(bits, axis=1)
+            col_mask = np.bitwise_or.reduce(bits, axis=0)
+            
+            # Cada linha de `boxes` corresponde a um quadrante
+            boxes = bits.ravel()[self._box_indices]
+            box_mask = np.bitwise_or.reduce(boxes, axis=1)
+            
+            self._masks = (row_mask, col_mask, box_mask)
         
-        # Números já usados na coluna
-        used_in_col = set(self.board[:, col][self.board[:, col] != 0])
+        return self._masks
+    
+    @_cached_by_version
+    def get_candidates_bitmask(self):
+        """
+        Retorna a máscara de candidatos de cada célula, calculada de forma vetorizada.
         
-        # Números já usados no quadrante
-        box_row = (row // self.box_size) * self.box_size
-        box_col = (col // self.box_size) * self.box_size
-        box = self.board[box_row:box_row+self.box_size, box_col:box_col+self.box_size]
-        used_in_box = set(box.flatten()[box.flatten() != 0])
+        O bit v-1 da máscara está ligado se o número v é candidato para a célula.
+        Células já preenchidas têm máscara 0.
         
-        # Números possíveis = todos os números - números já usados
-        all_numbers = set(range(1, self.size + 1))
-        used_numbers = used_in_row | used_in_col | used_in_box
+        Returns:
+            np.ndarray: Matriz uint16 (N x N) com as máscaras de candidatos
+        """
+        if _numba_candidates_bitmask is not None:
+            return _numba_candidates_bitmask(self.board, self._box_idx)
         
-        return all_numbers - used_numbers
+        row_mask, col_mask, box_mask = self._unit_masks()
+        
+        used = row_mask[:, None] | col_mask[None, :] | box_mask[self._box_idx]
+        cell_mask = ~used & self._full_mask
+        cell_mask[self.board != 0] = 0
+        
+        return cell_mask.astype(np.uint16)
     
+    def _mask_to_set(self, mask):
+        """
+        Converte uma máscara de candidatos em conjunto de números.
+        
+        Args:
+            mask: Máscara de bits (bit v-1 ligado para o número v)
+            
+        Returns:
+            set: Conjunto de números presentes na máscara
+        """
+        mask = int(mask)
+        return {value for value in range(1, self.size + 1) if (mask >> (value - 1)) & 1}
+    
+    @_cached_by_version
     def get_candidates_matrix(self):
         """
         Retorna matriz de candidatos para cada célula.
@@ -204,12 +418,11 @@ class SudokuBoard:
         Returns:
             dict: Dicionário com candidatos para cada posição
         """
-        candidates = {}
+        masks = self.get_candidates_bitmask()
         
-        for row in range(self.size):
-            for col in range(self.size):
-                if self.board[row, col] == 0:
-                    candidates[(row, col)] = self.get_possible_numbers(row, col)
+        candidates = {}
+        for row, col in self.get_open_positions():
+            candidates[(row, col)] = self._mask_to_set(masks[row, col])
         
         return candidates
     
@@ -220,25 +433,38 @@ class SudokuBoard:
         Returns:
             torch.Tensor: Tensor do tabuleiro
         """
-        return torch.tensor(self.board, dtype=torch.float32)
+        # from_numpy compartilha a memória (int8); .to faz a única cópia para float32
+        return torch.from_numpy(self.board).to(torch.float32)
     
+    @_cached_by_version
     def get_board_info(self):
         """
         Retorna informações completas sobre o tabuleiro.
         
+        O dicionário é memorizado até a próxima alteração e não deve ser modificado.
+        
         Returns:
             dict: Dicionário com todas as informações do tabuleiro
         """
+        is_valid, conflicts = self.validate()
         return {
             'tamanho': f"{self.size}x{self.size}",
             'tipo': 'aberto' if self.is_open() else 'fechado',
-            'valido': self.is_valid(),
+            'valido': is_valid,
             'posicoes_abertas': self.get_open_positions(),
             'numeros_restantes': self.count_remaining_numbers(),
             'candidatos': self.get_candidates_matrix(),
-            'conflitos': self.find_invalid_numbers() if not self.is_valid() else []
+            'conflitos': conflicts
         }
     
+    @property
+    def info(self):
+        """
+        Atalho para `get_board_info()` (memorizado enquanto o tabuleiro não muda).
+        """
+        return self.get_board_info()
+    
+    @_cached_by_version
     def __str__(self):
         """
         Representação string do tabuleiro.
@@ -246,10 +472,8 @@ class SudokuBoard:
         Returns:
             str: Tabuleiro formatado
         """
-        result = []
-        for row in self.board:
-            result.append(' '.join(str(cell) if cell != 0 else '.' for cell in row))
-        return '\n'.join(result)
+        chars = np.where(self.board == 0, '.', self.board.astype(str))
+        return '\n'.join(' '.join(row) for row in chars.tolist())
     
     def __repr__(self):
         return f"SudokuBoard({self.size}x{self.size}, {'aberto' if self.is_open() else 'fechado'})" 
\ No newline at end of file
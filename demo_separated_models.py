@@ -10,7 +10,6 @@ para cada dimensão de Sudoku.
 """
 
 import sys
-import os
 import argparse
 from pathlib import Path
 
@@ -19,7 +18,7 @@ sys.path.append(str(Path(__file__).parent))
 
 from core.sudoku_board import SudokuBoard
 from solver.ltn_solver import SudokuLTNSolver
-from main import create_sample_4x4_sudoku, create_sample_sudoku, create_unsolvable_4x4_sudoku
+from main import MODEL_PATHS, REPORT_PATHS, stat_once, create_sample_4x4_sudoku, create_sample_sudoku, create_unsolvable_4x4_sudoku
 
 def demo_4x4_model():
     """
@@ -32,8 +31,8 @@ def demo_4x4_model():
     solver_4x4 = SudokuLTNSolver(board_size=4)
     
     # Carregar modelo se existir
-    model_path_4x4 = "models/sudoku_ltn_4x4.pth"
-    if os.path.exists(model_path_4x4):
+    model_path_4x4 = MODEL_PATHS[4]
+    if stat_once(model_path_4x4)[0]:
         solver_4x4.load_model(model_path_4x4)
         print(f"✅ Modelo 4x4 carregado: {model_path_4x4}")
     else:
@@ -74,8 +73,8 @@ def demo_9x9_model():
     solver_9x9 = SudokuLTNSolver(board_size=9)
     
     # Carregar modelo se existir
-    model_path_9x9 = "models/sudoku_ltn_9x9.pth"
-    if os.path.exists(model_path_9x9):
+    model_path_9x9 = MODEL_PATHS[9]
+    if stat_once(model_path_9x9)[0]:
         solver_9x9.load_model(model_path_9x9)
         print(f"✅ Modelo 9x9 carregado: {model_path_9x9}")
     else:
@@ -104,25 +103,25 @@ def compare_models():
     print("=" * 50)
     
     # Verificar se os modelos existem
-    model_4x4_exists = os.path.exists("models/sudoku_ltn_4x4.pth")
-    model_9x9_exists = os.path.exists("models/sudoku_ltn_9x9.pth")
+    model_4x4_exists, model_4x4_bytes = stat_once(MODEL_PATHS[4])
+    model_9x9_exists, model_9x9_bytes = stat_once(MODEL_PATHS[9])
     
     print(f"📁 Modelo 4x4: {'✅ Disponível' if model_4x4_exists else '❌ Não encontrado'}")
     print(f"📁 Modelo 9x9: {'✅ Disponível' if model_9x9_exists else '❌ Não encontrado'}")
     
     if model_4x4_exists:
         # Informações do modelo 4x4
-        size_4x4 = os.path.getsize("models/sudoku_ltn_4x4.pth") / (1024 * 1024)  # MB
+        size_4x4 = model_4x4_bytes / (1024 * 1024)  # MB
         print(f"💾 Tamanho modelo 4x4: {size_4x4:.2f} MB")
     
     if model_9x9_exists:
         # Informações do modelo 9x9
-        size_9x9 = os.path.getsize("models/sudoku_ltn_9x9.pth") / (1024 * 1024)  # MB
+        size_9x9 = model_9x9_bytes / (1024 * 1024)  # MB
         print(f"💾 Tamanho modelo 9x9: {size_9x9:.2f} MB")
     
     # Verificar relatórios de treinamento
-    report_4x4_exists = os.path.exists("models/training_report_4x4.txt")
-    report_9x9_exists = os.path.exists("models/training_report_9x9.txt")
+    report_4x4_exists, _ = stat_once(REPORT_PATHS[4])
+    report_9x9_exists, _ = stat_once(REPORT_PATHS[9])
     
     print(f"📄 Relatório 4x4: {'✅ Disponível' if report_4x4_exists else '❌ Não encontrado'}")
     print(f"📄 Relatório 9x9: {'✅ Disponível' if report_9x9_exists else '❌ Não encontrado'}")
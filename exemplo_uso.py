@@ -10,14 +10,13 @@ sudokus de diferentes dimensões.
 """
 
 import sys
-import os
 from pathlib import Path
 
 # Adicionar o diretório do projeto ao path
 sys.path.append(str(Path(__file__).parent))
 
-from core.sudoku_board import SudokuBoard
 from solver.ltn_solver import SudokuLTNSolver
+from main import MODEL_PATHS, stat_once, create_sample_4x4_sudoku, create_sample_sudoku, sudoku_string_to_board
 
 def exemplo_4x4():
     """
@@ -27,14 +26,7 @@ def exemplo_4x4():
     print("=" * 40)
     
     # Criar um sudoku 4x4 de exemplo
-    sudoku_4x4 = [
-        [1, 0, 3, 4],
-        [3, 4, 0, 2],
-        [0, 1, 4, 3],
-        [4, 3, 2, 0]
-    ]
-    
-    board = SudokuBoard(sudoku_4x4)
+    board = create_sample_4x4_sudoku()
     print("Sudoku inicial:")
     print(board)
     
@@ -42,8 +34,8 @@ def exemplo_4x4():
     solver = SudokuLTNSolver(board_size=4)
     
     # Carregar modelo se existir
-    model_path = "models/sudoku_ltn_4x4.pth"
-    if os.path.exists(model_path):
+    model_path = MODEL_PATHS[4]
+    if stat_once(model_path)[0]:
         solver.load_model(model_path)
         print(f"✅ Modelo 4x4 carregado")
     else:
@@ -68,19 +60,7 @@ def exemplo_9x9():
     print("=" * 40)
     
     # Criar um sudoku 9x9 de exemplo
-    sudoku_9x9 = [
-        [5, 3, 0, 0, 7, 0, 0, 0, 0],
-        [6, 0, 0, 1, 9, 5, 0, 0, 0],
-        [0, 9, 8, 0, 0, 0, 0, 6, 0],
-        [8, 0, 0, 0, 6, 0, 0, 0, 3],
-        [4, 0, 0, 8, 0, 3, 0, 0, 1],
-        [7, 0, 0, 0, 2, 0, 0, 0, 6],
-        [0, 6, 0, 0, 0, 0, 2, 8, 0],
-        [0, 0, 0, 4, 1, 9, 0, 0, 5],
-        [0, 0, 0, 0, 8, 0, 0, 7, 9]
-    ]
-    
-    board = SudokuBoard(sudoku_9x9)
+    board = create_sample_sudoku()
     print("Sudoku inicial:")
     print(board)
     
@@ -88,8 +68,8 @@ def exemplo_9x9():
     solver = SudokuLTNSolver(board_size=9)
     
     # Carregar modelo se existir
-    model_path = "models/sudoku_ltn_9x9.pth"
-    if os.path.exists(model_path):
+    model_path = MODEL_PATHS[9]
+    if stat_once(model_path)[0]:
         solver.load_model(model_path)
         print(f"✅ Modelo 9x9 carregado")
     else:
@@ -115,7 +95,7 @@ def exemplo_arquivo_csv():
     
     # Verificar se existe o arquivo de exemplo
     exemplo_4x4_path = "exemplo_4x4_fechado_valido.csv"
-    if os.path.exists(exemplo_4x4_path):
+    if stat_once(exemplo_4x4_path)[0]:
         print(f"Usando arquivo: {exemplo_4x4_path}")
         
         # Ler o arquivo
@@ -125,7 +105,7 @@ def exemplo_arquivo_csv():
         print(f"String do sudoku: {sudoku_str}")
         
         # Converter para SudokuBoard
-        board = SudokuBoard([[int(sudoku_str[i*4 + j]) for j in range(4)] for i in range(4)])
+        board = sudoku_string_to_board(sudoku_str)
         print("Sudoku do arquivo:")
         print(board)
         
@@ -139,8 +119,8 @@ def exemplo_arquivo_csv():
             
             # Tentar resolver
             solver = SudokuLTNSolver(board_size=4)
-            model_path = "models/sudoku_ltn_4x4.pth"
-            if os.path.exists(model_path):
+            model_path = MODEL_PATHS[4]
+            if stat_once(model_path)[0]:
                 solver.load_model(model_path)
                 print("✅ Modelo 4x4 carregado")
             
@@ -161,8 +141,8 @@ def main():
     print("=" * 60)
     
     # Verificar se os modelos existem
-    modelo_4x4_existe = os.path.exists("models/sudoku_ltn_4x4.pth")
-    modelo_9x9_existe = os.path.exists("models/sudoku_ltn_9x9.pth")
+    modelo_4x4_existe = stat_once(MODEL_PATHS[4])[0]
+    modelo_9x9_existe = stat_once(MODEL_PATHS[9])[0]
     
     print(f"\n📁 Status dos modelos:")
     print(f"  Modelo 4x4: {'✅ Disponível' if modelo_4x4_existe else '❌ Não encontrado'}")
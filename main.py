@@ -9,20 +9,121 @@ Este script treina modelos especializados separadamente para Sudoku 4x4 e 9x9,
 criando modelos independentes para cada dimensão.
 """
 
-import sys
 import os
+import stat
 import argparse
+import logging
+import multiprocessing
 import time
 import numpy as np
+import torch
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
-
-# Adicionar o diretório do projeto ao path
-sys.path.append(str(Path(__file__).parent))
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from core.fast_solver import solve_board
 from core.sudoku_board import SudokuBoard
-from solver.ltn_solver import SudokuLTNSolver
+from solver.ltn_solver import SudokuLTNSolver, resolve_device
+
+logger = logging.getLogger(__name__)
+
+# Caminhos dos modelos e relatórios de cada dimensão, montados uma única vez
+MODELS_DIR = "models"
+MODEL_PATHS = {size: os.path.join(MODELS_DIR, f"sudoku_ltn_{size}x{size}.pth") for size in (4, 9)}
+REPORT_PATHS = {size: os.path.join(MODELS_DIR, f"training_report_{size}x{size}.txt") for size in (4, 9)}
+
+@lru_cache(maxsize=16)
+def stat_once(path):
+    """
+    Verifica um arquivo com uma única chamada a os.stat (resultado memorizado por caminho)
+    
+    Só arquivos regulares contam como existentes, como em `get_solver`.
+    
+    Args:
+        path: Caminho do arquivo
+        
+    Returns:
+        tuple: (existe, tamanho em bytes)
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False, 0
+    if not stat.S_ISREG(st.st_mode):
+        return False, 0
+    return True, st.st_size
 
+# Linhas do CSV convertidas por bloco em iter_sudokus_from_csv
+_CSV_CHUNK_LINES = 4096
+
+# A partir de quantos bytes lidos do CSV load_sudokus_batch converte os blocos em um
+# pool de processos; abaixo disso criar o pool custa mais do que a conversão
+_PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
+
+# Tabuleiros de exemplo (somente leitura); cada chamada cria um SudokuBoard com sua própria cópia
+_SAMPLE_BOARD_4X4 = np.array([
+    [1, 0, 3, 4],
+    [3, 4, 0, 2],
+    [0, 1, 4, 3],
+    [4, 3, 2, 0]
+], dtype=np.int8)
+
+_SAMPLE_BOARD_9X9 = np.array([
+    [5, 3, 0, 0, 7, 0, 0, 0, 0],
+    [6, 0, 0, 1, 9, 5, 0, 0, 0],
+    [0, 9, 8, 0, 0, 0, 0, 6, 0],
+    [8, 0, 0, 0, 6, 0, 0, 0, 3],
+    [4, 0, 0, 8, 0, 3, 0, 0, 1],
+    [7, 0, 0, 0, 2, 0, 0, 0, 6],
+    [0, 6, 0, 0, 0, 0, 2, 8, 0],
+    [0, 0, 0, 4, 1, 9, 0, 0, 5],
+    [0, 0, 0, 0, 8, 0, 0, 7, 9]
+], dtype=np.int8)
+
+# Sem conflitos, mas a posição (0, 3) só aceitaria o 4, que já está na coluna 3
+_UNSOLVABLE_BOARD_4X4 = np.array([
+    [1, 2, 3, 0],
+    [0, 0, 0, 4],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0]
+], dtype=np.int8)
+
+# Sem conflitos, mas a posição (0, 0) não tem candidatos: 2 na linha, 3 e 4 na coluna, 1 no quadrante
+_ANOTHER_UNSOLVABLE_BOARD_4X4 = np.array([
+    [0, 2, 0, 0],
+    [0, 1, 0, 0],
+    [3, 0, 0, 0],
+    [4, 0, 0, 0]
+], dtype=np.int8)
+
+for _template in (_SAMPLE_BOARD_4X4, _SAMPLE_BOARD_9X9, _UNSOLVABLE_BOARD_4X4, _ANOTHER_UNSOLVABLE_BOARD_4X4):
+    _template.flags.writeable = False
+
+def create_sample_4x4_sudoku() -> SudokuBoard:
+    """
+    Cria um sudoku 4x4 aberto e solucionável de exemplo
+    """
+    return SudokuBoard(_SAMPLE_BOARD_4X4)
+
+def create_sample_sudoku() -> SudokuBoard:
+    """
+    Cria um sudoku 9x9 aberto e solucionável de exemplo
+    """
+    return SudokuBoard(_SAMPLE_BOARD_9X9)
+
+def create_unsolvable_4x4_sudoku() -> SudokuBoard:
+    """
+    Cria um sudoku 4x4 aberto e impossível de resolver
+    """
+    return SudokuBoard(_UNSOLVABLE_BOARD_4X4)
+
+def create_another_unsolvable_4x4_sudoku() -> SudokuBoard:
+    """
+    Cria outro sudoku 4x4 aberto e impossível de resolver
+    """
+    return SudokuBoard(_ANOTHER_UNSOLVABLE_BOARD_4X4)
 
 def sudoku_string_to_board(sudoku_str: str) -> SudokuBoard:
     """
@@ -30,52 +131,294 @@ def sudoku_string_to_board(sudoku_str: str) -> SudokuBoard:
     """
     length = len(sudoku_str)
     
-    if length == 16:  # 4x4 sudoku
-        board_size = 4
-    elif length == 81:  # 9x9 sudoku
-        board_size = 9
-    else:
+    # 16 caracteres: 4x4; 81 caracteres: 9x9
+    if length not in (16, 81):
         raise ValueError(f"String deve ter 16 caracteres (4x4) ou 81 caracteres (9x9), recebido: {length}")
     
-    # Converter string para matriz
-    board_data = []
-    for i in range(board_size):
-        row = []
-        for j in range(board_size):
-            char = sudoku_str[i * board_size + j]
-            # Converter '.' para 0 se necessário
-            row.append(0 if char == '.' else int(char))
-        board_data.append(row)
+    if not sudoku_str.isascii():
+        raise ValueError(f"String contém caracteres inválidos: {sudoku_str}")
+    
+    # Mesma conversão e validação da leitura dos CSVs ('.' vale 0); a linha
+    # rejeitada indica caracteres inválidos
+    _, boards, rejected = _decode_sudoku_lines([sudoku_str.encode('ascii')], 0, length)
+    if rejected:
+        raise ValueError(f"String contém caracteres inválidos: {sudoku_str}")
+    
+    return SudokuBoard(boards[0])
+
+def _decode_sudoku_lines(lines: List[bytes], first_line: int, length: int) -> Tuple[List[int], np.ndarray, int]:
+    """
+    Converte de uma só vez as linhas de um bloco que têm o tamanho indicado
+    
+    Args:
+        lines: Linhas do bloco (já sem espaços), em bytes
+        first_line: Índice (base 0) da primeira linha do bloco no arquivo
+        length: Tamanho das linhas a converter (16 para 4x4, 81 para 9x9)
+        
+    Returns:
+        tuple: (índices no arquivo das linhas convertidas, array (k, n, n) int8,
+                número de linhas descartadas por caracteres inválidos)
+    """
+    board_size = int(round(length ** 0.5))
+    
+    # Filtrar pelo tamanho sem laço Python por linha
+    lengths = np.fromiter(map(len, lines), dtype=np.intp, count=len(lines))
+    selected = np.flatnonzero(lengths == length)
+    if selected.size == 0:
+        return [], np.empty((0, board_size, board_size), dtype=np.int8), 0
+    
+    # Validar todos os caracteres de uma vez: dígitos ou '.' (bytes não-ASCII ficam de fora)
+    raw = np.frombuffer(b''.join([lines[i] for i in selected]), dtype=np.uint8).reshape(-1, length)
+    is_dot = raw == ord('.')
+    valid_rows = (((raw >= ord('0')) & (raw <= ord('9'))) | is_dot).all(axis=1)
+    
+    # Converter as linhas válidas ('.' vale 0)
+    digits = raw[valid_rows].astype(np.int8) - ord('0')
+    digits[is_dot[valid_rows]] = 0
+    boards = digits.reshape(-1, board_size, board_size)
+    
+    # Um único aviso por bloco, em vez de um por linha inválida
+    rejected_lines = (selected[~valid_rows] + first_line + 1).tolist()
+    if rejected_lines:
+        logger.warning("Erro ao converter %d linhas (caracteres inválidos): %s",
+                       len(rejected_lines), rejected_lines)
+    
+    indices = (selected[valid_rows] + first_line).tolist()
+    return indices, boards, len(rejected_lines)
+
+def _decode_sudoku_chunk(job: Tuple[List[bytes], int, int]) -> Tuple[np.ndarray, int]:
+    """
+    Versão de `_decode_sudoku_lines` para os processos do pool de leitura
+    
+    Args:
+        job: (linhas do bloco, índice da primeira linha, tamanho das linhas)
+        
+    Returns:
+        tuple: (array (k, n, n) int8, número de linhas descartadas)
+    """
+    _, boards, rejected = _decode_sudoku_lines(*job)
+    return boards, rejected
+
+def _parse_sudoku_lines(lines: List[bytes], first_line: int = 0) -> Tuple[List[SudokuBoard], int]:
+    """
+    Converte um bloco de linhas (já sem espaços) em SudokuBoards, na ordem do arquivo
+    
+    Args:
+        lines: Linhas do bloco, em bytes
+        first_line: Índice (base 0) da primeira linha do bloco no arquivo
+        
+    Returns:
+        tuple: (tabuleiros convertidos, número de linhas descartadas por caracteres inválidos)
+    """
+    # Converter cada grupo de mesmo tamanho (4x4: 16 caracteres, 9x9: 81) de uma só vez
+    loaded = []
+    rejected = 0
+    for length in (16, 81):
+        indices, boards, group_rejected = _decode_sudoku_lines(lines, first_line, length)
+        loaded.extend((i, SudokuBoard(board_data)) for i, board_data in zip(indices, boards))
+        rejected += group_rejected
+    
+    # Manter a ordem original do arquivo
+    loaded.sort(key=lambda item: item[0])
+    return [board for _, board in loaded], rejected
+
+def _iter_csv_chunks(csv_path: str, max_samples: int, chunk_size: int) -> Iterator[Tuple[int, List[bytes]]]:
+    """
+    Lê até `max_samples` linhas do CSV em blocos de `chunk_size` linhas
+    
+    O arquivo é lido em modo binário: as linhas vão direto para o np.frombuffer,
+    sem decodificar e recodificar o texto, e bytes fora de UTF-8 invalidam só a
+    própria linha.
+    
+    Returns:
+        Iterator de (índice da primeira linha do bloco, linhas sem espaços em bytes)
+    """
+    with open(csv_path, 'rb') as f:
+        # Limita o número de amostras
+        lines = islice(f, max_samples)
+        first_line = 0
+        
+        while True:
+            chunk = [line.strip() for line in islice(lines, chunk_size)]
+            if not chunk:
+                break
+            
+            yield first_line, chunk
+            first_line += len(chunk)
+
+def iter_sudokus_from_csv(csv_path: str, max_samples: int = 2000,
+                          chunk_size: int = _CSV_CHUNK_LINES) -> Iterator[SudokuBoard]:
+    """
+    Gera os sudokus de um arquivo CSV sob demanda, convertendo um bloco de linhas por vez
+    
+    Apenas um bloco de `chunk_size` linhas fica em memória durante a leitura.
+    
+    Args:
+        csv_path: Caminho do arquivo CSV
+        max_samples: Número máximo de linhas lidas
+        chunk_size: Número de linhas convertidas por bloco
+        
+    Raises:
+        FileNotFoundError: Se o arquivo não existir (na primeira iteração)
+    """
+    rejected = 0
+    for first_line, chunk in _iter_csv_chunks(csv_path, max_samples, chunk_size):
+        boards, chunk_rejected = _parse_sudoku_lines(chunk, first_line)
+        rejected += chunk_rejected
+        yield from boards
+    
+    if rejected:
+        print(f"⚠️  {rejected} linhas ignoradas por conterem caracteres inválidos")
+
+def _pack_boards(batch: np.ndarray) -> np.ndarray:
+    """
+    Compacta os tabuleiros em nibbles: dois dígitos (0-9) por byte
+    
+    Args:
+        batch: Array (N, n, n) int8
+        
+    Returns:
+        np.ndarray: Array (N, ceil(n²/2)) uint8
+    """
+    flat = batch.reshape(len(batch), -1).astype(np.uint8)
+    if flat.shape[1] % 2:
+        flat = np.pad(flat, ((0, 0), (0, 1)))
+    return (flat[:, 0::2] << 4) | flat[:, 1::2]
+
+def _unpack_boards(packed: np.ndarray, board_size: int) -> np.ndarray:
+    """
+    Desfaz `_pack_boards`
+    
+    Args:
+        packed: Array (N, ceil(n²/2)) uint8
+        board_size: Tamanho do tabuleiro
+        
+    Returns:
+        np.ndarray: Array (N, n, n) int8 contíguo
+    """
+    cells = board_size * board_size
+    if packed.ndim != 2 or packed.shape[1] != (cells + 1) // 2:
+        raise ValueError(f"Cache com formato inesperado: {packed.shape}")
+    
+    flat = np.empty((len(packed), 2 * packed.shape[1]), dtype=np.int8)
+    flat[:, 0::2] = packed >> 4
+    flat[:, 1::2] = packed & 0x0F
+    return np.ascontiguousarray(flat[:, :cells]).reshape(-1, board_size, board_size)
+
+def _load_batch_cache(cache_path: str, csv_path: str, board_size: int) -> Optional[np.ndarray]:
+    """
+    Lê o cache compactado de um CSV (memory-map) se ele estiver atualizado
+    
+    Returns:
+        np.ndarray: Tabuleiros do cache, ou None se não houver cache válido
+    """
+    try:
+        if os.stat(cache_path).st_mtime <= os.stat(csv_path).st_mtime:
+            return None  # CSV alterado depois do cache
+        return _unpack_boards(np.load(cache_path, mmap_mode='r'), board_size)
+    except (OSError, ValueError):
+        return None
+
+def _save_batch_cache(cache_path: str, batch: np.ndarray):
+    """
+    Grava o cache compactado de forma atômica; falhas de escrita só desativam o cache
+    """
+    tmp_cache_path = cache_path + ".tmp"
+    try:
+        with open(tmp_cache_path, 'wb') as f:
+            np.save(f, _pack_boards(batch))
+        os.replace(tmp_cache_path, cache_path)
+    except OSError as e:
+        print(f"⚠️  Não foi possível gravar o cache {cache_path}: {e}")
+
+def load_sudokus_batch(csv_path: str, max_samples: int = 2000, board_size: int = 9,
+                       chunk_size: int = _CSV_CHUNK_LINES, use_cache: bool = False) -> np.ndarray:
+    """
+    Carrega os sudokus de um CSV em um único array contíguo (N, board_size, board_size) int8
+    
+    Linhas de outro tamanho são ignoradas. O array pode ser passado diretamente
+    para `SudokuLTNSolver.train_with_boards`, sem criar um SudokuBoard por linha.
+    Quando a parte do arquivo a ler passa de `_PARALLEL_MIN_BYTES`, os blocos são
+    convertidos em um pool de processos ('spawn').
+    
+    Com use_cache=True o resultado é gravado em `<csv>.<max_samples>.<n>x<n>.packed.npy`
+    (dois dígitos por byte, metade do tamanho do int8) e, nas execuções seguintes,
+    lido desse arquivo em vez de converter o CSV novamente; o cache é refeito se
+    o CSV for mais novo.
+    
+    Args:
+        csv_path: Caminho do arquivo CSV
+        max_samples: Número máximo de linhas lidas
+        board_size: Tamanho do tabuleiro (4 ou 9)
+        chunk_size: Número de linhas convertidas por bloco
+        use_cache: Ler/gravar o cache compactado ao lado do CSV
+        
+    Returns:
+        np.ndarray: Tabuleiros carregados (vazio se o arquivo não existir)
+    """
+    cache_path = f"{csv_path}.{max_samples}.{board_size}x{board_size}.packed.npy"
+    if use_cache:
+        batch = _load_batch_cache(cache_path, csv_path, board_size)
+        if batch is not None:
+            print(f"Carregando sudokus do cache {cache_path}...")
+            print(f"Total carregado: {len(batch)} sudokus")
+            return batch
+    
+    print(f"Carregando sudokus de {csv_path}...")
+    
+    length = board_size * board_size
+    jobs = ((chunk, first_line, length)
+            for first_line, chunk in _iter_csv_chunks(csv_path, max_samples, chunk_size))
+    
+    # Arquivos grandes: blocos convertidos em paralelo (não dentro dos processos de treino,
+    # que são daemon e não podem criar filhos). O critério é o volume realmente lido,
+    # limitado por max_samples linhas
+    try:
+        bytes_to_read = min(os.path.getsize(csv_path), max_samples * (length + 1))
+    except OSError:
+        bytes_to_read = 0
+    use_pool = (bytes_to_read > _PARALLEL_MIN_BYTES and (os.cpu_count() or 1) > 1
+                and not multiprocessing.current_process().daemon)
+    
+    parts = []
+    rejected = 0
+    try:
+        if use_pool:
+            # 'spawn' evita herdar o estado do PyTorch (threads, contexto CUDA) do processo pai
+            with multiprocessing.get_context('spawn').Pool() as pool:
+                decoded = list(pool.imap(_decode_sudoku_chunk, jobs))
+        else:
+            decoded = map(_decode_sudoku_chunk, jobs)
+        
+        for boards, chunk_rejected in decoded:
+            parts.append(boards)
+            rejected += chunk_rejected
+    except FileNotFoundError:
+        print(f"Arquivo não encontrado: {csv_path}")
+        return np.empty((0, board_size, board_size), dtype=np.int8)
+    
+    if rejected:
+        print(f"⚠️  {rejected} linhas ignoradas por conterem caracteres inválidos")
     
-    return SudokuBoard(board_data)
+    if parts:
+        batch = np.concatenate(parts)
+    else:
+        batch = np.empty((0, board_size, board_size), dtype=np.int8)
+    
+    if use_cache:
+        _save_batch_cache(cache_path, batch)
+    
+    print(f"Total carregado: {len(batch)} sudokus")
+    return batch
 
 def load_sudokus_from_csv(csv_path: str, max_samples: int = 2000) -> List[SudokuBoard]:
     """
     Carrega sudokus de um arquivo CSV (suporta 4x4 e 9x9)
     """
-    sudokus = []
     print(f"Carregando sudokus de {csv_path}...")
     
     try:
-        with open(csv_path, 'r') as f:
-            lines = f.readlines()
-            
-        # Limita o número de amostras
-        lines = lines[:max_samples]
-        
-        for i, line in enumerate(lines):
-            sudoku_str = line.strip()
-            # Verificar se é 4x4 (16 caracteres) ou 9x9 (81 caracteres)
-            if len(sudoku_str) in [16, 81]:
-                try:
-                    board = sudoku_string_to_board(sudoku_str)
-                    sudokus.append(board)
-                except Exception as e:
-                    print(f"Erro ao converter linha {i+1}: {e}")
-            
-            if i % 5000 == 0 and i > 0:
-                print(f"  Carregados {i} sudokus...")
-    
+        sudokus = list(iter_sudokus_from_csv(csv_path, max_samples))
     except FileNotFoundError:
         print(f"Arquivo não encontrado: {csv_path}")
         return []
@@ -90,20 +433,15 @@ def load_sudoku_from_csv(csv_path: str) -> SudokuBoard:
     print(f"Carregando sudoku de {csv_path}...")
     
     try:
+        # Ler apenas a primeira linha (assumindo que é o sudoku)
         with open(csv_path, 'r') as f:
-            lines = f.readlines()
+            first_line = f.readline()
             
-        if not lines:
+        if not first_line:
             raise ValueError("Arquivo CSV está vazio")
         
-        # Pegar a primeira linha (assumindo que é o sudoku)
-        sudoku_str = lines[0].strip()
-        
-        # Verificar se é 4x4 (16 caracteres) ou 9x9 (81 caracteres)
-        if len(sudoku_str) not in [16, 81]:
-            raise ValueError(f"String deve ter 16 caracteres (4x4) ou 81 caracteres (9x9), recebido: {len(sudoku_str)}")
-        
-        board = sudoku_string_to_board(sudoku_str)
+        # sudoku_string_to_board valida o tamanho (16 ou 81 caracteres) e os caracteres
+        board = sudoku_string_to_board(first_line.strip())
         print(f"✅ Sudoku carregado com sucesso!")
         return board
         
@@ -114,6 +452,24 @@ def load_sudoku_from_csv(csv_path: str) -> SudokuBoard:
         print(f"❌ Erro ao carregar sudoku: {e}")
         return None
 
+def _candidates_cube(board: SudokuBoard) -> np.ndarray:
+    """
+    Expande as máscaras de candidatos em uma matriz booleana (n, n, n)
+    
+    Returns:
+        np.ndarray: cube[r, c, v-1] é True se v é candidato na célula (r, c)
+    """
+    masks = board.get_candidates_bitmask()
+    bits = np.arange(board.size, dtype=np.uint16)
+    return ((masks[:, :, None] >> bits) & 1).astype(bool)
+
+def _cells_without_candidates(board: SudokuBoard) -> List[Tuple[int, int]]:
+    """
+    Retorna as células vazias sem nenhum candidato, com uma operação vetorizada
+    """
+    dead = (board.get_candidates_bitmask() == 0) & (board.board == 0)
+    return [(int(row), int(col)) for row, col in np.argwhere(dead)]
+
 def classify_closed_board(board: SudokuBoard) -> Dict:
     """
     Questão 1: Classifica um tabuleiro fechado
@@ -124,8 +480,8 @@ def classify_closed_board(board: SudokuBoard) -> Dict:
     print("📋 Tabuleiro:")
     print(board)
     
-    # Verificar se é válido
-    is_valid = board.is_valid()
+    # Verificar se é válido e, se não for, quais são os conflitos
+    is_valid, conflicts = board.validate()
     
     print(f"\n📊 ANÁLISE:")
     print(f"  Tamanho: {board.size}x{board.size}")
@@ -134,7 +490,6 @@ def classify_closed_board(board: SudokuBoard) -> Dict:
     
     if not is_valid:
         print(f"\n🚨 CONFLITOS ENCONTRADOS:")
-        conflicts = board.find_invalid_numbers()
         for conflict in conflicts:
             print(f"  - Número {conflict['numero']} aparece {conflict['ocorrencias']} vezes na {conflict['local']}")
     
@@ -153,7 +508,7 @@ def classify_closed_board(board: SudokuBoard) -> Dict:
         'classification': classification,
         'description': description,
         'is_valid': is_valid,
-        'conflicts': board.find_invalid_numbers() if not is_valid else []
+        'conflicts': conflicts
     }
 
 def solve_open_board(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
@@ -167,7 +522,7 @@ def solve_open_board(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     print(board)
     
     # Análise inicial
-    info = board.get_board_info()
+    info = board.info
     print(f"\n📊 ANÁLISE INICIAL:")
     print(f"  Tamanho: {board.size}x{board.size}")
     print(f"  Tipo: Aberto (com células vazias)")
@@ -189,14 +544,12 @@ def solve_open_board(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     print(f"\n🔍 ANALISANDO CANDIDATOS:")
     candidates_matrix = board.get_candidates_matrix()
     
-    cells_without_candidates = []
+    cells_without_candidates = _cells_without_candidates(board)
     possible_moves = []
     
     for (row, col), candidates in candidates_matrix.items():
         print(f"  Célula ({row},{col}): candidatos = {candidates}")
-        if not candidates:
-            cells_without_candidates.append((row, col))
-        else:
+        if candidates:
             # Adicionar o primeiro candidato como sugestão
             first_candidate = list(candidates)[0]
             possible_moves.append((row, col, first_candidate))
@@ -252,7 +605,7 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     print(board)
     
     # Análise inicial
-    info = board.get_board_info()
+    info = board.info
     print(f"\n📊 ANÁLISE INICIAL:")
     print(f"  Tamanho: {board.size}x{board.size}")
     print(f"  Tipo: Aberto (com células vazias)")
@@ -274,11 +627,10 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     print(f"\n🔍 ANALISANDO CANDIDATOS:")
     candidates_matrix = board.get_candidates_matrix()
     
-    cells_without_candidates = []
     for (row, col), candidates in candidates_matrix.items():
         print(f"  Célula ({row},{col}): candidatos = {candidates}")
-        if not candidates:
-            cells_without_candidates.append((row, col))
+    
+    cells_without_candidates = _cells_without_candidates(board)
     
     if cells_without_candidates:
         print(f"\n❌ CÉLULAS SEM CANDIDATOS:")
@@ -291,6 +643,17 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
             'cells_without_candidates': cells_without_candidates
         }
     
+    # Busca exata: se o backtracking não encontra solução, o LTN nem é executado
+    if solve_board(board) is None:
+        print(f"\n❌ RESULTADO: NÃO SOLUCIONÁVEL")
+        print(f"📝 Motivo: Busca exata não encontrou solução")
+        
+        return {
+            'solvable': False,
+            'reason': 'Busca exata não encontrou solução',
+            'remaining_positions': len(info['posicoes_abertas'])
+        }
+    
     # Analisar possíveis jogadas usando heurísticas
     print(f"\n🎯 ANALISANDO HEURÍSTICAS:")
     
@@ -311,48 +674,39 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     print("  🔍 Procurando Hidden Singles...")
     hidden_singles = []
     
-    # Verificar linhas
-    for row in range(board.size):
-        for value in range(1, board.size + 1):
-            cells_with_value = []
-            for col in range(board.size):
-                if board.board[row, col] == 0 and value in board.get_possible_numbers(row, col):
-                    cells_with_value.append((row, col))
-            
-            if len(cells_with_value) == 1:
-                r, c = cells_with_value[0]
-                hidden_singles.append((r, c, value, f"Hidden Single (linha {row})"))
-                print(f"    ✅ Hidden Single: ({r},{c}) = {value} (linha {row})")
+    # Matriz (n, n, n) de candidatos: cube[r, c, v-1] indica se v é candidato em (r, c)
+    cube = _candidates_cube(board)
+    
+    # Verificar linhas: quantas células de cada linha aceitam cada número
+    row_counts = cube.sum(axis=1)
+    for row, value_idx in zip(*np.nonzero(row_counts == 1)):
+        r, c = int(row), int(np.argmax(cube[row, :, value_idx]))
+        value = int(value_idx) + 1
+        hidden_singles.append((r, c, value, f"Hidden Single (linha {row})"))
+        print(f"    ✅ Hidden Single: ({r},{c}) = {value} (linha {row})")
     
     # Verificar colunas
-    for col in range(board.size):
-        for value in range(1, board.size + 1):
-            cells_with_value = []
-            for row in range(board.size):
-                if board.board[row, col] == 0 and value in board.get_possible_numbers(row, col):
-                    cells_with_value.append((row, col))
-            
-            if len(cells_with_value) == 1:
-                r, c = cells_with_value[0]
-                hidden_singles.append((r, c, value, f"Hidden Single (coluna {col})"))
-                print(f"    ✅ Hidden Single: ({r},{c}) = {value} (coluna {col})")
-    
-    # Verificar quadrantes
-    box_size = int(np.sqrt(board.size))
-    for box_row in range(0, board.size, box_size):
-        for box_col in range(0, board.size, box_size):
-            for value in range(1, board.size + 1):
-                cells_with_value = []
-                for r in range(box_row, box_row + box_size):
-                    for c in range(box_col, box_col + box_size):
-                        if board.board[r, c] == 0 and value in board.get_possible_numbers(r, c):
-                            cells_with_value.append((r, c))
-                
-                if len(cells_with_value) == 1:
-                    r, c = cells_with_value[0]
-                    box_idx = (box_row // box_size) * box_size + (box_col // box_size)
-                    hidden_singles.append((r, c, value, f"Hidden Single (quadrante {box_idx})"))
-                    print(f"    ✅ Hidden Single: ({r},{c}) = {value} (quadrante {box_idx})")
+    col_counts = cube.sum(axis=0)
+    for col, value_idx in zip(*np.nonzero(col_counts == 1)):
+        r, c = int(np.argmax(cube[:, col, value_idx])), int(col)
+        value = int(value_idx) + 1
+        hidden_singles.append((r, c, value, f"Hidden Single (coluna {col})"))
+        print(f"    ✅ Hidden Single: ({r},{c}) = {value} (coluna {col})")
+    
+    # Verificar quadrantes: box_cube[q, k] é a k-ésima célula (em ordem de leitura) do quadrante q
+    box_size = board.box_size
+    box_cube = (cube.reshape(box_size, box_size, box_size, box_size, board.size)
+                .transpose(0, 2, 1, 3, 4)
+                .reshape(board.size, board.size, board.size))
+    box_counts = box_cube.sum(axis=1)
+    for box_idx, value_idx in zip(*np.nonzero(box_counts == 1)):
+        box_idx = int(box_idx)
+        k = int(np.argmax(box_cube[box_idx, :, value_idx]))
+        r = (box_idx // box_size) * box_size + k // box_size
+        c = (box_idx % box_size) * box_size + k % box_size
+        value = int(value_idx) + 1
+        hidden_singles.append((r, c, value, f"Hidden Single (quadrante {box_idx})"))
+        print(f"    ✅ Hidden Single: ({r},{c}) = {value} (quadrante {box_idx})")
     
     possible_moves.extend(hidden_singles)
     
@@ -361,23 +715,14 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
     confidence_moves = []
     
     for (row, col), candidates in candidates_matrix.items():
-        best_confidence = 0
-        best_value = None
-        
-        for value in candidates:
-            # Simular o movimento
-            temp_board = SudokuBoard(board.board.copy())
-            temp_board.board[row, col] = value
-            
-            # Verificar se é válido
-            if temp_board.is_valid():
-                # Calcular confiança baseada no número de candidatos
-                confidence = 1.0 / len(candidates)  # Menos candidatos = maior confiança
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_value = value
+        # O tabuleiro já é válido e todo candidato está fora da linha, coluna e
+        # quadrante da célula, então qualquer candidato mantém o tabuleiro válido:
+        # não é preciso simular cada jogada em uma cópia e validá-la de novo
+        best_value = next(iter(candidates), None)
         
         if best_value is not None:
+            # Calcular confiança baseada no número de candidatos
+            best_confidence = 1.0 / len(candidates)  # Menos candidatos = maior confiança
             confidence_moves.append((row, col, best_value, f"Movimento por confiança ({best_confidence:.2f})"))
             print(f"    📊 Movimento sugerido: ({row},{col}) = {best_value} (confiança: {best_confidence:.2f})")
     
@@ -424,85 +769,328 @@ def check_solvability(board: SudokuBoard, solver: SudokuLTNSolver) -> Dict:
             'heuristic_moves': unique_moves
         }
 
-def get_training_configs_4x4(data_dir: str) -> List[Dict]:
-    """
-    Retorna as configurações de treinamento para 4x4
+# Situações de treinamento de cada dimensão: (arquivo, nome, descrição)
+_CONFIG_TEMPLATES_4X4 = (
+    ("sudoku_4x4_closed_valid.csv", "Sudokus 4x4 Fechados Válidos",
+     "Aprende a reconhecer sudokus 4x4 completos e corretos"),
+    ("sudoku_4x4_closed_invalid.csv", "Sudokus 4x4 Fechados Inválidos",
+     "Aprende a identificar sudokus 4x4 completos mas incorretos"),
+    ("sudoku_4x4_open_solvable.csv", "Sudokus 4x4 Abertos Solucionáveis",
+     "Aprende a resolver sudokus 4x4 parciais com solução"),
+    ("sudoku_4x4_open_unsolvable.csv", "Sudokus 4x4 Abertos Impossíveis",
+     "Aprende a identificar sudokus 4x4 impossíveis de resolver"),
+)
+
+_CONFIG_TEMPLATES_9X9 = (
+    ("sudoku_closed_valid.csv", "Sudokus 9x9 Fechados Válidos",
+     "Aprende a reconhecer sudokus 9x9 completos e corretos"),
+    ("sudoku_closed_invalid.csv", "Sudokus 9x9 Fechados Inválidos",
+     "Aprende a identificar sudokus 9x9 completos mas incorretos"),
+    ("sudoku_open_solvable.csv", "Sudokus 9x9 Abertos Solucionáveis",
+     "Aprende a resolver sudokus 9x9 parciais com solução"),
+    ("sudoku_open_unsolvable.csv", "Sudokus 9x9 Abertos Impossíveis",
+     "Aprende a identificar sudokus 9x9 impossíveis de resolver"),
+)
+
+def _make_configs(base_path: str, templates: Tuple, max_samples: int) -> List[Dict]:
     """
-    max_samples = 20000
-    base_path = os.path.join(data_dir, "4x4")
+    Monta as configurações de treinamento a partir dos modelos de situação
     
-    training_configs = [
-        {
-            "name": "Sudokus 4x4 Fechados Válidos",
-            "file": os.path.join(base_path, "sudoku_4x4_closed_valid.csv"),
-            "description": "Aprende a reconhecer sudokus 4x4 completos e corretos",
-            "max_samples": max_samples
-        },
-        {
-            "name": "Sudokus 4x4 Fechados Inválidos", 
-            "file": os.path.join(base_path, "sudoku_4x4_closed_invalid.csv"),
-            "description": "Aprende a identificar sudokus 4x4 completos mas incorretos",
-            "max_samples": max_samples
-        },
-        {
-            "name": "Sudokus 4x4 Abertos Solucionáveis",
-            "file": os.path.join(base_path, "sudoku_4x4_open_solvable.csv"), 
-            "description": "Aprende a resolver sudokus 4x4 parciais com solução",
-            "max_samples": max_samples
-        },
+    Args:
+        base_path: Diretório dos arquivos CSV
+        templates: Tuplas (arquivo, nome, descrição)
+        max_samples: Número máximo de amostras por situação
+        
+    Returns:
+        List[Dict]: Configurações (name, file, description, max_samples)
+    """
+    return [
         {
-            "name": "Sudokus 4x4 Abertos Impossíveis",
-            "file": os.path.join(base_path, "sudoku_4x4_open_unsolvable.csv"),
-            "description": "Aprende a identificar sudokus 4x4 impossíveis de resolver",
+            "name": name,
+            "file": os.path.join(base_path, file_name),
+            "description": description,
             "max_samples": max_samples
         }
+        for file_name, name, description in templates
     ]
-    
-    return training_configs
+
+def get_training_configs_4x4(data_dir: str) -> List[Dict]:
+    """
+    Retorna as configurações de treinamento para 4x4
+    """
+    return _make_configs(os.path.join(data_dir, "4x4"), _CONFIG_TEMPLATES_4X4, max_samples=20000)
 
 def get_training_configs_9x9(data_dir: str) -> List[Dict]:
     """
     Retorna as configurações de treinamento para 9x9
     """
-    max_samples = 500
     base_path = os.path.join(data_dir, "9x9")
     
     # Verificar se existe o diretório 9x9, senão usar a raiz
     if not os.path.exists(base_path):
         base_path = data_dir
+    
+    return _make_configs(base_path, _CONFIG_TEMPLATES_9X9, max_samples=500)
+
+def _train_boards(solver: SudokuLTNSolver, sudokus: np.ndarray, is_open_sudokus, name: str, epochs: int) -> Dict:
+    """
+    Treina o solver com um batch já carregado e resume o resultado
+    
+    Args:
+        solver: Solver LTN a ser treinado
+        sudokus: Array (N, n, n) int8 com os tabuleiros
+        is_open_sudokus: True/False para o batch todo, ou máscara booleana (N,) por tabuleiro
+        name: Nome da situação (para o histórico e as mensagens)
+        epochs: Número de épocas
         
-    training_configs = [
-        {
-            "name": "Sudokus 9x9 Fechados Válidos",
-            "file": os.path.join(base_path, "sudoku_closed_valid.csv"),
-            "description": "Aprende a reconhecer sudokus 9x9 completos e corretos",
-            "max_samples": max_samples
-        },
-        {
-            "name": "Sudokus 9x9 Fechados Inválidos", 
-            "file": os.path.join(base_path, "sudoku_closed_invalid.csv"),
-            "description": "Aprende a identificar sudokus 9x9 completos mas incorretos",
-            "max_samples": max_samples
-        },
-        {
-            "name": "Sudokus 9x9 Abertos Solucionáveis",
-            "file": os.path.join(base_path, "sudoku_open_solvable.csv"), 
-            "description": "Aprende a resolver sudokus 9x9 parciais com solução",
-            "max_samples": max_samples
-        },
-        {
-            "name": "Sudokus 9x9 Abertos Impossíveis",
-            "file": os.path.join(base_path, "sudoku_open_unsolvable.csv"),
-            "description": "Aprende a identificar sudokus 9x9 impossíveis de resolver",
-            "max_samples": max_samples
+    Returns:
+        Dict: Resultados do treinamento
+    """
+    print(f"🎓 Iniciando treinamento com {len(sudokus)} amostras por {epochs} épocas...")
+    start_time = time.time()
+    
+    try:
+        solver.train_with_boards(sudokus, epochs=epochs, situation_type=name, is_open_sudokus=is_open_sudokus)
+        
+        training_time = time.time() - start_time
+        summary = solver.get_training_summary()
+        
+        print(f"✅ Treinamento concluído em {training_time:.2f}s")
+        print(f"📊 Loss final: {summary.get('final_loss', 0):.4f}")
+        print(f"📊 Satisfação final: {summary.get('final_satisfaction', 0):.4f}")
+        
+        return {
+            'samples': len(sudokus),
+            'epochs': epochs,
+            'training_time': training_time,
+            'final_loss': summary.get('final_loss', 0),
+            'final_satisfaction': summary.get('final_satisfaction', 0)
         }
+        
+    except Exception as e:
+        print(f"❌ Erro no treinamento: {e}")
+        return {'error': str(e)}
+
+def _train_situation(solver: SudokuLTNSolver, config: Dict, epochs: int, use_cache: bool = False) -> Dict:
+    """
+    Treina o solver com o conjunto de dados de uma situação
+    
+    Args:
+        solver: Solver LTN a ser treinado
+        config: Configuração da situação (name, file, max_samples)
+        epochs: Número de épocas
+        use_cache: Reutilizar o cache .npy do CSV (ver `load_sudokus_batch`)
+        
+    Returns:
+        Dict: Resultados do treinamento, ou None se os dados não puderam ser carregados
+    """
+    # Carregar dados como um único array (N, n, n), sem um SudokuBoard por linha
+    csv_path = config['file']
+    sudokus = load_sudokus_batch(csv_path, config['max_samples'], solver.board_size, use_cache=use_cache)
+    
+    if len(sudokus) == 0:
+        print(f"❌ Falha ao carregar dados de {csv_path}")
+        return None
+    
+    # Determinar se são sudokus abertos ou fechados baseado no nome do arquivo
+    is_open_sudokus = "open" in config['file']
+    
+    return _train_boards(solver, sudokus, is_open_sudokus, config['name'], epochs)
+
+def _train_situations_fused(solver: SudokuLTNSolver, training_configs: List[Dict], epochs: int,
+                            use_cache: bool = False) -> Dict:
+    """
+    Treina todas as situações juntas, em um único laço de épocas sobre um só batch
+    
+    Os tabuleiros das situações são concatenados em um array (N, n, n) com uma
+    máscara de abertos/fechados, de modo que cada predicate recebe um único
+    conjunto de dados (e um forward por batch) em vez de um por situação.
+    
+    Args:
+        solver: Solver LTN a ser treinado
+        training_configs: Configurações das situações
+        epochs: Número de épocas
+        use_cache: Reutilizar o cache .npy dos CSVs
+        
+    Returns:
+        Dict: Resultados do treinamento conjunto
+    """
+    print(f"\n🔗 TREINANDO {len(training_configs)} SITUAÇÕES EM UM ÚNICO BATCH")
+    print("-" * 50)
+    
+    batches = []
+    open_flags = []
+    for config in training_configs:
+        sudokus = load_sudokus_batch(config['file'], config['max_samples'], solver.board_size, use_cache=use_cache)
+        if len(sudokus) == 0:
+            print(f"❌ Falha ao carregar dados de {config['file']}")
+            continue
+        batches.append(sudokus)
+        open_flags.append("open" in config['file'])
+    
+    if not batches:
+        return {}
+    
+    sudokus = np.concatenate(batches)
+    is_open_sudokus = np.repeat(open_flags, [len(batch) for batch in batches])
+    
+    name = f"Treino conjunto ({len(batches)} situações)"
+    return {name: _train_boards(solver, sudokus, is_open_sudokus, name, epochs)}
+
+def _train_situation_worker(board_size: int, config: Dict, epochs: int, initial_state: Dict,
+                            device: str = None, compile_models: bool = False, use_cache: bool = False):
+    """
+    Treina uma situação em um processo separado, partindo dos mesmos pesos iniciais
+    
+    Args:
+        board_size: Tamanho do tabuleiro
+        config: Configuração da situação
+        epochs: Número de épocas
+        initial_state: state_dicts iniciais dos predicates
+        device: Dispositivo de treinamento ('cpu', 'cuda', 'auto')
+        compile_models: Compilar os modelos com torch.compile
+        use_cache: Reutilizar o cache .npy do CSV
+        
+    Returns:
+        tuple: (nome da situação, state_dicts treinados, histórico, resultados)
+    """
+    solver = SudokuLTNSolver(board_size=board_size, device=device, compile_models=compile_models)
+    solver.load_predicates_state(initial_state)
+    
+    results = _train_situation(solver, config, epochs, use_cache)
+    return config['name'], solver.get_predicates_state(), solver.training_history, results
+
+def _average_predicates_states(states: List[Dict]) -> Dict:
+    """
+    Calcula a média, parâmetro a parâmetro, dos state_dicts treinados em paralelo
+    
+    Args:
+        states: Lista de state_dicts no formato de `get_predicates_state`
+        
+    Returns:
+        Dict: state_dicts com os parâmetros médios
+    """
+    merged = {}
+    for model_name, model_state in states[0].items():
+        merged[model_name] = {
+            param_name: sum(state[model_name][param_name] for state in states) / len(states)
+            for param_name in model_state
+        }
+    return merged
+
+def _train_situations_parallel(solver: SudokuLTNSolver, training_configs: List[Dict], epochs: int,
+                               compile_models: bool = False, use_cache: bool = False) -> Dict:
+    """
+    Treina as situações em processos paralelos e carrega no solver a média dos pesos
+    
+    Args:
+        solver: Solver LTN que recebe os pesos combinados
+        training_configs: Configurações das situações
+        epochs: Número de épocas
+        compile_models: Compilar os modelos dos processos com torch.compile
+        use_cache: Reutilizar o cache .npy dos CSVs
+        
+    Returns:
+        Dict: Resultados do treinamento por situação
+    """
+    import torch.multiprocessing as mp
+    
+    print(f"\n⚡ TREINANDO {len(training_configs)} SITUAÇÕES EM PARALELO")
+    print("-" * 50)
+    
+    initial_state = solver.get_predicates_state()
+    jobs = [(solver.board_size, config, epochs, initial_state, str(solver.device), compile_models, use_cache)
+            for config in training_configs]
+    
+    # 'spawn' evita herdar o estado de threads do PyTorch no processo pai
+    with mp.get_context('spawn').Pool(len(jobs)) as pool:
+        outputs = pool.starmap(_train_situation_worker, jobs)
+    
+    training_results = {}
+    trained_states = []
+    for name, state, history, results in outputs:
+        if results is None:
+            continue
+        training_results[name] = results
+        if 'error' in results:
+            continue
+        trained_states.append(state)
+        solver.training_history['losses'].extend(history['losses'])
+        solver.training_history['satisfactions'].extend(history['satisfactions'])
+        solver.training_history['epochs'] += history['epochs']
+    
+    if trained_states:
+        solver.load_predicates_state(_average_predicates_states(trained_states))
+    
+    return training_results
+
+def _format_training_report(board_size: int, training_results: Dict, model_path: str) -> str:
+    """
+    Monta o texto do relatório de treinamento em memória
+    
+    Args:
+        board_size: Tamanho do tabuleiro
+        training_results: Resultados do treinamento por situação
+        model_path: Caminho onde o modelo foi salvo
+        
+    Returns:
+        str: Relatório completo, pronto para uma única escrita
+    """
+    report_lines = [
+        f"RELATÓRIO DE TREINAMENTO - SISTEMA LTN SUDOKU {board_size}x{board_size}",
+        "=" * 60,
+        f"Data: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+        f"Equipe: Bianka Vasconcelos, Micael Viana, Vinicius Chagas",
+        f"Tamanho do tabuleiro: {board_size}x{board_size}",
+        "",
+        "RESULTADOS POR SITUAÇÃO:",
+        "-" * 40
     ]
     
-    return training_configs
+    total_samples = 0
+    total_time = 0
+    
+    for situation, results in training_results.items():
+        report_lines.append(f"\n{situation}:")
+        if 'error' in results:
+            report_lines.append(f"  ❌ Erro: {results['error']}")
+        else:
+            report_lines.extend([
+                f"  Amostras: {results['samples']}",
+                f"  Épocas: {results['epochs']}",
+                f"  Tempo: {results['training_time']:.2f}s",
+                f"  Loss final: {results['final_loss']:.4f}",
+                f"  Satisfação final: {results['final_satisfaction']:.4f}"
+            ])
+            
+            total_samples += results['samples']
+            total_time += results['training_time']
+    
+    report_lines.extend([
+        f"\nRESUMO GERAL:",
+        f"Tamanho do tabuleiro: {board_size}x{board_size}",
+        f"Total de amostras: {total_samples}",
+        f"Tempo total: {total_time:.2f}s",
+        f"Modelo salvo em: {model_path}"
+    ])
+    
+    return '\n'.join(report_lines) + '\n'
 
-def train_model_for_dimension(board_size: int, data_dir: str, epochs: int = 50):
+def train_model_for_dimension(board_size: int, data_dir: str, epochs: int = 50, parallel: bool = False,
+                              device: str = None, compile_models: bool = False, use_cache: bool = False,
+                              fused: bool = False):
     """
     Treina um modelo para uma dimensão específica (4x4 ou 9x9)
+    
+    Com parallel=True cada situação é treinada em um processo próprio a partir
+    dos mesmos pesos iniciais, e o modelo final é a média dos pesos treinados
+    (no modo sequencial, cada situação continua o treino da anterior). Com
+    fused=True as quatro situações são treinadas juntas em um único batch
+    (ver `_train_situations_fused`).
+    
+    `device` ('cpu', 'cuda' ou 'auto') e `compile_models` (torch.compile) são
+    repassados ao SudokuLTNSolver. Com `use_cache` os CSVs já convertidos em
+    execuções anteriores são lidos do cache .npy (ver `load_sudokus_batch`).
     """
     print(f"\n🎯 TREINAMENTO PARA SUDOKU {board_size}x{board_size}")
     print("=" * 60)
@@ -514,113 +1102,94 @@ def train_model_for_dimension(board_size: int, data_dir: str, epochs: int = 50):
         training_configs = get_training_configs_9x9(data_dir)
     
     # Inicializar solver para a dimensão específica
-    solver = SudokuLTNSolver(board_size=board_size)
-    
-    training_results = {}
+    solver = SudokuLTNSolver(board_size=board_size, device=device, compile_models=compile_models)
+    print(f"🖥️  Dispositivo: {solver.device}")
     
-    for i, config in enumerate(training_configs, 1):
-        print(f"\n{i}️⃣ TREINANDO: {config['name']}")
-        print(f"📝 {config['description']}")
-        print("-" * 50)
-        
-        # Carregar dados
-        csv_path = config['file']
-        sudokus = load_sudokus_from_csv(csv_path, config['max_samples'])
-        
-        if not sudokus:
-            print(f"❌ Falha ao carregar dados de {csv_path}")
-            continue
-        
-        # Treinar para este tipo específico
-        print(f"🎓 Iniciando treinamento com {len(sudokus)} amostras por {epochs} épocas...")
-        start_time = time.time()
+    if fused:
+        training_results = _train_situations_fused(solver, training_configs, epochs, use_cache)
+    elif parallel:
+        training_results = _train_situations_parallel(solver, training_configs, epochs, compile_models, use_cache)
+    else:
+        training_results = {}
         
-        try:
-            # Determinar se são sudokus abertos ou fechados baseado no nome do arquivo
-            is_open_sudokus = "open" in config['file']
-            
-            # Treinar o solver com este conjunto de dados
-            solver.train_with_boards(sudokus, epochs=epochs, situation_type=config['name'], is_open_sudokus=is_open_sudokus)
+        for i, config in enumerate(training_configs, 1):
+            print(f"\n{i}️⃣ TREINANDO: {config['name']}")
+            print(f"📝 {config['description']}")
+            print("-" * 50)
             
-            training_time = time.time() - start_time
-            summary = solver.get_training_summary()
-            
-            training_results[config['name']] = {
-                'samples': len(sudokus),
-                'epochs': epochs,
-                'training_time': training_time,
-                'final_loss': summary.get('final_loss', 0),
-                'final_satisfaction': summary.get('final_satisfaction', 0)
-            }
-            
-            print(f"✅ Treinamento concluído em {training_time:.2f}s")
-            print(f"📊 Loss final: {summary.get('final_loss', 0):.4f}")
-            print(f"📊 Satisfação final: {summary.get('final_satisfaction', 0):.4f}")
-            
-        except Exception as e:
-            print(f"❌ Erro no treinamento: {e}")
-            training_results[config['name']] = {'error': str(e)}
+            results = _train_situation(solver, config, epochs, use_cache)
+            if results is not None:
+                training_results[config['name']] = results
     
     # Salvar modelo para esta dimensão
-    model_path = f"models/sudoku_ltn_{board_size}x{board_size}.pth"
-    os.makedirs("models", exist_ok=True)
+    model_path = MODEL_PATHS[board_size]
+    os.makedirs(MODELS_DIR, exist_ok=True)
     
     print(f"\n💾 Salvando modelo {board_size}x{board_size} em: {model_path}")
     solver.save_model(model_path)
     
     # Criar relatório de treinamento
-    report_path = f"models/training_report_{board_size}x{board_size}.txt"
-    with open(report_path, 'w') as f:
-        f.write(f"RELATÓRIO DE TREINAMENTO - SISTEMA LTN SUDOKU {board_size}x{board_size}\n")
-        f.write("=" * 60 + "\n")
-        f.write(f"Data: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Equipe: Bianka Vasconcelos, Micael Viana, Vinicius Chagas\n")
-        f.write(f"Tamanho do tabuleiro: {board_size}x{board_size}\n\n")
-        
-        f.write("RESULTADOS POR SITUAÇÃO:\n")
-        f.write("-" * 40 + "\n")
-        
-        total_samples = 0
-        total_time = 0
-        
-        for situation, results in training_results.items():
-            f.write(f"\n{situation}:\n")
-            if 'error' in results:
-                f.write(f"  ❌ Erro: {results['error']}\n")
-            else:
-                f.write(f"  Amostras: {results['samples']}\n")
-                f.write(f"  Épocas: {results['epochs']}\n")
-                f.write(f"  Tempo: {results['training_time']:.2f}s\n")
-                f.write(f"  Loss final: {results['final_loss']:.4f}\n")
-                f.write(f"  Satisfação final: {results['final_satisfaction']:.4f}\n")
-                
-                total_samples += results['samples']
-                total_time += results['training_time']
-        
-        f.write(f"\nRESUMO GERAL:\n")
-        f.write(f"Tamanho do tabuleiro: {board_size}x{board_size}\n")
-        f.write(f"Total de amostras: {total_samples}\n")
-        f.write(f"Tempo total: {total_time:.2f}s\n")
-        f.write(f"Modelo salvo em: {model_path}\n")
+    report_path = REPORT_PATHS[board_size]
+    report = _format_training_report(board_size, training_results, model_path)
+    
+    # Gravar o relatório com uma única escrita; a troca
+    # atômica evita deixar um relatório pela metade se a execução for interrompida
+    tmp_report_path = Path(report_path + ".tmp")
+    tmp_report_path.write_text(report)
+    os.replace(tmp_report_path, report_path)
     
     print(f"📄 Relatório salvo em: {report_path}")
     return model_path, training_results
 
-def test_model_for_dimension(board_size: int, model_path: str, data_dir: str):
+# Solvers já carregados neste processo: (tamanho, modelo, dispositivo) -> (mtime do modelo, solver)
+_solver_cache: Dict[Tuple[int, str, str], Tuple[Optional[float], SudokuLTNSolver]] = {}
+
+def get_solver(board_size: int, model_path: str, device: str = None) -> Tuple[SudokuLTNSolver, bool]:
+    """
+    Retorna um solver com o modelo carregado, reaproveitando o do mesmo processo
+    
+    O solver é memorizado por (tamanho, caminho do modelo, dispositivo) e só é
+    recriado se o arquivo do modelo mudar (por exemplo, após um novo treinamento).
+    
+    Args:
+        board_size: Tamanho do tabuleiro (4 ou 9)
+        model_path: Caminho do modelo salvo
+        device: Dispositivo do solver
+        
+    Returns:
+        tuple: (solver, se o modelo foi encontrado e carregado)
+    """
+    # Só um arquivo regular conta como modelo salvo (um diretório com o mesmo nome não)
+    try:
+        st = os.stat(model_path)
+        mtime = st.st_mtime if stat.S_ISREG(st.st_mode) else None
+    except OSError:
+        mtime = None
+    
+    key = (board_size, model_path, str(device))
+    cached = _solver_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], mtime is not None
+    
+    solver = SudokuLTNSolver(board_size=board_size, device=device)
+    if mtime is not None:
+        solver.load_model(model_path)
+    
+    _solver_cache[key] = (mtime, solver)
+    return solver, mtime is not None
+
+@torch.inference_mode()
+def test_model_for_dimension(board_size: int, model_path: str, data_dir: str, device: str = None):
     """
     Testa um modelo para uma dimensão específica
     """
     print(f"\n🧪 TESTANDO MODELO {board_size}x{board_size}")
     print("=" * 60)
     
-    # Inicializar solver
-    solver = SudokuLTNSolver(board_size=board_size)
-    
-    # Carregar o modelo
+    # Inicializar solver e carregar o modelo
     print(f"📂 Carregando modelo: {model_path}")
-    if os.path.exists(model_path):
-        solver.load_model(model_path)
-    else:
+    solver, model_loaded = get_solver(board_size, model_path, device)
+    if not model_loaded:
         print(f"❌ Modelo não encontrado: {model_path}")
         return
     
@@ -649,23 +1218,25 @@ def test_model_for_dimension(board_size: int, model_path: str, data_dir: str):
                 ("data/sudoku_closed_invalid.csv", "9x9 Fechado Inválido")
             ]
     
+    expected_length = board_size * board_size
     for file_path, category in data_files:
         if os.path.exists(file_path):
             print(f"\n🔍 Testando {category}...")
             
             # Carrega apenas alguns exemplos para teste
             with open(file_path, 'r') as f:
-                lines = f.readlines()[:3]  # Apenas 3 exemplos
+                lines = list(islice(f, 3))  # Apenas 3 exemplos
             
             for i, line in enumerate(lines):
                 sudoku_str = line.strip()
-                expected_length = board_size * board_size
                 if len(sudoku_str) == expected_length:
+                    # Cada teste tem o próprio tratamento de erro: uma falha não
+                    # interrompe os demais
                     try:
                         board = sudoku_string_to_board(sudoku_str)
                         
                         print(f"  Teste {i+1} ({category}):")
-                        info = board.get_board_info()
+                        info = board.info
                         print(f"    Tipo: {info['tipo']}")
                         print(f"    Válido: {info['valido']}")
                         print(f"    Posições abertas: {len(info['posicoes_abertas'])}")
@@ -677,6 +1248,77 @@ def test_model_for_dimension(board_size: int, model_path: str, data_dir: str):
                     except Exception as e:
                         print(f"    Erro no teste {i+1}: {e}")
 
+@torch.inference_mode()
+def process_board_file(csv_path: str, device: str = None):
+    """
+    Carrega um tabuleiro de um CSV e executa a questão correspondente
+    
+    Todo o fluxo roda em torch.inference_mode(): o solver só é consultado,
+    sem construir grafos de gradiente.
+    
+    Args:
+        csv_path: Caminho do arquivo CSV com o tabuleiro
+        device: Dispositivo do solver
+    """
+    print(f"\n📁 PROCESSANDO ARQUIVO: {csv_path}")
+    
+    # Carregar o sudoku do arquivo
+    board = load_sudoku_from_csv(csv_path)
+    if board is None:
+        print("❌ Falha ao carregar o sudoku. Encerrando...")
+        return
+    
+    # Detectar tamanho do tabuleiro
+    board_size = board.size
+    print(f"🎲 Tamanho do tabuleiro detectado: {board_size}x{board_size}")
+    
+    # Inicializar solver com o tamanho correto, carregando o modelo se existir
+    model_path = MODEL_PATHS[board_size]
+    solver, model_loaded = get_solver(board_size, model_path, device)
+    if model_loaded:
+        print(f"✅ Modelo carregado: {model_path}")
+    else:
+        print(f"⚠️  Modelo não encontrado: {model_path}")
+        print("Executando sem modelo pré-treinado...")
+    
+    # Verificar se o tabuleiro está aberto ou fechado
+    if board.is_closed():
+        print(f"\n🔒 TABULEIRO FECHADO DETECTADO")
+        print("Executando Questão 1: Classificação de tabuleiro fechado")
+        
+        result = classify_closed_board(board)
+        
+    elif board.is_open():
+        print(f"\n🔓 TABULEIRO ABERTO DETECTADO")
+        print("Escolha a operação:")
+        print("  2 - Questão 2: Classificar tabuleiro aberto e sugerir jogadas")
+        print("  3 - Questão 3: Verificar se é solucionável")
+        
+        while True:
+            try:
+                choice = input("\nDigite sua escolha (2 ou 3): ").strip()
+                if choice == "2":
+                    print("\nExecutando Questão 2: Classificação de tabuleiro aberto")
+                    result = solve_open_board(board, solver)
+                    break
+                elif choice == "3":
+                    print("\nExecutando Questão 3: Verificação de solucionabilidade")
+                    result = check_solvability(board, solver)
+                    break
+                else:
+                    print("❌ Opção inválida. Digite 2 ou 3.")
+            except KeyboardInterrupt:
+                print("\n\n❌ Operação cancelada pelo usuário.")
+                return
+            except Exception as e:
+                print(f"❌ Erro na entrada: {e}")
+    
+    else:
+        print("❌ Erro: Não foi possível determinar se o tabuleiro está aberto ou fechado.")
+        return
+    
+    print(f"\n🎉 PROCESSAMENTO CONCLUÍDO!")
+
 def main():
     """
     Função principal do sistema
@@ -690,9 +1332,43 @@ def main():
     parser.add_argument('--epochs', type=int, default=30, help='Número de épocas de treinamento')
     parser.add_argument('--data-dir', type=str, default='data', help='Diretório dos dados')
     parser.add_argument('--board-size', type=int, choices=[4, 9], help='Tamanho do tabuleiro (4 ou 9)')
+    parser.add_argument('--parallel', action='store_true', help='Treinar as situações em processos paralelos (média dos pesos)')
+    parser.add_argument('--fused', action='store_true', help='Treinar as quatro situações juntas em um único batch')
+    parser.add_argument('--device', type=str, default='auto', choices=['cpu', 'cuda', 'auto'],
+                        help='Dispositivo dos modelos (auto: cuda se disponível)')
+    parser.add_argument('--compile', action='store_true', help='Compilar os modelos com torch.compile no treinamento')
+    parser.add_argument('--cache', action='store_true',
+                        help='Ler/gravar o cache .npy dos CSVs de treinamento (arquivos <csv>.*.packed.npy em data/)')
+    parser.add_argument('--verbose', action='store_true', help='Mostrar detalhes de cada iteração e movimento do solver')
     
     args = parser.parse_args()
     
+    # Se nenhuma ação foi pedida, mostrar o uso e sair antes do banner e da inicialização
+    if not any([args.path, args.train_4x4, args.train_9x9, args.test_4x4, args.test_9x9]):
+        print("\n📖 USO:")
+        print("  python main.py --path arquivo.csv")
+        print("  python main.py --train-4x4 --epochs 30")
+        print("  python main.py --train-9x9 --epochs 30")
+        print("  python main.py --test-4x4")
+        print("  python main.py --test-9x9")
+        print("\n📋 EXEMPLOS:")
+        print("  # Processar um tabuleiro do arquivo CSV")
+        print("  python main.py --path data/meu_sudoku.csv")
+        print("\n  # Treinar modelo 4x4")
+        print("  python main.py --train-4x4 --epochs 50")
+        print("\n  # Treinar modelo 9x9")
+        print("  python main.py --train-9x9 --epochs 50")
+        print("\n  # Testar modelo 4x4")
+        print("  python main.py --test-4x4")
+        print("\n  # Testar modelo 9x9")
+        print("  python main.py --test-9x9")
+        return
+    
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    
+    # Dispositivo decidido uma única vez e repassado a todos os solvers
+    device = resolve_device(args.device)
+    
     print("=" * 80)
     print("SISTEMA LTN PARA RESOLUÇÃO DE SUDOKU - VERSÃO SEPARADA POR DIMENSÃO")
     print("Projeto Final - Inteligência Artificial - UFAM")
@@ -701,74 +1377,17 @@ def main():
     
     # Se foi fornecido um arquivo CSV, processar o tabuleiro
     if args.path:
-        print(f"\n📁 PROCESSANDO ARQUIVO: {args.path}")
-        
-        # Carregar o sudoku do arquivo
-        board = load_sudoku_from_csv(args.path)
-        if board is None:
-            print("❌ Falha ao carregar o sudoku. Encerrando...")
-            return
-        
-        # Detectar tamanho do tabuleiro
-        board_size = board.size
-        print(f"🎲 Tamanho do tabuleiro detectado: {board_size}x{board_size}")
-        
-        # Inicializar solver com o tamanho correto
-        solver = SudokuLTNSolver(board_size=board_size)
-        
-        # Carregar modelo se existir
-        model_path = f"models/sudoku_ltn_{board_size}x{board_size}.pth"
-        if os.path.exists(model_path):
-            solver.load_model(model_path)
-            print(f"✅ Modelo carregado: {model_path}")
-        else:
-            print(f"⚠️  Modelo não encontrado: {model_path}")
-            print("Executando sem modelo pré-treinado...")
-        
-        # Verificar se o tabuleiro está aberto ou fechado
-        if board.is_closed():
-            print(f"\n🔒 TABULEIRO FECHADO DETECTADO")
-            print("Executando Questão 1: Classificação de tabuleiro fechado")
-            
-            result = classify_closed_board(board)
-            
-        elif board.is_open():
-            print(f"\n🔓 TABULEIRO ABERTO DETECTADO")
-            print("Escolha a operação:")
-            print("  2 - Questão 2: Classificar tabuleiro aberto e sugerir jogadas")
-            print("  3 - Questão 3: Verificar se é solucionável")
-            
-            while True:
-                try:
-                    choice = input("\nDigite sua escolha (2 ou 3): ").strip()
-                    if choice == "2":
-                        print("\nExecutando Questão 2: Classificação de tabuleiro aberto")
-                        result = solve_open_board(board, solver)
-                        break
-                    elif choice == "3":
-                        print("\nExecutando Questão 3: Verificação de solucionabilidade")
-                        result = check_solvability(board, solver)
-                        break
-                    else:
-                        print("❌ Opção inválida. Digite 2 ou 3.")
-                except KeyboardInterrupt:
-                    print("\n\n❌ Operação cancelada pelo usuário.")
-                    return
-                except Exception as e:
-                    print(f"❌ Erro na entrada: {e}")
-        
-        else:
-            print("❌ Erro: Não foi possível determinar se o tabuleiro está aberto ou fechado.")
-            return
-        
-        print(f"\n🎉 PROCESSAMENTO CONCLUÍDO!")
+        process_board_file(args.path, device)
         return
     
     # Treinar modelo 4x4
     if args.train_4x4:
         print(f"\n�� TREINANDO MODELO 4x4")
         try:
-            model_path, training_results = train_model_for_dimension(4, args.data_dir, args.epochs)
+            model_path, training_results = train_model_for_dimension(4, args.data_dir, args.epochs, parallel=args.parallel,
+                                                                     device=device, compile_models=args.compile,
+                                                                     use_cache=args.cache,
+                                                                     fused=args.fused)
             print(f"\n🎉 TREINAMENTO 4x4 CONCLUÍDO!")
             print(f"Modelo salvo em: {model_path}")
         except Exception as e:
@@ -780,7 +1399,10 @@ def main():
     if args.train_9x9:
         print(f"\n🎓 TREINANDO MODELO 9x9")
         try:
-            model_path, training_results = train_model_for_dimension(9, args.data_dir, args.epochs)
+            model_path, training_results = train_model_for_dimension(9, args.data_dir, args.epochs, parallel=args.parallel,
+                                                                     device=device, compile_models=args.compile,
+                                                                     use_cache=args.cache,
+                                                                     fused=args.fused)
             print(f"\n🎉 TREINAMENTO 9x9 CONCLUÍDO!")
             print(f"Modelo salvo em: {model_path}")
         except Exception as e:
@@ -790,33 +1412,11 @@ def main():
     
     # Testar modelo 4x4
     if args.test_4x4:
-        model_path = "models/sudoku_ltn_4x4.pth"
-        test_model_for_dimension(4, model_path, args.data_dir)
+        test_model_for_dimension(4, MODEL_PATHS[4], args.data_dir, device=device)
     
     # Testar modelo 9x9
     if args.test_9x9:
-        model_path = "models/sudoku_ltn_9x9.pth"
-        test_model_for_dimension(9, model_path, args.data_dir)
-    
-    # Se nenhum argumento foi fornecido, mostrar ajuda
-    if not any([args.path, args.train_4x4, args.train_9x9, args.test_4x4, args.test_9x9, args.solve]):
-        print("\n📖 USO:")
-        print("  python main.py --path arquivo.csv")
-        print("  python main.py --train-4x4 --epochs 30")
-        print("  python main.py --train-9x9 --epochs 30")
-        print("  python main.py --test-4x4")
-        print("  python main.py --test-9x9")
-        print("\n📋 EXEMPLOS:")
-        print("  # Processar um tabuleiro do arquivo CSV")
-        print("  python main.py --path data/meu_sudoku.csv")
-        print("\n  # Treinar modelo 4x4")
-        print("  python main.py --train-4x4 --epochs 50")
-        print("\n  # Treinar modelo 9x9")
-        print("  python main.py --train-9x9 --epochs 50")
-        print("\n  # Testar modelo 4x4")
-        print("  python main.py --test-4x4")
-        print("\n  # Resolver sudoku 4x4")
-        print("  python main.py --solve --board-size 4")
+        test_model_for_dimension(9, MODEL_PATHS[9], args.data_dir, device=device)
 
 if __name__ == "__main__":
     main()
@@ -4,210 +4,491 @@ Script para gerar sudokus fechados inválidos a partir de sudokus válidos.
 Introduz diferentes tipos de erros para criar exemplos de sudokus incorretos.
 """
 
-import random
 import csv
-from typing import List, Set
+import mmap
+import multiprocessing
+import os
+from itertools import islice
+from typing import List, Set, Tuple
 
-def sudoku_string_to_grid(sudoku_str: str) -> List[List[int]]:
-    """Converte string de sudoku em grid 9x9"""
-    return [[int(sudoku_str[i*9 + j]) for j in range(9)] for i in range(9)]
+import numpy as np
 
-def grid_to_sudoku_string(grid: List[List[int]]) -> str:
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Gerador aleatório único do script (PCG64); --seed torna a geração reproduzível.
+# A SeedSequence fica guardada para derivar as sementes dos processos do pool
+_seed_seq = np.random.SeedSequence()
+_rng = np.random.default_rng(_seed_seq)
+
+# Acima deste número de sudokus a geração é dividida em blocos num pool de processos
+_PARALLEL_MIN_COUNT = 100_000
+_CHUNK_SIZE = 50_000
+
+def sudoku_string_to_grid(sudoku_str: str) -> np.ndarray:
+    """Converte string de sudoku em grid 9x9 uint8 ('.' vale 0)"""
+    digits = np.frombuffer(sudoku_str.replace('.', '0').encode('ascii'), dtype=np.uint8)
+    return (digits - ord('0')).reshape(9, 9)
+
+def grid_to_sudoku_string(grid: np.ndarray) -> str:
     """Converte grid 9x9 em string de sudoku"""
-    return ''.join(str(grid[i][j]) for i in range(9) for j in range(9))
+    if grid.max() > 9:
+        # Números inválidos (10-12) ocupam mais de um caractere
+        return ''.join(str(value) for value in grid.ravel())
+    return (grid.astype(np.uint8) + ord('0')).tobytes().decode('ascii')
 
-def introduce_row_duplicate(grid: List[List[int]]) -> List[List[int]]:
-    """Introduz duplicata na mesma linha"""
-    new_grid = [row[:] for row in grid]
-    row_idx = random.randint(0, 8)
+def load_sudoku_rows(input_file: str) -> np.ndarray:
+    """
+    Lê os sudokus com 81 dígitos por linha como texto ASCII, em uma matriz
+    (N, 82) uint8 com o '\n' na última coluna
     
-    # Encontra dois valores diferentes na linha
-    available_positions = list(range(9))
-    pos1, pos2 = random.sample(available_positions, 2)
+    Arquivos de largura fixa (81 dígitos + '\n' por linha) são mapeados com mmap
+    e copiados como uma matriz (N, 82), sem criar uma string por linha; os demais
+    passam pela leitura linha a linha, que descarta as linhas inválidas.
+    """
+    size = os.path.getsize(input_file)
+    
+    with open(input_file, 'rb') as f:
+        if size > 0 and size % 82 == 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = np.frombuffer(mm, dtype=np.uint8).reshape(-1, 82)
+                fixed_width = (view[:, 81] == ord('\n')).all() and ((view[:, :81] - ord('0')) <= 9).all()
+                rows = view.copy() if fixed_width else None
+                del view  # libera a visão antes de fechar o mmap
+            
+            if fixed_width:
+                return rows
+            f.seek(0)
+        
+        lines = [line for line in f.read().split() if len(line) == 81 and line.isdigit()]
     
-    # Faz pos2 ter o mesmo valor que pos1
-    new_grid[row_idx][pos2] = new_grid[row_idx][pos1]
+    if not lines:
+        return np.empty((0, 82), dtype=np.uint8)
     
-    return new_grid
+    return np.frombuffer(b'\n'.join(lines) + b'\n', dtype=np.uint8).reshape(-1, 82).copy()
 
-def introduce_column_duplicate(grid: List[List[int]]) -> List[List[int]]:
-    """Introduz duplicata na mesma coluna"""
-    new_grid = [row[:] for row in grid]
-    col_idx = random.randint(0, 8)
+def load_sudoku_grids(input_file: str) -> np.ndarray:
+    """Lê os sudokus com 81 dígitos por linha em um array (N, 9, 9) uint8"""
+    return (load_sudoku_rows(input_file)[:, :81] - ord('0')).reshape(-1, 9, 9)
+
+def sudokus_to_bytes(grids: np.ndarray) -> bytes:
+    """
+    Monta o texto dos grids (M, 9, 9), um por linha
     
-    # Encontra duas posições diferentes na coluna
-    available_positions = list(range(9))
-    pos1, pos2 = random.sample(available_positions, 2)
+    O texto é montado direto em um buffer uint8: cada célula ocupa um byte, ou
+    dois para os números inválidos (10-12), seguido de '\n' ao fim de cada linha.
+    """
+    # Coluna extra por linha para o '\n' (marcado com -1)
+    values = np.empty((len(grids), 82), dtype=np.int16)
+    values[:, :81] = grids.reshape(len(grids), 81)
+    values[:, 81] = -1
+    values = values.ravel()
+    
+    if values.max(initial=0) <= 9:
+        # Caso comum: buffer (M, 82) com um byte por célula
+        buffer = (values + ord('0')).astype(np.uint8)
+        buffer[81::82] = ord('\n')
+    else:
+        # Posição de cada célula no texto, contando os números de dois dígitos
+        two_digits = values >= 10
+        starts = np.cumsum(1 + two_digits) - (1 + two_digits)
+        
+        buffer = np.empty(len(values) + int(two_digits.sum()), dtype=np.uint8)
+        buffer[starts] = np.where(two_digits, ord('1'), values + ord('0'))
+        buffer[starts[values < 0]] = ord('\n')
+        buffer[starts[two_digits] + 1] = values[two_digits] - 10 + ord('0')
     
-    # Faz pos2 ter o mesmo valor que pos1
-    new_grid[pos2][col_idx] = new_grid[pos1][col_idx]
+    return buffer.tobytes()
+
+def sudoku_rows_to_bytes(rows: np.ndarray) -> bytes:
+    """
+    Monta o texto de sudokus em ASCII (M, 82), como os de `load_sudoku_rows`
     
-    return new_grid
+    As células fora de '0'-'9' guardam o próprio valor inválido (0, 10-12, abaixo
+    de '0' em ASCII); só quando elas existem o texto é remontado por `sudokus_to_bytes`.
+    """
+    grids = rows[:, :81]
+    raw = grids < ord('0')
+    
+    if raw.any():
+        return sudokus_to_bytes(np.where(raw, grids, grids - ord('0')))
+    return rows.tobytes()
 
-def introduce_box_duplicate(grid: List[List[int]]) -> List[List[int]]:
-    """Introduz duplicata no mesmo quadrante 3x3"""
-    new_grid = [row[:] for row in grid]
+# Os 72 pares ordenados de posições distintas (0-8), como (72, 2)
+_PAIRS = np.array([(i, j) for i in range(9) for j in range(9) if i != j], dtype=np.int64)
+
+# Linha e coluna da posição p (0-8) do quadrante b (0-8): _BOX_ROWS[b, p], _BOX_COLS[b, p]
+_BOX_ROWS = np.array([[(b // 3) * 3 + p // 3 for p in range(9)] for b in range(9)], dtype=np.int64)
+_BOX_COLS = np.array([[(b % 3) * 3 + p % 3 for p in range(9)] for b in range(9)], dtype=np.int64)
+
+def _distinct_pairs(count: int):
+    """Sorteia `count` pares de posições distintas (0-8), uniformes entre os 72 pares"""
+    pairs = _PAIRS[_rng.integers(0, len(_PAIRS), count)]
+    return pairs[:, 0], pairs[:, 1]
+
+def _batch_indices(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Índices dos grids a alterar: os `selected` ou o lote inteiro"""
+    return np.arange(len(grids)) if selected is None else selected
+
+def introduce_row_duplicates(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Introduz uma duplicata na mesma linha de cada grid do lote (N, 9, 9) (ou só dos `selected`), no próprio array"""
+    batch = _batch_indices(grids, selected)
+    count = len(batch)
+    rows = _rng.integers(0, 9, count)
+    pos1, pos2 = _distinct_pairs(count)
     
-    # Escolhe um quadrante aleatório
-    box_row = random.randint(0, 2)
-    box_col = random.randint(0, 2)
+    # Faz pos2 ter o mesmo valor que pos1
+    grids[batch, rows, pos2] = grids[batch, rows, pos1]
+    return grids
+
+def introduce_column_duplicates(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Introduz uma duplicata na mesma coluna de cada grid do lote (N, 9, 9) (ou só dos `selected`), no próprio array"""
+    batch = _batch_indices(grids, selected)
+    count = len(batch)
+    cols = _rng.integers(0, 9, count)
+    pos1, pos2 = _distinct_pairs(count)
     
-    # Posições dentro do quadrante
-    positions = [(box_row*3 + i, box_col*3 + j) for i in range(3) for j in range(3)]
+    # Faz pos2 ter o mesmo valor que pos1
+    grids[batch, pos2, cols] = grids[batch, pos1, cols]
+    return grids
+
+def introduce_box_duplicates(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Introduz uma duplicata no mesmo quadrante 3x3 de cada grid do lote (N, 9, 9) (ou só dos `selected`), no próprio array"""
+    batch = _batch_indices(grids, selected)
+    count = len(batch)
     
-    # Escolhe duas posições diferentes no quadrante
-    pos1, pos2 = random.sample(positions, 2)
+    # Quadrante aleatório e duas posições diferentes dentro dele
+    boxes = _rng.integers(0, 9, count)
+    pos1, pos2 = _distinct_pairs(count)
     
     # Faz pos2 ter o mesmo valor que pos1
-    new_grid[pos2[0]][pos2[1]] = new_grid[pos1[0]][pos1[1]]
+    source = grids[batch, _BOX_ROWS[boxes, pos1], _BOX_COLS[boxes, pos1]]
+    grids[batch, _BOX_ROWS[boxes, pos2], _BOX_COLS[boxes, pos2]] = source
+    return grids
+
+def introduce_invalid_numbers(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Introduz um número inválido (0 ou > 9) em cada grid do lote (N, 9, 9) (ou só dos `selected`), no próprio array"""
+    batch = _batch_indices(grids, selected)
+    count = len(batch)
+    rows = _rng.integers(0, 9, count)
+    cols = _rng.integers(0, 9, count)
     
-    return new_grid
+    # Escolhe um número inválido
+    invalid_numbers = np.array([0, 10, 11, 12], dtype=grids.dtype)
+    grids[batch, rows, cols] = _rng.choice(invalid_numbers, count)
+    return grids
 
-def introduce_invalid_number(grid: List[List[int]]) -> List[List[int]]:
-    """Introduz número inválido (0 ou > 9)"""
-    new_grid = [row[:] for row in grid]
+def introduce_multiple_errors_batch(grids: np.ndarray, selected: np.ndarray = None) -> np.ndarray:
+    """Introduz 2-3 duplicatas em cada grid do lote (N, 9, 9) (ou só dos `selected`), no próprio array"""
+    error_functions = [
+        introduce_row_duplicates,
+        introduce_column_duplicates,
+        introduce_box_duplicates
+    ]
     
-    row_idx = random.randint(0, 8)
-    col_idx = random.randint(0, 8)
+    batch = _batch_indices(grids, selected)
+    num_errors = _rng.integers(2, 4, len(batch))
     
-    # Escolhe um número inválido
-    invalid_numbers = [0, 10, 11, 12]
-    new_grid[row_idx][col_idx] = random.choice(invalid_numbers)
+    # Uma passada por erro: todos os grids recebem 2 erros, parte deles um terceiro
+    for error_pass in range(3):
+        active = batch[num_errors > error_pass]
+        choices = _rng.integers(0, len(error_functions), len(active))
+        for k, error_func in enumerate(error_functions):
+            chosen = active[choices == k]
+            if len(chosen):
+                error_func(grids, chosen)
     
-    return new_grid
+    return grids
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _rotl(x, k):
+        """Rotação à esquerda de um uint64"""
+        return (x << np.uint64(k)) | (x >> np.uint64(64 - k))
+    
+    @njit(cache=True)
+    def _xoshiro_next(state):
+        """Próximo número de 64 bits do xoshiro256** (estado uint64 (4,), atualizado no lugar)"""
+        result = _rotl(state[1] * np.uint64(5), 7) * np.uint64(9)
+        t = state[1] << np.uint64(17)
+        
+        state[2] ^= state[0]
+        state[3] ^= state[1]
+        state[1] ^= state[2]
+        state[0] ^= state[3]
+        state[2] ^= t
+        state[3] = _rotl(state[3], 45)
+        return result
+    
+    @njit(cache=True)
+    def _random_below(state, n):
+        """Inteiro aleatório em [0, n), a partir dos bits altos do xoshiro"""
+        return np.int64(_xoshiro_next(state) >> np.uint64(33)) % n
+    
+    @njit(cache=True)
+    def _introduce_duplicate(grid, kind, state):
+        """Copia uma célula sobre outra da mesma linha (0), coluna (1) ou quadrante (2)"""
+        unit = _random_below(state, 9)
+        pair = _random_below(state, 72)
+        pos1 = _PAIRS[pair, 0]
+        pos2 = _PAIRS[pair, 1]
+        
+        if kind == 0:
+            grid[unit, pos2] = grid[unit, pos1]
+        elif kind == 1:
+            grid[pos2, unit] = grid[pos1, unit]
+        else:
+            grid[_BOX_ROWS[unit, pos2], _BOX_COLS[unit, pos2]] = grid[_BOX_ROWS[unit, pos1], _BOX_COLS[unit, pos1]]
+    
+    @njit(cache=True, nogil=True)
+    def introduce_errors_kernel(grids, kinds, state):
+        """
+        Aplica o erro `kinds[i]` em cada grid do lote (N, 9, 9), no próprio array
+        
+        Args:
+            grids: Lote de grids uint8
+            kinds: Tipo de erro de cada grid (índice em ERROR_TYPES)
+            state: Estado uint64 (4,) do xoshiro256**
+        """
+        for i in range(grids.shape[0]):
+            kind = kinds[i]
+            if kind == 3:
+                # Número inválido: 0, 10, 11 ou 12
+                row = _random_below(state, 9)
+                col = _random_below(state, 9)
+                value = _random_below(state, 4)
+                grids[i, row, col] = 0 if value == 0 else 9 + value
+            elif kind == 4:
+                # 2-3 duplicatas de tipos aleatórios
+                for _ in range(2 + _random_below(state, 2)):
+                    _introduce_duplicate(grids[i], _random_below(state, 3), state)
+            else:
+                _introduce_duplicate(grids[i], kind, state)
+else:
+    introduce_errors_kernel = None
+
+# Tipos de erros a introduzir (versões em lote), na ordem dos índices do kernel
+ERROR_TYPES = [
+    ("row_duplicate", introduce_row_duplicates),
+    ("column_duplicate", introduce_column_duplicates),
+    ("box_duplicate", introduce_box_duplicates),
+    ("invalid_number", introduce_invalid_numbers),
+    ("multiple_errors", introduce_multiple_errors_batch)
+]
+
+def introduce_errors(grids: np.ndarray, kinds: np.ndarray) -> np.ndarray:
+    """
+    Aplica o tipo de erro `kinds[i]` (índice em ERROR_TYPES) em cada grid do lote
+    (N, 9, 9), no próprio array
+    
+    Com Numba, um único kernel percorre o lote sem o GIL; sem Numba, cada tipo de
+    erro é aplicado com uma operação vetorizada direto nas células dos grids que
+    o receberam, sem copiá-los e devolvê-los ao lote.
+    """
+    if introduce_errors_kernel is not None:
+        state = _rng.bit_generator.random_raw(4).astype(np.uint64)
+        introduce_errors_kernel(grids, np.asarray(kinds, dtype=np.int64), state)
+        return grids
+    
+    for k, (_, error_func) in enumerate(ERROR_TYPES):
+        selected = np.flatnonzero(kinds == k)
+        if len(selected):
+            error_func(grids, selected)
+    return grids
+
+def introduce_row_duplicate(grid: np.ndarray) -> np.ndarray:
+    """Introduz duplicata na mesma linha"""
+    return introduce_row_duplicates(grid[np.newaxis].copy())[0]
 
-def introduce_multiple_errors(grid: List[List[int]]) -> List[List[int]]:
+def introduce_column_duplicate(grid: np.ndarray) -> np.ndarray:
+    """Introduz duplicata na mesma coluna"""
+    return introduce_column_duplicates(grid[np.newaxis].copy())[0]
+
+def introduce_box_duplicate(grid: np.ndarray) -> np.ndarray:
+    """Introduz duplicata no mesmo quadrante 3x3"""
+    return introduce_box_duplicates(grid[np.newaxis].copy())[0]
+
+def introduce_invalid_number(grid: np.ndarray) -> np.ndarray:
+    """Introduz número inválido (0 ou > 9)"""
+    return introduce_invalid_numbers(grid[np.newaxis].copy())[0]
+
+def introduce_multiple_errors(grid: np.ndarray) -> np.ndarray:
     """Introduz múltiplos erros no mesmo sudoku"""
-    new_grid = [row[:] for row in grid]
+    return introduce_multiple_errors_batch(grid[np.newaxis].copy())[0]
+
+def _generate_chunk(valid_rows: np.ndarray, count: int) -> Tuple[bytes, np.ndarray]:
+    """
+    Gera `count` sudokus inválidos a partir das linhas ASCII (N, 82) válidas
     
-    # Aplica 2-3 erros diferentes
-    num_errors = random.randint(2, 3)
-    error_functions = [
-        introduce_row_duplicate,
-        introduce_column_duplicate,
-        introduce_box_duplicate
-    ]
+    Os erros são aplicados direto nos caracteres ASCII (visão (M, 9, 9) das
+    linhas), sem converter os dígitos para números e de volta.
+    
+    Returns:
+        Tuple[bytes, np.ndarray]: Texto dos sudokus e quantidade de cada tipo de erro
+    """
+    # Cópias de sudokus válidos aleatórios
+    invalid_rows = valid_rows[_rng.integers(0, len(valid_rows), count)]
+    invalid_sudokus = invalid_rows[:, :81].reshape(-1, 9, 9)
     
-    for _ in range(num_errors):
-        error_func = random.choice(error_functions)
-        new_grid = error_func(new_grid)
+    # Escolhe um tipo de erro aleatório para cada sudoku e aplica todos em lote
+    error_choices = _rng.integers(0, len(ERROR_TYPES), count)
+    introduce_errors(invalid_sudokus, error_choices)
     
-    return new_grid
+    return sudoku_rows_to_bytes(invalid_rows), np.bincount(error_choices, minlength=len(ERROR_TYPES))
+
+# Sudokus válidos de cada processo do pool (definidos por `_init_worker`)
+_worker_rows = None
+
+def _init_worker(valid_rows: np.ndarray):
+    """Recebe os sudokus válidos uma única vez por processo do pool"""
+    global _worker_rows
+    _worker_rows = valid_rows
+
+def _generate_chunk_worker(job: Tuple[np.random.SeedSequence, int]) -> Tuple[bytes, np.ndarray]:
+    """Versão de `_generate_chunk` para os processos do pool, com semente própria"""
+    global _rng
+    seed, count = job
+    _rng = np.random.default_rng(seed)
+    return _generate_chunk(_worker_rows, count)
 
 def generate_invalid_sudokus(input_file: str, output_file: str, num_invalid: int = 10000):
     """
     Gera sudokus inválidos a partir de sudokus válidos
     
+    Todo o lote é gerado de uma vez: os sudokus de origem e os tipos de erro são
+    sorteados para todas as saídas e aplicados em lote por `introduce_errors`.
+    Acima de `_PARALLEL_MIN_COUNT` sudokus, blocos de `_CHUNK_SIZE` são gerados
+    em um pool de processos, cada um com uma semente derivada de `_seed_seq`.
+    
+    As entradas são validadas uma única vez, antes da geração: `load_sudoku_rows`
+    só devolve linhas com 81 dígitos e um `num_invalid` negativo não gera nada.
+    Os mutadores apenas copiam células ou escrevem valores fixos e não levantam
+    exceções, então não há tratamento de erro por sudoku.
+    
     Args:
         input_file: Arquivo CSV com sudokus válidos
         output_file: Arquivo CSV para salvar sudokus inválidos
         num_invalid: Número de sudokus inválidos a gerar
     """
     
-    # Tipos de erros a introduzir
-    error_types = [
-        ("row_duplicate", introduce_row_duplicate),
-        ("column_duplicate", introduce_column_duplicate),
-        ("box_duplicate", introduce_box_duplicate),
-        ("invalid_number", introduce_invalid_number),
-        ("multiple_errors", introduce_multiple_errors)
-    ]
-    
-    # Lê sudokus válidos
-    valid_sudokus = []
+    # Lê sudokus válidos como texto ASCII (N, 82)
     print(f"Lendo sudokus válidos de {input_file}...")
+    valid_rows = load_sudoku_rows(input_file)
     
-    with open(input_file, 'r') as f:
-        for line in f:
-            sudoku_str = line.strip()
-            if len(sudoku_str) == 81 and sudoku_str.isdigit():
-                valid_sudokus.append(sudoku_str)
-    
-    print(f"Carregados {len(valid_sudokus)} sudokus válidos")
+    num_invalid = max(num_invalid, 0)
+    print(f"Carregados {len(valid_rows)} sudokus válidos")
+    if len(valid_rows) == 0:
+        print("Nenhum sudoku válido encontrado!")
+        return
     
-    # Gera sudokus inválidos
-    invalid_sudokus = []
     print(f"Gerando {num_invalid} sudokus inválidos...")
-    
-    for i in range(num_invalid):
-        if i % 1000 == 0:
-            print(f"Progresso: {i}/{num_invalid}")
-        
-        # Escolhe um sudoku válido aleatório
-        valid_sudoku = random.choice(valid_sudokus)
-        grid = sudoku_string_to_grid(valid_sudoku)
-        
-        # Escolhe um tipo de erro aleatório
-        error_name, error_func = random.choice(error_types)
-        
-        # Aplica o erro
-        try:
-            invalid_grid = error_func(grid)
-            invalid_sudoku = grid_to_sudoku_string(invalid_grid)
-            invalid_sudokus.append(invalid_sudoku)
-        except Exception as e:
-            print(f"Erro ao gerar sudoku inválido {i}: {e}")
-            # Se falhar, usa o sudoku original com um erro simples
-            grid[0][0] = grid[0][1]  # Duplicata simples
-            invalid_sudoku = grid_to_sudoku_string(grid)
-            invalid_sudokus.append(invalid_sudoku)
+    use_pool = (num_invalid > _PARALLEL_MIN_COUNT and (os.cpu_count() or 1) > 1
+                and not multiprocessing.current_process().daemon)
+    
+    if use_pool:
+        # Blocos independentes, devolvidos na ordem (a saída não depende do pool)
+        sizes = [min(_CHUNK_SIZE, num_invalid - start) for start in range(0, num_invalid, _CHUNK_SIZE)]
+        jobs = list(zip(_seed_seq.spawn(len(sizes)), sizes))
+        chunks = []
+        with multiprocessing.Pool(initializer=_init_worker, initargs=(valid_rows,)) as pool:
+            # Progresso por bloco concluído (no máximo uma linha a cada _CHUNK_SIZE sudokus)
+            for chunk in pool.imap(_generate_chunk_worker, jobs):
+                chunks.append(chunk)
+                print(f"Progresso: {sum(sizes[:len(chunks)])}/{num_invalid}")
+    else:
+        chunks = [_generate_chunk(valid_rows, num_invalid)]
+    
+    error_counts = sum(counts for _, counts in chunks)
+    for (error_name, _), selected in zip(ERROR_TYPES, error_counts):
+        if selected:
+            print(f"  {error_name}: {selected}")
     
     # Salva sudokus inválidos
-    print(f"Salvando {len(invalid_sudokus)} sudokus inválidos em {output_file}...")
+    print(f"Salvando {num_invalid} sudokus inválidos em {output_file}...")
+    
+    with open(output_file, 'wb') as f:
+        f.write(b''.join(text for text, _ in chunks))
+    
+    print(f"Concluído! {num_invalid} sudokus inválidos salvos em {output_file}")
+
+# Número de bits ligados de cada máscara de 10 bits (valores 0-9)
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 10)], dtype=np.uint8)
+
+def encode_bits(grids: np.ndarray):
+    """
+    Codifica cada unidade de um lote de grids (N, 9, 9) com dígitos 0-9 como
+    máscara de bits: o bit v fica ligado se o valor v aparece na unidade
+    
+    Returns:
+        tuple: Máscaras uint16 (N, 9) das linhas, colunas e quadrantes
+    """
+    grids = grids.reshape(-1, 9, 9)
+    bits = np.left_shift(np.uint16(1), grids.astype(np.uint16))
+    
+    # Cada redução é um OU direto sobre os eixos da unidade, sem cópias transpostas
+    rows = np.bitwise_or.reduce(bits, axis=2)
+    cols = np.bitwise_or.reduce(bits, axis=1)
+    boxes = np.bitwise_or.reduce(bits.reshape(-1, 3, 3, 3, 3), axis=(2, 4)).reshape(-1, 9)
+    return rows, cols, boxes
+
+def verify_batch(grids: np.ndarray) -> dict:
+    """
+    Verifica os tipos de erro de um lote de grids (N, 9, 9) com dígitos 0-9
     
-    with open(output_file, 'w') as f:
-        for invalid_sudoku in invalid_sudokus:
-            f.write(invalid_sudoku + '\n')
+    Uma unidade (linha, coluna ou quadrante) tem duplicata se a sua máscara de
+    `encode_bits` tiver menos de 9 bits ligados.
     
-    print(f"Concluído! {len(invalid_sudokus)} sudokus inválidos salvos em {output_file}")
+    Returns:
+        dict: Máscara booleana (N,) para cada tipo de erro, na ordem de verificação
+    """
+    grids = grids.reshape(-1, 9, 9)
+    rows, cols, boxes = encode_bits(grids)
+    
+    def has_duplicate(masks):
+        return (_POPCOUNT[masks] < 9).any(axis=1)
+    
+    return {
+        "invalid_number": ((grids < 1) | (grids > 9)).any(axis=(1, 2)),
+        "row_duplicate": has_duplicate(rows),
+        "column_duplicate": has_duplicate(cols),
+        "box_duplicate": has_duplicate(boxes)
+    }
+
+# Posição da primeira célula de cada quadrante 3x3 na string de 81 caracteres
+_BOX_STARTS = (0, 3, 6, 27, 30, 33, 54, 57, 60)
 
 def verify_invalid_sudoku(sudoku_str: str) -> List[str]:
-    """Verifica que tipos de erros um sudoku possui"""
+    """
+    Verifica que tipos de erros um sudoku possui
+    
+    Cada unidade é um recorte da própria string (sem converter para grid) e tem
+    duplicata se o seu conjunto de caracteres tiver menos de 9 elementos; cada
+    tipo de duplicata para na primeira unidade que a contém.
+    """
     if len(sudoku_str) != 81:
         return ["invalid_length"]
     
-    try:
-        grid = sudoku_string_to_grid(sudoku_str)
-    except:
+    if not (sudoku_str.isascii() and sudoku_str.isdigit()):
         return ["invalid_format"]
     
+    s = sudoku_str
     errors = []
     
-    # Verifica números inválidos
-    for i in range(9):
-        for j in range(9):
-            if grid[i][j] < 1 or grid[i][j] > 9:
-                errors.append("invalid_number")
-                break
-        if "invalid_number" in errors:
-            break
-    
-    # Verifica duplicatas em linhas
-    for i in range(9):
-        row = grid[i]
-        if len(set(row)) != len(row):
-            errors.append("row_duplicate")
-            break
-    
-    # Verifica duplicatas em colunas
-    for j in range(9):
-        col = [grid[i][j] for i in range(9)]
-        if len(set(col)) != len(col):
-            errors.append("column_duplicate")
-            break
-    
-    # Verifica duplicatas em quadrantes
-    for box_row in range(3):
-        for box_col in range(3):
-            box = []
-            for i in range(3):
-                for j in range(3):
-                    box.append(grid[box_row*3 + i][box_col*3 + j])
-            if len(set(box)) != len(box):
-                errors.append("box_duplicate")
-                break
-        if "box_duplicate" in errors:
-            break
+    # Único dígito inválido possível numa string de 81 dígitos
+    if '0' in s:
+        errors.append("invalid_number")
+    
+    if any(len(set(s[i:i + 9])) < 9 for i in range(0, 81, 9)):
+        errors.append("row_duplicate")
+    
+    if any(len(set(s[c::9])) < 9 for c in range(9)):
+        errors.append("column_duplicate")
+    
+    if any(len(set(s[b:b + 3] + s[b + 9:b + 12] + s[b + 18:b + 21])) < 9 for b in _BOX_STARTS):
+        errors.append("box_duplicate")
     
     return errors if errors else ["unknown_error"]
 
@@ -221,11 +502,17 @@ if __name__ == "__main__":
                        help="Arquivo CSV para sudokus inválidos")
     parser.add_argument("--count", type=int, default=10000, 
                        help="Número de sudokus inválidos a gerar")
+    parser.add_argument("--seed", type=int, default=None,
+                       help="Semente do gerador aleatório (reproduz a mesma saída)")
     parser.add_argument("--verify", action="store_true", 
                        help="Verifica alguns sudokus gerados")
     
     args = parser.parse_args()
     
+    if args.seed is not None:
+        _seed_seq = np.random.SeedSequence(args.seed)
+        _rng = np.random.default_rng(_seed_seq)
+    
     # Gera sudokus inválidos
     generate_invalid_sudokus(args.input, args.output, args.count)
     
@@ -233,8 +520,14 @@ if __name__ == "__main__":
     if args.verify:
         print("\nVerificando alguns sudokus gerados...")
         with open(args.output, 'r') as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines[:5]):
+            for i, line in enumerate(islice(f, 5)):
                 sudoku_str = line.strip()
                 errors = verify_invalid_sudoku(sudoku_str)
-                print(f"Sudoku {i+1}: {errors}") 
\ No newline at end of file
+                print(f"Sudoku {i+1}: {errors}")
+        
+        # Resumo do arquivo inteiro com uma única verificação em lote
+        grids = load_sudoku_grids(args.output)
+        masks = verify_batch(grids)
+        print(f"\nResumo ({len(grids)} sudokus com 81 dígitos):")
+        for error_name, mask in masks.items():
+            print(f"  {error_name}: {int(mask.sum())}") 
\ No newline at end of file
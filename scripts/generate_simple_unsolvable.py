@@ -4,135 +4,273 @@ Script simples e eficiente para gerar sudokus abertos impossíveis.
 Cria situações garantidamente impossíveis baseadas no exemplo fornecido.
 """
 
-import random
-from typing import List
+from itertools import islice
 
-def create_simple_impossible_sudoku() -> List[List[int]]:
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """
+        Substituto de numba.njit: sem Numba os geradores rodam como Python puro.
+        """
+        def decorator(function):
+            return function
+        return decorator
+
+@njit(cache=True)
+def _fill_random_cells(grid, excluded, probability):
     """
-    Cria um sudoku 9x9 impossível usando uma estratégia simples e garantida
-    Baseado no exemplo 4x4: coloca números de forma que criem conflitos inevitáveis
+    Preenche cada célula vazia, com a probabilidade dada, com um número de 1 a 9
+    diferente de `excluded`
+    
+    Os sorteios das 81 células são feitos de uma vez, como matrizes 9x9: o número
+    vem de 1-8, somado de 1 quando chega em `excluded`.
     """
-    grid = [[0 for _ in range(9)] for _ in range(9)]
+    values = np.random.randint(1, 9, (9, 9))
+    values = values + (values >= excluded)
+    fill = (grid == 0) & (np.random.random((9, 9)) < probability)
+    grid[:, :] = np.where(fill, values, grid)
+
+@njit(cache=True)
+def _fill_simple_impossible(grid):
+    """Preenche `grid` (9x9 uint8) com um sudoku impossível por conflito direto na linha"""
+    grid[:, :] = 0
     
     # Estratégia 1: Cria conflito direto - mesmo número em linha
     # Exemplo: linha 0 tem o número 5 em duas posições, mas com células vazias entre elas
-    target_number = random.randint(1, 9)
-    target_row = random.randint(0, 8)
+    target_number = np.random.randint(1, 10)
+    target_row = np.random.randint(0, 9)
     
     # Coloca o número alvo em duas posições da mesma linha
-    pos1 = random.randint(0, 3)
-    pos2 = random.randint(5, 8)
+    pos1 = np.random.randint(0, 4)
+    pos2 = np.random.randint(5, 9)
     
-    grid[target_row][pos1] = target_number
-    grid[target_row][pos2] = target_number
+    grid[target_row, pos1] = target_number
+    grid[target_row, pos2] = target_number
     
     # Deixa uma célula vazia entre elas que precisaria do mesmo número
-    empty_pos = random.randint(pos1 + 1, pos2 - 1)
-    grid[target_row][empty_pos] = 0
+    empty_pos = np.random.randint(pos1 + 1, pos2)
+    grid[target_row, empty_pos] = 0
     
     # Preenche outras células aleatoriamente mas sem conflitos óbvios
-    for r in range(9):
-        for c in range(9):
-            if grid[r][c] == 0 and random.random() < 0.3:  # 30% de chance
-                # Escolhe um número que não conflite imediatamente
-                available = list(range(1, 10))
-                if target_number in available:
-                    available.remove(target_number)
-                
-                if available:
-                    grid[r][c] = random.choice(available)
-    
-    return grid
+    # (30% de chance, qualquer número exceto o alvo)
+    _fill_random_cells(grid, target_number, 0.3)
 
-def create_impossible_by_blocking() -> List[List[int]]:
-    """
-    Cria impossibilidade bloqueando todas as posições possíveis de um número
-    """
-    grid = [[0 for _ in range(9)] for _ in range(9)]
+@njit(cache=True)
+def _fill_impossible_by_blocking(grid):
+    """Preenche `grid` (9x9 uint8) bloqueando todas as posições possíveis de um número"""
+    grid[:, :] = 0
     
     # Escolhe um número para bloquear
-    blocked_number = random.randint(1, 9)
+    blocked_number = np.random.randint(1, 10)
     
     # Escolhe uma linha onde o número será impossível
-    target_row = random.randint(0, 8)
-    
-    # Coloca o número bloqueado em todas as colunas desta linha, exceto algumas
-    empty_positions = random.sample(range(9), 3)  # 3 posições vazias
-    
-    for col in range(9):
-        if col not in empty_positions:
-            grid[target_row][col] = blocked_number
-    
-    # Agora coloca o número bloqueado nas colunas das posições vazias
-    for col in empty_positions:
-        # Escolhe uma linha diferente para colocar o número
-        other_rows = [r for r in range(9) if r != target_row]
-        if other_rows:
-            other_row = random.choice(other_rows)
-            grid[other_row][col] = blocked_number
+    target_row = np.random.randint(0, 9)
+    
+    # 3 posições vazias distintas (embaralhamento parcial de Fisher-Yates)
+    columns = np.arange(9)
+    for k in range(3):
+        j = np.random.randint(k, 9)
+        columns[k], columns[j] = columns[j], columns[k]
+    
+    # Coloca o número bloqueado em todas as colunas desta linha, exceto as vazias
+    grid[target_row, :] = blocked_number
+    for k in range(3):
+        grid[target_row, columns[k]] = 0
+    
+    # Agora coloca o número bloqueado nas colunas das posições vazias, em outra linha
+    for k in range(3):
+        other_row = np.random.randint(0, 8)
+        if other_row >= target_row:
+            other_row += 1
+        grid[other_row, columns[k]] = blocked_number
     
     # Preenche outras células aleatoriamente
-    for r in range(9):
-        for c in range(9):
-            if grid[r][c] == 0 and random.random() < 0.25:
-                available = [n for n in range(1, 10) if n != blocked_number]
-                if available:
-                    grid[r][c] = random.choice(available)
-    
-    return grid
+    _fill_random_cells(grid, blocked_number, 0.25)
 
-def create_quadrant_impossible() -> List[List[int]]:
-    """
-    Cria impossibilidade em um quadrante 3x3
-    """
-    grid = [[0 for _ in range(9)] for _ in range(9)]
+@njit(cache=True)
+def _fill_quadrant_impossible(grid):
+    """Preenche `grid` (9x9 uint8) com um quadrante 3x3 impossível de completar"""
+    grid[:, :] = 0
     
     # Escolhe um quadrante
-    box_row = random.randint(0, 2)
-    box_col = random.randint(0, 2)
+    box_row = np.random.randint(0, 3)
+    box_col = np.random.randint(0, 3)
     
     # Escolhe um número para tornar impossível no quadrante
-    impossible_number = random.randint(1, 9)
-    
-    # Preenche parcialmente o quadrante
-    numbers = [n for n in range(1, 10) if n != impossible_number]
-    random.shuffle(numbers)
+    impossible_number = np.random.randint(1, 10)
+    
+    # Os outros 8 números, embaralhados
+    numbers = np.empty(8, dtype=np.int64)
+    k = 0
+    for n in range(1, 10):
+        if n != impossible_number:
+            numbers[k] = n
+            k += 1
+    for k in range(7, 0, -1):
+        j = np.random.randint(0, k + 1)
+        numbers[k], numbers[j] = numbers[j], numbers[k]
     
     # Coloca 6 números no quadrante, deixando 3 posições vazias
-    positions = []
-    for r in range(box_row * 3, (box_row + 1) * 3):
-        for c in range(box_col * 3, (box_col + 1) * 3):
-            positions.append((r, c))
-    
-    # Preenche 6 posições
     for i in range(6):
-        r, c = positions[i]
-        grid[r][c] = numbers[i]
+        grid[box_row * 3 + i // 3, box_col * 3 + i % 3] = numbers[i]
     
     # Para as 3 posições vazias, coloca o número impossível em suas linhas/colunas
-    empty_positions = positions[6:]
-    for r, c in empty_positions:
+    for i in range(6, 9):
+        r = box_row * 3 + i // 3
+        c = box_col * 3 + i % 3
+        
         # Coloca o número impossível na linha (fora do quadrante)
         for other_c in range(9):
             if other_c < box_col * 3 or other_c >= (box_col + 1) * 3:
-                if grid[r][other_c] == 0:
-                    grid[r][other_c] = impossible_number
+                if grid[r, other_c] == 0:
+                    grid[r, other_c] = impossible_number
                     break
         
         # Coloca o número impossível na coluna (fora do quadrante)
         for other_r in range(9):
             if other_r < box_row * 3 or other_r >= (box_row + 1) * 3:
-                if grid[other_r][c] == 0:
-                    grid[other_r][c] = impossible_number
+                if grid[other_r, c] == 0:
+                    grid[other_r, c] = impossible_number
                     break
+
+@njit(cache=True, parallel=True)
+def generate_unsolvable_batch(out, kinds):
+    """
+    Preenche o lote `out` (count, 9, 9) uint8, em paralelo com Numba
     
+    Args:
+        out: Buffer pré-alocado para os sudokus
+        kinds: Gerador de cada sudoku (0: conflito na linha, 1: bloqueio, 2: quadrante)
+    """
+    for i in prange(out.shape[0]):
+        if kinds[i] == 0:
+            _fill_simple_impossible(out[i])
+        elif kinds[i] == 1:
+            _fill_impossible_by_blocking(out[i])
+        else:
+            _fill_quadrant_impossible(out[i])
+
+def create_simple_impossible_sudoku() -> np.ndarray:
+    """
+    Cria um sudoku 9x9 impossível usando uma estratégia simples e garantida
+    Baseado no exemplo 4x4: coloca números de forma que criem conflitos inevitáveis
+    """
+    grid = np.zeros((9, 9), dtype=np.uint8)
+    _fill_simple_impossible(grid)
+    return grid
+
+def create_impossible_by_blocking() -> np.ndarray:
+    """
+    Cria impossibilidade bloqueando todas as posições possíveis de um número
+    """
+    grid = np.zeros((9, 9), dtype=np.uint8)
+    _fill_impossible_by_blocking(grid)
     return grid
 
-def grid_to_string(grid: List[List[int]]) -> str:
+def create_quadrant_impossible() -> np.ndarray:
+    """
+    Cria impossibilidade em um quadrante 3x3
+    """
+    grid = np.zeros((9, 9), dtype=np.uint8)
+    _fill_quadrant_impossible(grid)
+    return grid
+
+# Lotes vetorizados com NumPy: cada função preenche um lote (n, 9, 9) uint8 no
+# próprio array, com as mesmas estratégias dos geradores acima
+
+# Os 8 números diferentes de t (1-9), na linha t - 1
+_OTHER_NUMBERS = np.array([[n for n in range(1, 10) if n != t] for t in range(1, 10)], dtype=np.uint8)
+
+# As 3 primeiras linhas (ou colunas) fora do quadrante de índice b (0-2)
+_FIRST_OUTSIDE = np.array([[i for i in range(9) if i // 3 != b][:3] for b in range(3)], dtype=np.int64)
+
+def _fill_random_cells_batch(grids: np.ndarray, excluded: np.ndarray, probability: float):
+    """Versão em lote de `_fill_random_cells`, com um número excluído por grid"""
+    values = np.random.randint(1, 9, grids.shape)
+    values += values >= excluded[:, np.newaxis, np.newaxis]
+    fill = (grids == 0) & (np.random.random(grids.shape) < probability)
+    np.copyto(grids, values, where=fill, casting='unsafe')
+
+def create_simple_impossible_batch(grids: np.ndarray) -> np.ndarray:
+    """Preenche o lote com sudokus impossíveis por conflito direto na linha"""
+    n = len(grids)
+    batch = np.arange(n)
+    grids[...] = 0
+    
+    # Número alvo em duas posições da mesma linha, com células vazias entre elas
+    target_number = np.random.randint(1, 10, n)
+    target_row = np.random.randint(0, 9, n)
+    grids[batch, target_row, np.random.randint(0, 4, n)] = target_number
+    grids[batch, target_row, np.random.randint(5, 9, n)] = target_number
+    
+    _fill_random_cells_batch(grids, target_number, 0.3)
+    return grids
+
+def create_impossible_by_blocking_batch(grids: np.ndarray) -> np.ndarray:
+    """Preenche o lote bloqueando todas as posições possíveis de um número"""
+    n = len(grids)
+    batch = np.arange(n)[:, np.newaxis]
+    grids[...] = 0
+    
+    blocked_number = np.random.randint(1, 10, n)[:, np.newaxis]
+    target_row = np.random.randint(0, 9, n)[:, np.newaxis]
+    
+    # 3 colunas vazias distintas por grid: as 3 primeiras de uma permutação aleatória
+    columns = np.argsort(np.random.random((n, 9)), axis=1)[:, :3]
+    
+    # Número bloqueado na linha inteira, exceto nas colunas vazias
+    grids[batch[:, 0], target_row[:, 0]] = blocked_number
+    grids[batch, target_row, columns] = 0
+    
+    # E nas colunas vazias, em outra linha
+    other_rows = np.random.randint(0, 8, (n, 3))
+    other_rows += other_rows >= target_row
+    grids[batch, other_rows, columns] = blocked_number
+    
+    _fill_random_cells_batch(grids, blocked_number[:, 0], 0.25)
+    return grids
+
+def create_quadrant_impossible_batch(grids: np.ndarray) -> np.ndarray:
+    """Preenche o lote com um quadrante 3x3 impossível de completar"""
+    n = len(grids)
+    batch = np.arange(n)[:, np.newaxis]
+    grids[...] = 0
+    
+    box_row = np.random.randint(0, 3, n)[:, np.newaxis]
+    box_col = np.random.randint(0, 3, n)[:, np.newaxis]
+    impossible_number = np.random.randint(1, 10, n)[:, np.newaxis]
+    
+    # 6 dos outros 8 números, embaralhados, nas 6 primeiras posições do quadrante
+    order = np.argsort(np.random.random((n, 8)), axis=1)[:, :6]
+    numbers = np.take_along_axis(_OTHER_NUMBERS[impossible_number[:, 0] - 1], order, axis=1)
+    positions = np.arange(6)
+    grids[batch, box_row * 3 + positions // 3, box_col * 3 + positions % 3] = numbers
+    
+    # As 3 posições vazias (última linha do quadrante) recebem o número impossível
+    # nas primeiras células livres fora do quadrante: na linha e nas colunas
+    grids[batch, box_row * 3 + 2, _FIRST_OUTSIDE[box_col[:, 0]]] = impossible_number
+    grids[batch, _FIRST_OUTSIDE[box_row[:, 0], :1], box_col * 3 + np.arange(3)] = impossible_number
+    return grids
+
+# Geradores em lote, na ordem dos índices de `generate_unsolvable_batch`
+_BATCH_GENERATORS = [
+    create_simple_impossible_batch,
+    create_impossible_by_blocking_batch,
+    create_quadrant_impossible_batch
+]
+
+def grid_to_string(grid: np.ndarray) -> str:
     """Converte grid em string de 81 caracteres"""
-    return ''.join(str(grid[i][j]) for i in range(9) for j in range(9))
+    return (grid.ravel() + ord('0')).astype(np.uint8).tobytes().decode('ascii')
 
-def print_grid(grid: List[List[int]]):
+def print_grid(grid: np.ndarray):
     """Imprime o grid de forma legível"""
     for i, row in enumerate(grid):
         if i % 3 == 0 and i != 0:
@@ -153,46 +291,42 @@ def print_grid(grid: List[List[int]]):
 def generate_unsolvable_sudokus_simple(output_file: str, count: int = 1000):
     """
     Gera sudokus impossíveis usando estratégias simples e garantidas
+    
+    Os geradores só escrevem dígitos 0-9 em posições fixas do grid e não levantam
+    exceções, então o lote não tem tratamento de erro por sudoku; apenas `count`
+    é validado antes da geração (valores negativos não geram nenhum sudoku).
     """
+    count = max(count, 0)
     print(f"Gerando {count} sudokus impossíveis...")
     
-    generators = [
-        create_simple_impossible_sudoku,
-        create_impossible_by_blocking,
-        create_quadrant_impossible
-    ]
-    
-    sudokus = []
-    
-    for i in range(count):
-        if i % 100 == 0:
-            print(f"Progresso: {i}/{count}")
-        
-        # Escolhe um gerador aleatório
-        generator = random.choice(generators)
-        
-        try:
-            grid = generator()
-            sudoku_str = grid_to_string(grid)
-            sudokus.append(sudoku_str)
-        except Exception as e:
-            print(f"Erro ao gerar sudoku {i}: {e}")
-            # Fallback: cria um conflito muito simples
-            simple_grid = [[0 for _ in range(9)] for _ in range(9)]
-            simple_grid[0][0] = 5
-            simple_grid[0][1] = 5  # Conflito direto na linha
-            simple_grid[1][0] = 5  # Conflito direto na coluna
-            sudoku_str = grid_to_string(simple_grid)
-            sudokus.append(sudoku_str)
+    # Buffer (count, 82): 81 dígitos + '\n' por linha. Os geradores escrevem
+    # direto na visão (count, 9, 9) das 81 primeiras colunas
+    buffer = np.empty((count, 82), dtype=np.uint8)
+    buffer[:, 81] = ord('\n')
+    grids = buffer[:, :81].reshape(count, 9, 9)
+    
+    if NUMBA_AVAILABLE:
+        # Escolhe um gerador aleatório para cada sudoku
+        kinds = np.random.randint(0, 3, count)
+        generate_unsolvable_batch(grids, kinds)
+    else:
+        # Sem Numba: quantos sudokus de cada gerador, cada grupo gerado com NumPy
+        # em um trecho contíguo do buffer e as linhas embaralhadas no fim
+        counts = np.random.multinomial(count, [1 / 3] * 3)
+        ends = np.cumsum(counts)
+        for generator, start, end in zip(_BATCH_GENERATORS, ends - counts, ends):
+            generator(grids[start:end])
+        buffer[:] = buffer[np.random.permutation(count)]
+    
+    grids += ord('0')
     
     # Salva os sudokus
-    print(f"Salvando {len(sudokus)} sudokus em {output_file}...")
+    print(f"Salvando {count} sudokus em {output_file}...")
     
-    with open(output_file, 'w') as f:
-        for sudoku in sudokus:
-            f.write(sudoku + '\n')
+    with open(output_file, 'wb') as f:
+        f.write(buffer.tobytes())
     
-    print(f"Concluído! {len(sudokus)} sudokus impossíveis salvos em {output_file}")
+    print(f"Concluído! {count} sudokus impossíveis salvos em {output_file}")
 
 def demo_example():
     """Demonstra um exemplo de sudoku impossível gerado"""
@@ -231,11 +365,10 @@ if __name__ == "__main__":
     print("\nPrimeiros 3 sudokus gerados:")
     try:
         with open(args.output, 'r') as f:
-            lines = f.readlines()
-            for i, line in enumerate(lines[:3]):
+            for i, line in enumerate(islice(f, 3)):
                 sudoku_str = line.strip()
                 print(f"\nSudoku {i+1}:")
-                grid = [[int(sudoku_str[r*9 + c]) for c in range(9)] for r in range(9)]
+                grid = [[ord(c) - 48 for c in sudoku_str[r:r + 9]] for r in range(0, 81, 9)]
                 print_grid(grid)
                 print()
     except FileNotFoundError:
@@ -6,88 +6,372 @@ Cria situações onde não há jogadas válidas disponíveis.
 
 import random
 import csv
+import functools
+import multiprocessing
+import os
+from itertools import islice
 from typing import List, Set, Tuple, Optional
 
-def sudoku_string_to_grid(sudoku_str: str) -> List[List[int]]:
-    """Converte string de sudoku em grid 9x9"""
-    return [[int(sudoku_str[i*9 + j]) for j in range(9)] for i in range(9)]
+import numpy as np
 
-def grid_to_sudoku_string(grid: List[List[int]]) -> str:
-    """Converte grid 9x9 em string de sudoku"""
-    return ''.join(str(grid[i][j]) for i in range(9) for j in range(9))
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def sudoku_string_to_grid(sudoku_str: str) -> np.ndarray:
+    """Converte string de sudoku em grid 9x9 uint8 ('.' vale 0)"""
+    digits = np.frombuffer(sudoku_str.replace('.', '0').encode('ascii'), dtype=np.uint8)
+    return (digits - ord('0')).reshape(9, 9)
+
+def grid_to_sudoku_string(grid: np.ndarray) -> str:
+    """Converte grid 9x9 uint8 em string de sudoku"""
+    return (grid.ravel() + ord('0')).astype(np.uint8).tobytes().decode('ascii')
+
+# Tentativas geradas antes de cada checagem em lote de `batch_trivially_unsolvable`
+_BLOCK_SIZE = 256
+
+# A partir deste número de sudokus a geração é dividida num pool de processos
+_PARALLEL_MIN_COUNT = 1000
+
+# Máscara com os 9 bits de candidatos (bit d - 1 para o número d)
+_FULL_MASK = 0x1FF
+
+# Número de candidatos de cada máscara de 9 bits
+_POPCOUNT = [bin(mask).count('1') for mask in range(_FULL_MASK + 1)]
+
+# Todos os números do sudoku e os números de cada máscara de 9 bits
+_ALL_DIGITS = frozenset(range(1, 10))
+_DIGITS_OF_MASK = [frozenset(d for d in _ALL_DIGITS if (mask >> (d - 1)) & 1)
+                   for mask in range(_FULL_MASK + 1)]
+
+# Índice do quadrante 3x3 de cada célula
+_BOX_OF = [[(r // 3) * 3 + c // 3 for c in range(9)] for r in range(9)]
+
+def encode(grid: List[List[int]]) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Codifica o grid em máscaras de bits das linhas, colunas e quadrantes
+    
+    Returns:
+        Tuple: Listas com 9 máscaras cada; o bit d - 1 indica que o número d
+        já está na unidade
+    """
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    
+    for r in range(9):
+        for c in range(9):
+            value = grid[r][c]
+            if value != 0:
+                bit = 1 << (value - 1)
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[_BOX_OF[r][c]] |= bit
+    
+    return rows, cols, boxes
 
 def get_possible_values(grid: List[List[int]], row: int, col: int) -> Set[int]:
     """Retorna os valores possíveis para uma posição específica"""
     if grid[row][col] != 0:
         return set()
     
-    used_values = set()
-    
-    # Valores usados na linha
-    for c in range(9):
-        if grid[row][c] != 0:
-            used_values.add(grid[row][c])
-    
-    # Valores usados na coluna
-    for r in range(9):
-        if grid[r][col] != 0:
-            used_values.add(grid[r][col])
-    
-    # Valores usados no quadrante 3x3
+    # Números usados na linha, na coluna e no quadrante 3x3, como máscara de bits
+    used = 0
     box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-    for r in range(box_row, box_row + 3):
-        for c in range(box_col, box_col + 3):
-            if grid[r][c] != 0:
-                used_values.add(grid[r][c])
+    for i in range(9):
+        for value in (grid[row][i], grid[i][col], grid[box_row + i // 3][box_col + i % 3]):
+            if value != 0:
+                used |= 1 << (value - 1)
     
-    return set(range(1, 10)) - used_values
+    return set(_DIGITS_OF_MASK[~used & _FULL_MASK])
 
 def is_valid_placement(grid: List[List[int]], row: int, col: int, num: int) -> bool:
     """Verifica se é válido colocar um número em uma posição"""
     return num in get_possible_values(grid, row, col)
 
+def has_trivial_conflict(grid: List[List[int]]) -> bool:
+    """
+    Verifica se algum número se repete entre as células preenchidas de uma
+    linha, coluna ou quadrante
+    
+    Um grid assim não tem solução; `has_solution` só olha as células vazias e
+    não percebe esse conflito.
+    """
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    
+    for r in range(9):
+        for c in range(9):
+            value = grid[r][c]
+            if value != 0:
+                bit = 1 << (value - 1)
+                b = _BOX_OF[r][c]
+                # O bit já ligado em alguma unidade indica repetição
+                if (rows[r] | cols[c] | boxes[b]) & bit:
+                    return True
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+    
+    return False
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _popcount(mask):
+        """Conta os bits ligados de uma máscara"""
+        count = 0
+        while mask:
+            mask &= mask - 1
+            count += 1
+        return count
+    
+    @njit(cache=True)
+    def solvable(rows, cols, boxes, cells_r, cells_c, cells_b):
+        """
+        Versão compilada da busca de `has_solution` (MRV sobre máscaras de bits),
+        com uma pilha explícita no lugar da recursão
+        
+        Args:
+            rows, cols, boxes: Máscaras int64 (9,) de `encode`; recebem as jogadas
+            cells_r, cells_c, cells_b: Linha, coluna e quadrante das K células vazias
+        
+        Returns:
+            bool: True se as células vazias podem ser preenchidas
+        """
+        k_total = cells_r.shape[0]
+        order = np.arange(k_total)
+        
+        # Por nível: candidatos ainda não testados, bit colocado e posição trocada
+        stack_cand = np.zeros(k_total, dtype=np.int64)
+        stack_bit = np.zeros(k_total, dtype=np.int64)
+        stack_swap = np.zeros(k_total, dtype=np.int64)
+        depth = 0
+        
+        while True:
+            if depth == k_total:
+                return True
+            
+            # Escolhe a célula restante com menos candidatos (MRV)
+            best = depth
+            best_count = 10
+            best_mask = 0
+            for i in range(depth, k_total):
+                j = order[i]
+                mask = ~(rows[cells_r[j]] | cols[cells_c[j]] | boxes[cells_b[j]]) & 0x1FF
+                count = _popcount(mask)
+                if count < best_count:
+                    best = i
+                    best_count = count
+                    best_mask = mask
+                    if count <= 1:
+                        break
+            
+            if best_count > 0:
+                order[depth], order[best] = order[best], order[depth]
+                stack_cand[depth] = best_mask
+                stack_bit[depth] = 0
+                stack_swap[depth] = best
+                depth += 1
+            
+            # Coloca o próximo candidato do topo, desfazendo os níveis esgotados
+            placed = False
+            while depth > 0:
+                top = depth - 1
+                j = order[top]
+                r = cells_r[j]
+                c = cells_c[j]
+                b = cells_b[j]
+                
+                bit = stack_bit[top]
+                if bit:
+                    rows[r] ^= bit
+                    cols[c] ^= bit
+                    boxes[b] ^= bit
+                    stack_bit[top] = 0
+                
+                candidates = stack_cand[top]
+                if candidates == 0:
+                    swap = stack_swap[top]
+                    order[top], order[swap] = order[swap], order[top]
+                    depth -= 1
+                    continue
+                
+                bit = candidates & -candidates
+                stack_cand[top] = candidates ^ bit
+                stack_bit[top] = bit
+                rows[r] |= bit
+                cols[c] |= bit
+                boxes[b] |= bit
+                placed = True
+                break
+            
+            if not placed:
+                return False
+else:
+    solvable = None
+
 def has_solution(grid: List[List[int]]) -> bool:
-    """Verifica se o sudoku tem solução usando backtracking simples"""
-    def solve(g):
-        for i in range(9):
-            for j in range(9):
-                if g[i][j] == 0:
-                    for num in range(1, 10):
-                        if is_valid_placement(g, i, j, num):
-                            g[i][j] = num
-                            if solve(g):
-                                return True
-                            g[i][j] = 0
-                    return False
-        return True
-    
-    # Cria uma cópia para não modificar o original
-    grid_copy = [row[:] for row in grid]
-    return solve(grid_copy)
-
-def create_impossible_situation_type1(grid: List[List[int]]) -> List[List[int]]:
+    """
+    Verifica se o sudoku tem solução usando backtracking com MRV
+    
+    O estado da busca são as máscaras de bits de `encode`: os candidatos de uma
+    célula saem de uma única operação entre as três máscaras, e cada jogada liga
+    (ou desliga, ao voltar) um bit em cada uma. A cada passo a busca segue pela
+    célula vazia com menos candidatos e desiste assim que alguma fica sem
+    nenhum. A busca é iterativa, com uma pilha explícita por nível; com Numba
+    ela roda compilada em `solvable`. O grid original não é alterado.
+    """
+    rows, cols, boxes = encode(grid)
+    
+    # Células vazias; as já preenchidas pela busca ficam em empties[:depth]
+    empties = [(r, c, _BOX_OF[r][c]) for r in range(9) for c in range(9) if grid[r][c] == 0]
+    
+    if solvable is not None:
+        # Mesma busca, compilada com Numba
+        cells = np.array(empties, dtype=np.int64).reshape(-1, 3)
+        return bool(solvable(np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64),
+                             np.array(boxes, dtype=np.int64), cells[:, 0], cells[:, 1], cells[:, 2]))
+    
+    # Sem Numba, a mesma busca com pilha explícita em listas: por nível, os
+    # candidatos ainda não testados, o bit colocado e a posição trocada
+    total = len(empties)
+    stack_cand = [0] * total
+    stack_bit = [0] * total
+    stack_swap = [0] * total
+    depth = 0
+    
+    while True:
+        if depth == total:
+            return True
+        
+        # Escolhe a célula restante com menos candidatos (MRV)
+        best = depth
+        best_count = 10
+        for i in range(depth, total):
+            r, c, b = empties[i]
+            count = _POPCOUNT[~(rows[r] | cols[c] | boxes[b]) & _FULL_MASK]
+            if count < best_count:
+                best, best_count = i, count
+                if count <= 1:
+                    break
+        
+        if best_count > 0:
+            empties[depth], empties[best] = empties[best], empties[depth]
+            r, c, b = empties[depth]
+            stack_cand[depth] = ~(rows[r] | cols[c] | boxes[b]) & _FULL_MASK
+            stack_bit[depth] = 0
+            stack_swap[depth] = best
+            depth += 1
+        
+        # Coloca o próximo candidato do topo (do menor para o maior número),
+        # desfazendo os níveis esgotados
+        placed = False
+        while depth > 0:
+            top = depth - 1
+            r, c, b = empties[top]
+            
+            bit = stack_bit[top]
+            if bit:
+                rows[r] ^= bit
+                cols[c] ^= bit
+                boxes[b] ^= bit
+                stack_bit[top] = 0
+            
+            candidates = stack_cand[top]
+            if candidates == 0:
+                swap = stack_swap[top]
+                empties[top], empties[swap] = empties[swap], empties[top]
+                depth -= 1
+                continue
+            
+            bit = candidates & -candidates
+            stack_cand[top] = candidates ^ bit
+            stack_bit[top] = bit
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+            placed = True
+            break
+        
+        if not placed:
+            return False
+
+@functools.lru_cache(maxsize=131072)
+def _has_solution_cached(state: bytes) -> bool:
+    """
+    `has_solution` com cache, indexado pelos 81 bytes (uint8) do grid
+    
+    Tentativas diferentes podem chegar ao mesmo grid (mesma origem, mesmo tipo
+    de situação e remoções parecidas); a busca roda uma vez só para cada um.
+    """
+    return has_solution(np.frombuffer(state, dtype=np.uint8).reshape(9, 9).tolist())
+
+# Índice do quadrante de cada célula, como array para as operações em lote
+_BOX_INDEX = np.array(_BOX_OF, dtype=np.int64)
+
+def batch_trivially_unsolvable(grids: np.ndarray) -> np.ndarray:
+    """
+    Marca os grids (N, 9, 9) que têm alguma célula vazia sem nenhum candidato
+    ou algum número repetido em uma linha, coluna ou quadrante
+    
+    Esses grids certamente não têm solução (`has_solution` desiste dos
+    primeiros no primeiro passo, e os repetidos são os de
+    `has_trivial_conflict`); os demais ainda precisam da busca completa.
+    
+    Returns:
+        np.ndarray: Máscara booleana (N,)
+    """
+    values = grids.astype(np.int64)
+    bits = np.where(values > 0, np.left_shift(1, (values - 1).clip(0)), 0)
+    
+    # Máscaras das linhas, colunas e quadrantes, como (N, 9)
+    row_mask = np.bitwise_or.reduce(bits, axis=2)
+    col_mask = np.bitwise_or.reduce(bits, axis=1)
+    box_mask = np.bitwise_or.reduce(bits.reshape(-1, 3, 3, 3, 3), axis=(2, 4)).reshape(-1, 9)
+    
+    # Com números repetidos a soma dos bits de uma unidade difere do OU
+    repeated = ((bits.sum(axis=2) != row_mask).any(axis=1) |
+                (bits.sum(axis=1) != col_mask).any(axis=1) |
+                (bits.reshape(-1, 3, 3, 3, 3).sum(axis=(2, 4)).reshape(-1, 9) != box_mask).any(axis=1))
+    
+    # Números vistos por cada célula e candidatos que sobram
+    peers = row_mask[:, :, np.newaxis] | col_mask[:, np.newaxis, :] | box_mask[:, _BOX_INDEX]
+    candidates = ~peers & _FULL_MASK
+    
+    return repeated | ((values == 0) & (candidates == 0)).any(axis=(1, 2))
+
+# Máscaras booleanas (9, 9) para `_place_first_empty`: todas as posições
+# menos a de índice i, e todas fora da faixa de quadrantes b
+_ALL_BUT = ~np.eye(9, dtype=bool)
+_OUTSIDE_BAND = ~np.repeat(np.eye(3, dtype=bool), 3, axis=1)
+
+def _place_first_empty(line: np.ndarray, allowed: np.ndarray, number: int):
+    """Coloca `number` na primeira célula vazia de `line` (linha ou coluna do grid) permitida por `allowed`"""
+    free = np.flatnonzero((line == 0) & allowed)
+    if free.size:
+        line[free[0]] = number
+
+def create_impossible_situation_type1(grid: np.ndarray) -> np.ndarray:
     """
     Tipo 1: Número precisa ser colocado mas todas as posições disponíveis 
     criam conflitos na linha ou coluna
     """
-    new_grid = [row[:] for row in grid]
+    new_grid = grid.copy()
     
     # Escolhe um quadrante aleatório
     box_row = random.randint(0, 2)
     box_col = random.randint(0, 2)
     
     # Encontra números que ainda não estão no quadrante
-    used_in_box = set()
-    empty_positions = []
+    box = new_grid[box_row * 3:(box_row + 1) * 3, box_col * 3:(box_col + 1) * 3]
+    used_in_box = set(box[box != 0].tolist())
+    empty_r, empty_c = np.nonzero(box == 0)
+    empty_positions = list(zip((empty_r + box_row * 3).tolist(), (empty_c + box_col * 3).tolist()))
     
-    for r in range(box_row * 3, (box_row + 1) * 3):
-        for c in range(box_col * 3, (box_col + 1) * 3):
-            if new_grid[r][c] != 0:
-                used_in_box.add(new_grid[r][c])
-            else:
-                empty_positions.append((r, c))
-    
-    missing_numbers = set(range(1, 10)) - used_in_box
+    missing_numbers = _ALL_DIGITS - used_in_box
     
     if len(missing_numbers) > 0 and len(empty_positions) > 1:
         target_number = random.choice(list(missing_numbers))
@@ -96,149 +380,235 @@ def create_impossible_situation_type1(grid: List[List[int]]) -> List[List[int]]:
         # exceto em uma posição específica, criando um conflito
         for r, c in empty_positions:
             # Coloca o número alvo na linha (em outra coluna)
-            for other_c in range(9):
-                if other_c != c and new_grid[r][other_c] == 0:
-                    new_grid[r][other_c] = target_number
-                    break
+            _place_first_empty(new_grid[r], _ALL_BUT[c], target_number)
             
             # Coloca o número alvo na coluna (em outra linha)
-            for other_r in range(9):
-                if other_r != r and new_grid[other_r][c] == 0:
-                    new_grid[other_r][c] = target_number
-                    break
+            _place_first_empty(new_grid[:, c], _ALL_BUT[r], target_number)
     
     return new_grid
 
-def create_impossible_situation_type2(grid: List[List[int]]) -> List[List[int]]:
+def create_impossible_situation_type2(grid: np.ndarray) -> np.ndarray:
     """
     Tipo 2: Cria uma situação onde duas células precisam dos mesmos números
     mas só há uma possibilidade para cada
     """
-    new_grid = [row[:] for row in grid]
+    new_grid = grid.copy()
     
     # Encontra duas posições vazias na mesma linha
     for row in range(9):
-        empty_cols = [col for col in range(9) if new_grid[row][col] == 0]
+        empty_cols = np.flatnonzero(new_grid[row] == 0).tolist()
         if len(empty_cols) >= 2:
             col1, col2 = random.sample(empty_cols, 2)
             
-            # Preenche outras posições para forçar que apenas um número seja possível
-            available_numbers = list(range(1, 10))
-            
-            # Remove números já usados na linha
-            for c in range(9):
-                if new_grid[row][c] != 0 and new_grid[row][c] in available_numbers:
-                    available_numbers.remove(new_grid[row][c])
+            # Números ainda não usados na linha, em ordem crescente
+            available_numbers = np.setdiff1d(np.arange(1, 10), new_grid[row]).tolist()
             
             if len(available_numbers) >= 2:
                 # Escolhe dois números que serão impossíveis de colocar
                 num1, num2 = random.sample(available_numbers, 2)
                 
-                # Coloca num1 na coluna de col1 (em outra linha)
-                for other_row in range(9):
-                    if other_row != row and new_grid[other_row][col1] == 0:
-                        new_grid[other_row][col1] = num1
-                        break
-                
-                # Coloca num2 na coluna de col2 (em outra linha)
-                for other_row in range(9):
-                    if other_row != row and new_grid[other_row][col2] == 0:
-                        new_grid[other_row][col2] = num2
-                        break
+                # Coloca num1 na coluna de col1 e num2 na de col2 (em outra linha)
+                _place_first_empty(new_grid[:, col1], _ALL_BUT[row], num1)
+                _place_first_empty(new_grid[:, col2], _ALL_BUT[row], num2)
                 
                 # Preenche o resto da linha deixando apenas essas duas posições
                 remaining_numbers = [n for n in available_numbers if n not in [num1, num2]]
                 fill_positions = [c for c in empty_cols if c not in [col1, col2]]
                 
-                for i, pos in enumerate(fill_positions[:len(remaining_numbers)]):
-                    new_grid[row][pos] = remaining_numbers[i]
+                count = min(len(fill_positions), len(remaining_numbers))
+                new_grid[row, fill_positions[:count]] = remaining_numbers[:count]
             
             break
     
     return new_grid
 
-def create_impossible_situation_type3(grid: List[List[int]]) -> List[List[int]]:
+def create_impossible_situation_type3(grid: np.ndarray) -> np.ndarray:
     """
     Tipo 3: Força uma situação onde um quadrante não pode ser completado
     """
-    new_grid = [row[:] for row in grid]
+    new_grid = grid.copy()
     
     # Escolhe um quadrante
     box_row = random.randint(0, 2)
     box_col = random.randint(0, 2)
     
     # Encontra posições vazias no quadrante
-    empty_positions = []
-    used_numbers = set()
+    box = new_grid[box_row * 3:(box_row + 1) * 3, box_col * 3:(box_col + 1) * 3]
+    used_numbers = set(box[box != 0].tolist())
+    empty_r, empty_c = np.nonzero(box == 0)
+    empty_positions = list(zip((empty_r + box_row * 3).tolist(), (empty_c + box_col * 3).tolist()))
     
-    for r in range(box_row * 3, (box_row + 1) * 3):
-        for c in range(box_col * 3, (box_col + 1) * 3):
-            if new_grid[r][c] == 0:
-                empty_positions.append((r, c))
-            else:
-                used_numbers.add(new_grid[r][c])
-    
-    missing_numbers = list(set(range(1, 10)) - used_numbers)
+    missing_numbers = list(_ALL_DIGITS - used_numbers)
     
     if len(empty_positions) > 0 and len(missing_numbers) > 0:
         # Escolhe um número que será impossível de colocar
         target_number = random.choice(missing_numbers)
         
-        # Coloca esse número em todas as linhas e colunas das posições vazias
+        # Coloca esse número em todas as linhas e colunas das posições vazias,
+        # sempre fora do quadrante
         for r, c in empty_positions:
             # Tenta colocar na linha
-            for other_c in range(9):
-                if (other_c < box_col * 3 or other_c >= (box_col + 1) * 3) and new_grid[r][other_c] == 0:
-                    new_grid[r][other_c] = target_number
-                    break
+            _place_first_empty(new_grid[r], _OUTSIDE_BAND[box_col], target_number)
             
             # Tenta colocar na coluna
-            for other_r in range(9):
-                if (other_r < box_row * 3 or other_r >= (box_row + 1) * 3) and new_grid[other_r][c] == 0:
-                    new_grid[other_r][c] = target_number
-                    break
+            _place_first_empty(new_grid[:, c], _OUTSIDE_BAND[box_row], target_number)
     
     return new_grid
 
-def remove_cells_strategically(grid: List[List[int]], target_empty: int = 40) -> List[List[int]]:
+def remove_cells_strategically(grid: np.ndarray, target_empty: int = 40) -> np.ndarray:
     """Remove células estrategicamente para manter a impossibilidade"""
-    new_grid = [row[:] for row in grid]
+    new_grid = grid.copy()
+    flat = new_grid.ravel()
     
-    # Lista de posições preenchidas
-    filled_positions = []
-    for r in range(9):
-        for c in range(9):
-            if new_grid[r][c] != 0:
-                filled_positions.append((r, c))
+    # Índices (0 a 80) das posições preenchidas
+    filled_positions = np.flatnonzero(flat)
     
     # Remove células aleatoriamente, mas mantém algumas estratégicas
-    random.shuffle(filled_positions)
+    cells_to_remove = max(min(target_empty, filled_positions.size - 20), 0)  # Mantém pelo menos 20 células
+    flat[np.random.choice(filled_positions, cells_to_remove, replace=False)] = 0
     
-    cells_to_remove = min(target_empty, len(filled_positions) - 20)  # Mantém pelo menos 20 células
+    return new_grid
+
+# Tipos de situações impossíveis
+IMPOSSIBLE_TYPES = [
+    ("conflict_placement", create_impossible_situation_type1),
+    ("mutual_exclusion", create_impossible_situation_type2),
+    ("box_blocking", create_impossible_situation_type3)
+]
+
+def _generate_attempts(valid_grids: np.ndarray, num_unsolvable: int, max_attempts: int,
+                       verbose: bool = True) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Laço de tentativas: gera até `num_unsolvable` sudokus impossíveis em no
+    máximo `max_attempts` tentativas, partindo dos grids válidos (N, 9, 9)
     
-    for i in range(cells_to_remove):
-        r, c = filled_positions[i]
-        new_grid[r][c] = 0
+    O tipo de situação impossível é sorteado com peso proporcional à taxa de
+    sucesso de cada tipo até o momento (começando em 1/1 para todos), para que
+    os tipos que mais rendem grids impossíveis sejam tentados mais vezes.
     
-    return new_grid
+    Args:
+        verbose: Mostra o progresso das tentativas (desligado nos processos do pool)
+    
+    Returns:
+        Tuple: Sudokus impossíveis, tentativas e sucessos de cada tipo de
+        `IMPOSSIBLE_TYPES`
+    """
+    attempts = 0
+    unsolvable_sudokus = []
+    
+    # Tentativas e sucessos de cada tipo, com uma contagem inicial de cada
+    type_attempts = np.ones(len(IMPOSSIBLE_TYPES))
+    type_successes = np.ones(len(IMPOSSIBLE_TYPES))
+    
+    while len(unsolvable_sudokus) < num_unsolvable and attempts < max_attempts:
+        # Gera um bloco de candidatos; a checagem barata é feita no bloco inteiro
+        candidates = []
+        candidate_kinds = []
+        block_size = min(_BLOCK_SIZE, max_attempts - attempts)
+        
+        # Sorteios do bloco inteiro de uma vez: sudoku válido de origem, tipo de
+        # situação impossível e número de células a remover
+        sources = np.random.randint(len(valid_grids), size=block_size)
+        rates = type_successes / type_attempts
+        kinds = np.random.choice(len(IMPOSSIBLE_TYPES), size=block_size, p=rates / rates.sum())
+        np.add.at(type_attempts, kinds, 1)
+        removals = np.random.randint(30, 51, size=block_size)
+        
+        for source, kind, removal in zip(sources.tolist(), kinds.tolist(), removals.tolist()):
+            attempts += 1
+            
+            if verbose and attempts % 100 == 0:
+                print(f"Tentativas: {attempts}, Gerados: {len(unsolvable_sudokus)}")
+            
+            # Sudoku válido sorteado (as funções abaixo trabalham em cópias)
+            grid = valid_grids[source]
+            situation_name, situation_func = IMPOSSIBLE_TYPES[kind]
+            
+            try:
+                # Cria situação impossível
+                impossible_grid = situation_func(grid)
+                
+                # Remove células estrategicamente
+                candidates.append(remove_cells_strategically(impossible_grid, removal))
+                candidate_kinds.append(kind)
+            
+            except Exception as e:
+                # Em caso de erro, tenta uma abordagem mais simples
+                if verbose and attempts % 50 == 0:
+                    print(f"Erro na tentativa {attempts}: {e}")
+                
+                # Abordagem simples: remove muitas células e introduz conflito
+                simple_grid = grid.copy()
+                
+                # Remove muitas células (60% de chance cada)
+                simple_grid[np.random.random((9, 9)) < 0.6] = 0
+                
+                # Introduz um conflito simples
+                if simple_grid[0, 0] == 0 and simple_grid[0, 1] == 0:
+                    simple_grid[0, 0] = 5
+                    simple_grid[0, 1] = 5  # Conflito na linha
+                    
+                    unsolvable_sudoku = grid_to_sudoku_string(simple_grid)
+                    unsolvable_sudokus.append(unsolvable_sudoku)
+        
+        if not candidates:
+            continue
+        
+        # Grids com célula vazia sem candidatos ou com números repetidos
+        # dispensam a busca completa
+        block = np.stack(candidates)
+        trivially_unsolvable = batch_trivially_unsolvable(block)
+        empty_counts = (block == 0).sum(axis=(1, 2))
+        
+        for open_grid, kind, trivial, empty_count in zip(candidates, candidate_kinds,
+                                                         trivially_unsolvable, empty_counts):
+            if len(unsolvable_sudokus) >= num_unsolvable:
+                break
+            
+            # Pelo menos 20 células vazias e realmente impossível
+            if empty_count >= 20 and (trivial or not _has_solution_cached(open_grid.tobytes())):
+                unsolvable_sudoku = grid_to_sudoku_string(open_grid)
+                unsolvable_sudokus.append(unsolvable_sudoku)
+                type_successes[kind] += 1
+    
+    return unsolvable_sudokus, type_attempts - 1, type_successes - 1
+
+def _print_type_stats(type_attempts: np.ndarray, type_successes: np.ndarray):
+    """Mostra as estatísticas de cada tipo de situação impossível, para ajuste dos geradores"""
+    for (situation_name, _), tried, found in zip(IMPOSSIBLE_TYPES, type_attempts, type_successes):
+        rate = found / tried if tried else 0.0
+        print(f"Tipo {situation_name}: {int(found)}/{int(tried)} impossíveis ({rate:.1%})")
+
+# Grids válidos de cada processo do pool (definidos por `_init_worker`)
+_worker_grids = None
+
+def _init_worker(valid_grids: np.ndarray):
+    """Recebe os grids válidos uma única vez por processo do pool"""
+    global _worker_grids
+    _worker_grids = valid_grids
+
+def _generate_worker(job: Tuple[int, int, int]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Versão silenciosa de `_generate_attempts` para os processos do pool, com semente própria"""
+    seed, num_unsolvable, max_attempts = job
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    return _generate_attempts(_worker_grids, num_unsolvable, max_attempts, verbose=False)
 
 def generate_unsolvable_sudokus(input_file: str, output_file: str, num_unsolvable: int = 5000):
     """
     Gera sudokus abertos impossíveis de resolver
     
+    Com mais de um processador e a partir de `_PARALLEL_MIN_COUNT` sudokus, a
+    meta e as tentativas são divididas entre os processos de um pool; cada um
+    roda o próprio laço com uma semente distinta, e o progresso e as
+    estatísticas por tipo são mostrados pelo processo principal.
+    
     Args:
         input_file: Arquivo CSV com sudokus válidos
         output_file: Arquivo CSV para salvar sudokus impossíveis
         num_unsolvable: Número de sudokus impossíveis a gerar
     """
     
-    # Tipos de situações impossíveis
-    impossible_types = [
-        ("conflict_placement", create_impossible_situation_type1),
-        ("mutual_exclusion", create_impossible_situation_type2),
-        ("box_blocking", create_impossible_situation_type3)
-    ]
-    
     # Lê sudokus válidos
     valid_sudokus = []
     print(f"Lendo sudokus válidos de {input_file}...")
@@ -247,7 +617,7 @@ def generate_unsolvable_sudokus(input_file: str, output_file: str, num_unsolvabl
         with open(input_file, 'r') as f:
             for line in f:
                 sudoku_str = line.strip()
-                if len(sudoku_str) == 81 and sudoku_str.replace('0', '').isdigit():
+                if len(sudoku_str) == 81 and sudoku_str.isascii() and sudoku_str.replace('0', '').isdigit():
                     valid_sudokus.append(sudoku_str)
     except FileNotFoundError:
         print(f"Arquivo {input_file} não encontrado!")
@@ -255,69 +625,50 @@ def generate_unsolvable_sudokus(input_file: str, output_file: str, num_unsolvabl
     
     print(f"Carregados {len(valid_sudokus)} sudokus válidos")
     
+    # Conversão única para (N, 9, 9) uint8; as tentativas só indexam o array
+    valid_grids = np.frombuffer(''.join(valid_sudokus).encode('ascii'), dtype=np.uint8).reshape(-1, 9, 9) - ord('0')
+    
     # Gera sudokus impossíveis
     unsolvable_sudokus = []
     print(f"Gerando {num_unsolvable} sudokus impossíveis...")
     
-    attempts = 0
     max_attempts = num_unsolvable * 10  # Máximo de tentativas
-    
-    while len(unsolvable_sudokus) < num_unsolvable and attempts < max_attempts:
-        attempts += 1
-        
-        if attempts % 100 == 0:
-            print(f"Tentativas: {attempts}, Gerados: {len(unsolvable_sudokus)}")
-        
-        # Escolhe um sudoku válido aleatório
-        valid_sudoku = random.choice(valid_sudokus)
-        grid = sudoku_string_to_grid(valid_sudoku)
+    n_workers = os.cpu_count() or 1
+    
+    use_pool = (n_workers > 1 and num_unsolvable >= _PARALLEL_MIN_COUNT
+                and not multiprocessing.current_process().daemon)
+    
+    if use_pool:
+        # Cada processo busca a sua parte da meta; os resultados chegam conforme
+        # os processos terminam
+        per_worker = -(-num_unsolvable // n_workers)
+        jobs = [(random.getrandbits(64), per_worker, per_worker * 10) for _ in range(n_workers)]
+        type_attempts = np.zeros(len(IMPOSSIBLE_TYPES))
+        type_successes = np.zeros(len(IMPOSSIBLE_TYPES))
         
-        # Escolhe um tipo de situação impossível
-        situation_name, situation_func = random.choice(impossible_types)
-        
-        try:
-            # Cria situação impossível
-            impossible_grid = situation_func(grid)
-            
-            # Remove células estrategicamente
-            open_grid = remove_cells_strategically(impossible_grid, random.randint(30, 50))
-            
-            # Verifica se realmente é impossível
-            if not has_solution(open_grid):
-                # Verifica se tem pelo menos algumas células vazias
-                empty_count = sum(1 for r in range(9) for c in range(9) if open_grid[r][c] == 0)
-                if empty_count >= 20:  # Pelo menos 20 células vazias
-                    unsolvable_sudoku = grid_to_sudoku_string(open_grid)
-                    unsolvable_sudokus.append(unsolvable_sudoku)
+        with multiprocessing.Pool(n_workers, initializer=_init_worker, initargs=(valid_grids,)) as pool:
+            for found, tried_by_type, found_by_type in pool.imap_unordered(_generate_worker, jobs):
+                unsolvable_sudokus.extend(found)
+                type_attempts += tried_by_type
+                type_successes += found_by_type
+                print(f"Progresso: {min(len(unsolvable_sudokus), num_unsolvable)}/{num_unsolvable}")
+                if len(unsolvable_sudokus) >= num_unsolvable:
+                    break
         
-        except Exception as e:
-            # Em caso de erro, tenta uma abordagem mais simples
-            if attempts % 50 == 0:
-                print(f"Erro na tentativa {attempts}: {e}")
-            
-            # Abordagem simples: remove muitas células e introduz conflito
-            simple_grid = [row[:] for row in grid]
-            
-            # Remove muitas células
-            for r in range(9):
-                for c in range(9):
-                    if random.random() < 0.6:  # 60% de chance de remover
-                        simple_grid[r][c] = 0
-            
-            # Introduz um conflito simples
-            if simple_grid[0][0] == 0 and simple_grid[0][1] == 0:
-                simple_grid[0][0] = 5
-                simple_grid[0][1] = 5  # Conflito na linha
-                
-                unsolvable_sudoku = grid_to_sudoku_string(simple_grid)
-                unsolvable_sudokus.append(unsolvable_sudoku)
+        unsolvable_sudokus = unsolvable_sudokus[:num_unsolvable]
+    else:
+        unsolvable_sudokus, type_attempts, type_successes = _generate_attempts(valid_grids, num_unsolvable,
+                                                                               max_attempts)
+    
+    _print_type_stats(type_attempts, type_successes)
     
     # Salva sudokus impossíveis
     print(f"Salvando {len(unsolvable_sudokus)} sudokus impossíveis em {output_file}...")
     
-    with open(output_file, 'w') as f:
-        for unsolvable_sudoku in unsolvable_sudokus:
-            f.write(unsolvable_sudoku + '\n')
+    # Uma única escrita em bloco em vez de uma chamada por linha
+    with open(output_file, 'w', buffering=1024 * 1024) as f:
+        if unsolvable_sudokus:
+            f.write('\n'.join(unsolvable_sudokus) + '\n')
     
     print(f"Concluído! {len(unsolvable_sudokus)} sudokus impossíveis salvos em {output_file}")
 
@@ -332,10 +683,11 @@ def verify_unsolvable_sudoku(sudoku_str: str) -> dict:
         return {"valid": False, "reason": "invalid_format"}
     
     # Conta células vazias
-    empty_count = sum(1 for r in range(9) for c in range(9) if grid[r][c] == 0)
+    empty_count = int((grid == 0).sum())
     
-    # Verifica se tem solução
-    solvable = has_solution(grid)
+    # Verifica se tem solução (números repetidos já descartam a busca)
+    cells = grid.tolist()
+    solvable = not has_trivial_conflict(cells) and has_solution(cells)
     
     return {
         "valid": True,
@@ -367,8 +719,7 @@ if __name__ == "__main__":
         print("\nVerificando alguns sudokus gerados...")
         try:
             with open(args.output, 'r') as f:
-                lines = f.readlines()
-                for i, line in enumerate(lines[:5]):
+                for i, line in enumerate(islice(f, 5)):
                     sudoku_str = line.strip()
                     result = verify_unsolvable_sudoku(sudoku_str)
                     print(f"Sudoku {i+1}: {result}")
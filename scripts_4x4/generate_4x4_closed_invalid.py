@@ -5,32 +5,46 @@ Gera tabuleiros completos que violam as regras do Sudoku.
 """
 
 import random
-import csv
+from itertools import islice
 from typing import List, Set
 
+# Números válidos de um sudoku 4x4
+_ALL_4 = frozenset((1, 2, 3, 4))
+
 def is_valid_4x4_sudoku(grid: List[List[int]]) -> bool:
     """
     Verifica se um sudoku 4x4 é válido
+
+    Cada linha, coluna e caixa acumula o bit 1 << (v-1) de seus valores em
+    uma máscara de 4 bits; a unidade é válida quando a máscara fica completa
+    (0b1111). Valores fora de 1-4 tornam o sudoku inválido.
     """
-    # Verificar linhas
+    # Verificar linhas (e o intervalo dos valores)
     for row in grid:
-        if len(set(row)) != 4:
+        mask = 0
+        for value in row:
+            if value < 1 or value > 4:
+                return False
+            mask |= 1 << (value - 1)
+        if mask != 0xF:
             return False
     
     # Verificar colunas
     for col in range(4):
-        column = [grid[row][col] for row in range(4)]
-        if len(set(column)) != 4:
+        mask = 0
+        for row in range(4):
+            mask |= 1 << (grid[row][col] - 1)
+        if mask != 0xF:
             return False
     
     # Verificar caixas 2x2
     for box_row in range(0, 4, 2):
         for box_col in range(0, 4, 2):
-            box = []
-            for i in range(2):
-                for j in range(2):
-                    box.append(grid[box_row + i][box_col + j])
-            if len(set(box)) != 4:
+            top = grid[box_row]
+            bottom = grid[box_row + 1]
+            mask = ((1 << (top[box_col] - 1)) | (1 << (top[box_col + 1] - 1)) |
+                    (1 << (bottom[box_col] - 1)) | (1 << (bottom[box_col + 1] - 1)))
+            if mask != 0xF:
                 return False
     
     return True
@@ -96,7 +110,7 @@ def create_invalid_by_missing_numbers() -> List[List[int]]:
     for row in range(4):
         for col in range(4):
             if random.random() < 0.8:  # 80% de chance de preencher
-                available = [n for n in range(1, 5) if n not in numbers_used]
+                available = sorted(_ALL_4 - numbers_used)
                 if available:
                     number = random.choice(available)
                     grid[row][col] = number
@@ -136,7 +150,8 @@ def create_invalid_by_wrong_numbers() -> List[List[int]]:
 
 def grid_to_string(grid: List[List[int]]) -> str:
     """Converte grid 4x4 em string de 16 caracteres"""
-    return ''.join(str(grid[i][j]) for i in range(4) for j in range(4))
+    # Valores de 0 a 9 viram os códigos ASCII dos dígitos
+    return bytes([value + 48 for row in grid for value in row]).decode('ascii')
 
 def print_grid(grid: List[List[int]]):
     """Imprime o grid 4x4 de forma legível"""
@@ -205,10 +220,10 @@ def generate_4x4_closed_invalid_sudokus(output_file: str, count: int = 1000):
     # Salvar no arquivo CSV
     print(f"Salvando {len(sudokus)} sudokus em {output_file}...")
     
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        for sudoku in sudokus:
-            writer.writerow([sudoku])
+    # Strings de 16 dígitos não precisam de aspas: uma única escrita em bloco
+    with open(output_file, 'w', newline='', buffering=1024 * 1024) as f:
+        if sudokus:
+            f.write('\n'.join(sudokus) + '\n')
     
     print(f"Concluído! {len(sudokus)} sudokus 4x4 fechados inválidos salvos em {output_file}")
 
@@ -256,11 +271,8 @@ if __name__ == "__main__":
     print("\nPrimeiros 3 sudokus gerados:")
     try:
         with open(args.output, 'r') as f:
-            reader = csv.reader(f)
-            for i, row in enumerate(reader):
-                if i >= 3:
-                    break
-                sudoku_str = row[0]
+            for i, line in enumerate(islice(f, 3)):
+                sudoku_str = line.strip()
                 print(f"\nSudoku {i+1}:")
                 grid = [[int(sudoku_str[r*4 + c]) for c in range(4)] for r in range(4)]
                 print_grid(grid)
@@ -11,26 +11,37 @@ from typing import List, Set
 def is_valid_4x4_sudoku(grid: List[List[int]]) -> bool:
     """
     Verifica se um sudoku 4x4 é válido
+
+    Cada linha, coluna e caixa acumula o bit 1 << (v-1) de seus valores em
+    uma máscara de 4 bits; a unidade é válida quando a máscara fica completa
+    (0b1111). Valores fora de 1-4 tornam o sudoku inválido.
     """
-    # Verificar linhas
+    # Verificar linhas (e o intervalo dos valores)
     for row in grid:
-        if len(set(row)) != 4:
+        mask = 0
+        for value in row:
+            if value < 1 or value > 4:
+                return False
+            mask |= 1 << (value - 1)
+        if mask != 0xF:
             return False
     
     # Verificar colunas
     for col in range(4):
-        column = [grid[row][col] for row in range(4)]
-        if len(set(column)) != 4:
+        mask = 0
+        for row in range(4):
+            mask |= 1 << (grid[row][col] - 1)
+        if mask != 0xF:
             return False
     
     # Verificar caixas 2x2
     for box_row in range(0, 4, 2):
         for box_col in range(0, 4, 2):
-            box = []
-            for i in range(2):
-                for j in range(2):
-                    box.append(grid[box_row + i][box_col + j])
-            if len(set(box)) != 4:
+            top = grid[box_row]
+            bottom = grid[box_row + 1]
+            mask = ((1 << (top[box_col] - 1)) | (1 << (top[box_col + 1] - 1)) |
+                    (1 << (bottom[box_col] - 1)) | (1 << (bottom[box_col + 1] - 1)))
+            if mask != 0xF:
                 return False
     
     return True
@@ -5,8 +5,9 @@ from typing import Dict, List, Tuple
 import sys
 import os
 
-# Adicionar o diretório raiz ao path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Adicionar o diretório raiz ao path apenas quando executado diretamente como script
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from solver.predicates import SudokuPredicates
 
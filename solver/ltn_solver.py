@@ -2,13 +2,15 @@
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 import numpy as np
+import logging
 import sys
 import os
 
-# Adicionar o diretório raiz ao path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Adicionar o diretório raiz ao path apenas quando executado diretamente como script
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.sudoku_board import SudokuBoard
 from core.memory_system import MemorySystem
@@ -16,6 +18,40 @@ from solver.predicates import SudokuPredicates
 from solver.knowledge_base import SudokuKnowledgeBase
 from utils.training_data import SudokuTrainingDataGenerator
 
+# Mensagens por iteração/movimento vão para o logger (formatadas só se o nível estiver ativo)
+logger = logging.getLogger(__name__)
+
+def resolve_device(device: Optional[str] = None) -> torch.device:
+    """
+    Converte a opção de dispositivo em torch.device
+    
+    Args:
+        device: 'cpu', 'cuda', 'auto' (cuda se disponível) ou None (cpu)
+        
+    Returns:
+        torch.device correspondente
+    """
+    if device == 'auto':
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    return torch.device(device or 'cpu')
+
+def _move_to_device(data, device: torch.device):
+    """
+    Move recursivamente os tensores de uma estrutura (dict/tuple/list) para o dispositivo
+    
+    Para a GPU, os tensores passam por memória fixada (pinned), o que permite
+    cópias assíncronas (non_blocking) que se sobrepõem às seguintes.
+    """
+    if isinstance(data, torch.Tensor):
+        if device.type == 'cuda' and data.device.type == 'cpu':
+            return data.pin_memory().to(device, non_blocking=True)
+        return data.to(device)
+    if isinstance(data, dict):
+        return {key: _move_to_device(value, device) for key, value in data.items()}
+    if isinstance(data, (tuple, list)):
+        return type(data)(_move_to_device(value, device) for value in data)
+    return data
+
 class SudokuLTNSolver:
     """
     Solver principal LTN para Sudoku que integra todos os componentes:
@@ -25,12 +61,16 @@ class SudokuLTNSolver:
     - Treinamento e inferência
     """
     
-    def __init__(self, board_size: int = 9, learning_rate: float = 0.001):
+    def __init__(self, board_size: int = 9, learning_rate: float = 0.001,
+                 device: Optional[str] = None, compile_models: bool = False):
         self.board_size = board_size
         self.learning_rate = learning_rate
+        self.device = resolve_device(device)
         
         # Componentes principais
-        self.predicates = SudokuPredicates(board_size)
+        self.predicates = SudokuPredicates(board_size).to(self.device)
+        if compile_models:
+            self.predicates.compile_models()
         self.knowledge_base = SudokuKnowledgeBase(board_size)
         self.memory_system = MemorySystem()
         self.data_generator = SudokuTrainingDataGenerator(board_size)
@@ -48,6 +88,13 @@ class SudokuLTNSolver:
             'epochs': 0
         }
         
+        # Tensores constantes com o tamanho do tabuleiro, por tamanho de batch
+        self._board_size_tensors = {}
+        
+        # Tensores (1,) com cada índice/valor de 0 a board_size, usados na inferência:
+        # `self._index_tensors[k]` substitui `torch.tensor([k])` a cada candidato avaliado
+        self._index_tensors = torch.arange(board_size + 1, device=self.device).unsqueeze(1)
+        
     def train_from_csv(self, csv_path: str, epochs: int = 100, batch_size: int = 32):
         """
         Treina o solver usando dados de um arquivo CSV
@@ -66,6 +113,9 @@ class SudokuLTNSolver:
             print("Erro: Nenhum dado de treinamento gerado!")
             return
         
+        # Copiar os dados para o dispositivo do modelo uma única vez (não a cada batch)
+        training_data = _move_to_device(training_data, self.device)
+        
         print(f"Dados de treinamento gerados. Iniciando {epochs} épocas...")
         
         for epoch in range(epochs):
@@ -115,17 +165,20 @@ class SudokuLTNSolver:
         self.training_history['epochs'] = epochs
         print(f"Treinamento concluído! Loss final: {avg_loss:.4f}")
     
-    def train_with_boards(self, boards: List[SudokuBoard], epochs: int = 100, 
-                         batch_size: int = 32, situation_type: str = "general", is_open_sudokus: bool = True):
+    def train_with_boards(self, boards: Union[List[SudokuBoard], np.ndarray], epochs: int = 100, 
+                         batch_size: int = 32, situation_type: str = "general",
+                         is_open_sudokus: Union[bool, np.ndarray] = True):
         """
         Treina o solver usando uma lista de objetos SudokuBoard
         
         Args:
-            boards: lista de objetos SudokuBoard
+            boards: lista de objetos SudokuBoard, ou array (N, n, n) int8 com os tabuleiros
+                    (como o retornado por `load_sudokus_batch`)
             epochs: número de épocas de treinamento
             batch_size: tamanho do batch
             situation_type: tipo de situação sendo treinada
-            is_open_sudokus: True se são sudokus abertos, False se são fechados
+            is_open_sudokus: True se são sudokus abertos, False se são fechados, ou máscara
+                             booleana (N,) por tabuleiro (batch com várias situações)
         """
         print(f"Iniciando treinamento para '{situation_type}' com {len(boards)} tabuleiros")
         
@@ -136,6 +189,9 @@ class SudokuLTNSolver:
             print("Erro: Nenhum dado de treinamento gerado!")
             return
         
+        # Copiar os dados para o dispositivo do modelo uma única vez (não a cada batch)
+        training_data = _move_to_device(training_data, self.device)
+        
         print(f"Dados de treinamento gerados. Iniciando {epochs} épocas...")
         
         for epoch in range(epochs):
@@ -189,6 +245,19 @@ class SudokuLTNSolver:
         self.training_history['epochs'] += epochs
         print(f"Treinamento '{situation_type}' concluído! Loss final: {avg_loss:.4f}")
     
+    def _board_size_tensor(self, length: int) -> torch.Tensor:
+        """
+        Retorna o tensor (length,) preenchido com o tamanho do tabuleiro
+        
+        O tensor é criado uma única vez por tamanho de batch e reutilizado em
+        todas as épocas (é apenas lido pelos modelos).
+        """
+        tensor = self._board_size_tensors.get(length)
+        if tensor is None:
+            tensor = torch.full((length,), self.board_size, dtype=torch.long, device=self.device)
+            self._board_size_tensors[length] = tensor
+        return tensor
+    
     def _train_valid_cell_batch(self, data: Tuple, batch_size: int) -> Tuple[float, float]:
         """
         Treina o predicate ValidCell
@@ -208,7 +277,7 @@ class SudokuLTNSolver:
             self.optimizer.zero_grad()
             
             # Forward pass - usar o modelo diretamente em vez do predicate LTN
-            batch_size_tensor = torch.full((len(batch_rows),), self.board_size, dtype=torch.long)
+            batch_size_tensor = self._board_size_tensor(len(batch_rows))
             predictions = self.predicates.call_valid_cell_model(batch_rows, batch_cols, batch_values, batch_boards, batch_size_tensor)
             
             # Loss usando BCE
@@ -244,7 +313,7 @@ class SudokuLTNSolver:
                 
                 self.optimizer.zero_grad()
                 
-                batch_size_tensor = torch.full((len(batch_indices),), self.board_size, dtype=torch.long)
+                batch_size_tensor = self._board_size_tensor(len(batch_indices))
                 predictions = self.predicates.call_row_constraint_model(batch_indices, batch_values, batch_boards, batch_size_tensor)
                 
                 # Garantir que predictions e batch_labels tenham dimensões compatíveis
@@ -259,7 +328,7 @@ class SudokuLTNSolver:
                     if predictions.numel() == batch_labels.numel():
                         predictions = predictions.view_as(batch_labels)
                     else:
-                        print(f"⚠️  Aviso: Dimensões incompatíveis - predictions: {predictions.shape}, labels: {batch_labels.shape}")
+                        logger.warning("Dimensões incompatíveis - predictions: %s, labels: %s", tuple(predictions.shape), tuple(batch_labels.shape))
                         continue  # Pular este batch
                 
                 loss = nn.functional.binary_cross_entropy(predictions, batch_labels)
@@ -283,7 +352,7 @@ class SudokuLTNSolver:
                 
                 self.optimizer.zero_grad()
                 
-                batch_size_tensor = torch.full((len(batch_indices),), self.board_size, dtype=torch.long)
+                batch_size_tensor = self._board_size_tensor(len(batch_indices))
                 predictions = self.predicates.call_col_constraint_model(batch_indices, batch_values, batch_boards, batch_size_tensor)
                 
                 # Garantir que predictions e batch_labels tenham dimensões compatíveis
@@ -298,7 +367,7 @@ class SudokuLTNSolver:
                     if predictions.numel() == batch_labels.numel():
                         predictions = predictions.view_as(batch_labels)
                     else:
-                        print(f"⚠️  Aviso: Dimensões incompatíveis - predictions: {predictions.shape}, labels: {batch_labels.shape}")
+                        logger.warning("Dimensões incompatíveis - predictions: %s, labels: %s", tuple(predictions.shape), tuple(batch_labels.shape))
                         continue  # Pular este batch
                 
                 loss = nn.functional.binary_cross_entropy(predictions, batch_labels)
@@ -323,7 +392,7 @@ class SudokuLTNSolver:
                 
                 self.optimizer.zero_grad()
                 
-                batch_size_tensor = torch.full((len(batch_row_indices),), self.board_size, dtype=torch.long)
+                batch_size_tensor = self._board_size_tensor(len(batch_row_indices))
                 predictions = self.predicates.call_box_constraint_model(batch_row_indices, batch_col_indices, batch_values, batch_boards, batch_size_tensor)
                 
                 # Garantir que predictions e batch_labels tenham dimensões compatíveis
@@ -338,7 +407,7 @@ class SudokuLTNSolver:
                     if predictions.numel() == batch_labels.numel():
                         predictions = predictions.view_as(batch_labels)
                     else:
-                        print(f"⚠️  Aviso: Dimensões incompatíveis - predictions: {predictions.shape}, labels: {batch_labels.shape}")
+                        logger.warning("Dimensões incompatíveis - predictions: %s, labels: %s", tuple(predictions.shape), tuple(batch_labels.shape))
                         continue  # Pular este batch
                 
                 loss = nn.functional.binary_cross_entropy(predictions, batch_labels)
@@ -370,7 +439,7 @@ class SudokuLTNSolver:
             
             self.optimizer.zero_grad()
             
-            batch_size_tensor = torch.full((len(batch_rows),), self.board_size, dtype=torch.long)
+            batch_size_tensor = self._board_size_tensor(len(batch_rows))
             predictions = self.predicates.call_naked_single_model(batch_rows, batch_cols, batch_boards, batch_candidates, batch_size_tensor)
             loss = nn.functional.binary_cross_entropy(predictions, batch_labels)
             
@@ -402,7 +471,7 @@ class SudokuLTNSolver:
             
             self.optimizer.zero_grad()
             
-            batch_size_tensor = torch.full((len(batch_rows),), self.board_size, dtype=torch.long)
+            batch_size_tensor = self._board_size_tensor(len(batch_rows))
             predictions = self.predicates.call_hidden_single_model(batch_rows, batch_cols, batch_values, batch_boards, batch_unit_candidates, batch_size_tensor)
             loss = nn.functional.binary_cross_entropy(predictions, batch_labels)
             
@@ -457,7 +526,7 @@ class SudokuLTNSolver:
         iteration = 0
         
         for iteration in range(max_iterations):
-            print(f"Iteração {iteration + 1}")
+            logger.debug("Iteração %d", iteration + 1)
             
             # Verificar se foi resolvido
             if current_board.is_closed():
@@ -507,33 +576,33 @@ class SudokuLTNSolver:
         Returns:
             True se um movimento foi feito, False caso contrário
         """
-        board_tensor = board.to_tensor()
+        board_tensor = board.to_tensor().to(self.device)
         
         # Tentar Naked Single primeiro
         naked_single_move = self._try_naked_single(board, board_tensor)
         if naked_single_move:
             row, col, value = naked_single_move
-            board.board[row, col] = value
+            board.set_cell(row, col, value)
             self.memory_system.add_heuristic_usage('naked_single', (row, col), value)
-            print(f"Naked Single: ({row}, {col}) = {value}")
+            logger.debug("Naked Single: (%d, %d) = %d", row, col, value)
             return True
         
         # Tentar Hidden Single
         hidden_single_move = self._try_hidden_single(board, board_tensor)
         if hidden_single_move:
             row, col, value = hidden_single_move
-            board.board[row, col] = value
+            board.set_cell(row, col, value)
             self.memory_system.add_heuristic_usage('hidden_single', (row, col), value)
-            print(f"Hidden Single: ({row}, {col}) = {value}")
+            logger.debug("Hidden Single: (%d, %d) = %d", row, col, value)
             return True
         
         # Tentar movimento baseado em ValidCell com maior confiança
         valid_cell_move = self._try_valid_cell_move(board, board_tensor)
         if valid_cell_move:
             row, col, value = valid_cell_move
-            board.board[row, col] = value
+            board.set_cell(row, col, value)
             self.memory_system.add_heuristic_usage('valid_cell', (row, col), value)
-            print(f"Valid Cell: ({row}, {col}) = {value}")
+            logger.debug("Valid Cell: (%d, %d) = %d", row, col, value)
             return True
         
         return False
@@ -541,26 +610,32 @@ class SudokuLTNSolver:
     def _try_naked_single(self, board: SudokuBoard, board_tensor: torch.Tensor) -> Optional[Tuple[int, int, int]]:
         """
         Tenta encontrar um movimento Naked Single
+        
+        Todas as células com um único candidato são avaliadas em um só forward;
+        vale a primeira (na ordem das células) com confiança acima do limiar.
         """
         candidates_matrix = board.get_candidates_matrix()
+        singles = [(row, col, next(iter(candidates)))
+                   for (row, col), candidates in candidates_matrix.items() if len(candidates) == 1]
+        if not singles:
+            return None
         
-        for (row, col), candidates in candidates_matrix.items():
-            if len(candidates) == 1:
-                # Verificar com LTN
-                candidates_vector = torch.zeros(self.board_size)
-                for candidate in candidates:
-                    candidates_vector[candidate - 1] = 1.0
-                
-                r_tensor = torch.tensor([row])
-                c_tensor = torch.tensor([col])
-                board_batch = board_tensor.unsqueeze(0)
-                candidates_batch = candidates_vector.unsqueeze(0)
-                board_size_tensor = torch.tensor([self.board_size])
-                
-                confidence = self.predicates.call_naked_single_model(r_tensor, c_tensor, board_batch, candidates_batch, board_size_tensor)
-                
-                if confidence.item() > 0.7:  # Threshold de confiança
-                    return (row, col, list(candidates)[0])
+        rows, cols, values = zip(*singles)
+        r_tensor = torch.tensor(rows, dtype=torch.long, device=self.device)
+        c_tensor = torch.tensor(cols, dtype=torch.long, device=self.device)
+        board_batch = board_tensor.unsqueeze(0).expand(len(singles), -1, -1)
+        
+        # Vetor binário de candidatos: um único 1 na posição do valor
+        candidates_batch = torch.zeros(len(singles), self.board_size, device=self.device)
+        candidates_batch[torch.arange(len(singles), device=self.device),
+                         torch.tensor(values, dtype=torch.long, device=self.device) - 1] = 1.0
+        board_size_tensor = self._board_size_tensor(len(singles))
+        
+        confidence = self.predicates.call_naked_single_model(r_tensor, c_tensor, board_batch, candidates_batch, board_size_tensor)
+        
+        confident = torch.nonzero(confidence.reshape(-1) > 0.7)  # Threshold de confiança
+        if len(confident) > 0:
+            return singles[int(confident[0])]
         
         return None
     
@@ -579,12 +654,12 @@ class SudokuLTNSolver:
                             # Confirmar com LTN
                             unit_info = self.data_generator._get_unit_candidates_info(board, row, col, value)
                             
-                            r_tensor = torch.tensor([row])
-                            c_tensor = torch.tensor([col])
-                            v_tensor = torch.tensor([value])
+                            r_tensor = self._index_tensors[row]
+                            c_tensor = self._index_tensors[col]
+                            v_tensor = self._index_tensors[value]
                             board_batch = board_tensor.unsqueeze(0)
-                            unit_info_batch = unit_info.unsqueeze(0)
-                            board_size_tensor = torch.tensor([self.board_size])
+                            unit_info_batch = unit_info.unsqueeze(0).to(self.device)
+                            board_size_tensor = self._board_size_tensor(1)
                             
                             confidence = self.predicates.call_hidden_single_model(r_tensor, c_tensor, v_tensor, board_batch, unit_info_batch, board_size_tensor)
                             
@@ -596,30 +671,27 @@ class SudokuLTNSolver:
     def _try_valid_cell_move(self, board: SudokuBoard, board_tensor: torch.Tensor) -> Optional[Tuple[int, int, int]]:
         """
         Tenta encontrar um movimento baseado no predicate ValidCell
+        
+        Todos os pares (célula, valor possível) são avaliados em um só forward.
         """
-        best_move = None
-        best_confidence = 0.0
+        moves = [(row, col, value)
+                 for row, col in board.get_open_positions()
+                 for value in board.get_possible_numbers(row, col)]
+        if not moves:
+            return None
         
-        open_positions = board.get_open_positions()
+        r_tensor, c_tensor, v_tensor = torch.tensor(moves, dtype=torch.long, device=self.device).unbind(1)
+        board_batch = board_tensor.unsqueeze(0).expand(len(moves), -1, -1)
+        board_size_tensor = self._board_size_tensor(len(moves))
         
-        for row, col in open_positions:
-            possible_values = board.get_possible_numbers(row, col)
-            
-            for value in possible_values:
-                r_tensor = torch.tensor([row])
-                c_tensor = torch.tensor([col])
-                v_tensor = torch.tensor([value])
-                board_batch = board_tensor.unsqueeze(0)
-                board_size_tensor = torch.tensor([self.board_size])
-                
-                confidence = self.predicates.call_valid_cell_model(r_tensor, c_tensor, v_tensor, board_batch, board_size_tensor)
-                
-                if confidence.item() > best_confidence:
-                    best_confidence = confidence.item()
-                    best_move = (row, col, value)
+        confidence = self.predicates.call_valid_cell_model(r_tensor, c_tensor, v_tensor, board_batch, board_size_tensor)
+        
+        # argmax devolve o primeiro máximo, como a busca sequencial pelo maior valor
+        best_index = int(torch.argmax(confidence.reshape(-1)))
+        best_confidence = confidence.reshape(-1)[best_index].item()
         
         if best_confidence > 0.8:  # Threshold alto para ValidCell
-            return best_move
+            return moves[best_index]
         
         return None
     
@@ -635,19 +707,39 @@ class SudokuLTNSolver:
             'satisfaction_history': self.training_history['satisfactions']
         }
     
+    def get_predicates_state(self) -> Dict[str, Dict]:
+        """
+        Retorna os state_dicts de todos os modelos de predicates
+        """
+        return {
+            'valid_cell': self.predicates.valid_cell_model.state_dict(),
+            'row_constraint': self.predicates.row_constraint_model.state_dict(),
+            'col_constraint': self.predicates.col_constraint_model.state_dict(),
+            'box_constraint': self.predicates.box_constraint_model.state_dict(),
+            'naked_single': self.predicates.naked_single_model.state_dict(),
+            'hidden_single': self.predicates.hidden_single_model.state_dict(),
+        }
+    
+    def load_predicates_state(self, predicates_state: Dict[str, Dict]):
+        """
+        Carrega os state_dicts dos modelos de predicates
+        
+        Args:
+            predicates_state: dicionário no formato de `get_predicates_state`
+        """
+        self.predicates.valid_cell_model.load_state_dict(predicates_state['valid_cell'])
+        self.predicates.row_constraint_model.load_state_dict(predicates_state['row_constraint'])
+        self.predicates.col_constraint_model.load_state_dict(predicates_state['col_constraint'])
+        self.predicates.box_constraint_model.load_state_dict(predicates_state['box_constraint'])
+        self.predicates.naked_single_model.load_state_dict(predicates_state['naked_single'])
+        self.predicates.hidden_single_model.load_state_dict(predicates_state['hidden_single'])
+    
     def save_model(self, path: str):
         """
         Salva o modelo treinado
         """
         torch.save({
-            'predicates_state': {
-                'valid_cell': self.predicates.valid_cell_model.state_dict(),
-                'row_constraint': self.predicates.row_constraint_model.state_dict(),
-                'col_constraint': self.predicates.col_constraint_model.state_dict(),
-                'box_constraint': self.predicates.box_constraint_model.state_dict(),
-                'naked_single': self.predicates.naked_single_model.state_dict(),
-                'hidden_single': self.predicates.hidden_single_model.state_dict(),
-            },
+            'predicates_state': self.get_predicates_state(),
             'training_history': self.training_history,
             'board_size': self.board_size
         }, path)
@@ -657,14 +749,9 @@ class SudokuLTNSolver:
         """
         Carrega um modelo treinado
         """
-        checkpoint = torch.load(path)
+        checkpoint = torch.load(path, map_location=self.device)
         
-        self.predicates.valid_cell_model.load_state_dict(checkpoint['predicates_state']['valid_cell'])
-        self.predicates.row_constraint_model.load_state_dict(checkpoint['predicates_state']['row_constraint'])
-        self.predicates.col_constraint_model.load_state_dict(checkpoint['predicates_state']['col_constraint'])
-        self.predicates.box_constraint_model.load_state_dict(checkpoint['predicates_state']['box_constraint'])
-        self.predicates.naked_single_model.load_state_dict(checkpoint['predicates_state']['naked_single'])
-        self.predicates.hidden_single_model.load_state_dict(checkpoint['predicates_state']['hidden_single'])
+        self.load_predicates_state(checkpoint['predicates_state'])
         
         self.training_history = checkpoint['training_history']
         self.board_size = checkpoint['board_size']
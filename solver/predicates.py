@@ -322,6 +322,47 @@ class SudokuPredicates:
             'HiddenSingle': self.HiddenSingle
         }
         
+    def get_models(self) -> List[nn.Module]:
+        """
+        Retorna a lista dos modelos neurais de todos os predicates
+        """
+        return [
+            self.valid_cell_model,
+            self.row_constraint_model,
+            self.col_constraint_model,
+            self.box_constraint_model,
+            self.naked_single_model,
+            self.hidden_single_model
+        ]
+    
+    def to(self, device) -> 'SudokuPredicates':
+        """
+        Move todos os modelos para o dispositivo indicado (ex.: 'cuda')
+        """
+        for model in self.get_models():
+            model.to(device)
+        return self
+    
+    def compile_models(self, mode: str = 'reduce-overhead'):
+        """
+        Compila o forward de cada modelo com torch.compile
+        
+        A compilação é feita no próprio módulo (nn.Module.compile, PyTorch >= 2.2,
+        ou o forward compilado com torch.compile em 2.0/2.1), então as chaves do
+        state_dict continuam as mesmas para salvar/carregar modelos. Sem
+        torch.compile (PyTorch < 2.0) os modelos seguem sem compilação.
+        """
+        if not hasattr(torch, 'compile'):
+            print(f"⚠️  torch.compile requer PyTorch >= 2.0 (instalado: {torch.__version__}); "
+                  "os modelos seguem sem compilação")
+            return
+        
+        for model in self.get_models():
+            if hasattr(model, 'compile'):
+                model.compile(mode=mode)
+            else:
+                model.forward = torch.compile(model.forward, mode=mode)
+    
     def get_model_parameters(self) -> List[torch.nn.Parameter]:
         """
         Retorna todos os parâmetros dos modelos para otimização
@@ -2,7 +2,8 @@ import csv
 import sys
 import os
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 def read_csv(file_path):
     with open(file_path, 'r') as file:
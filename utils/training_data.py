@@ -2,13 +2,14 @@
 import torch
 import numpy as np
 import pandas as pd
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import random
 import sys
 import os
 
-# Adicionar o diretório raiz ao path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Adicionar o diretório raiz ao path apenas quando executado diretamente como script
+if not __package__:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.sudoku_board import SudokuBoard
 
@@ -50,7 +51,22 @@ class SudokuTrainingDataGenerator:
             print(f"Erro ao carregar CSV: {e}")
             return []
     
-    def generate_valid_cell_data(self, boards: List[SudokuBoard]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    def stack_boards(self, boards: Union[List[SudokuBoard], np.ndarray]) -> torch.Tensor:
+        """
+        Empilha os tabuleiros em um único tensor (N, board_size, board_size)
+        
+        Os exemplos de treinamento referenciam seus tabuleiros por índice neste
+        tensor, em vez de guardar uma cópia do tabuleiro por exemplo.
+        """
+        if isinstance(boards, np.ndarray):
+            # Batch (N, n, n): uma única conversão, sem empilhar; o astype gera uma
+            # cópia gravável mesmo quando o batch é um memmap somente leitura do cache
+            return torch.from_numpy(boards.astype(np.float32))
+        if not boards:
+            return torch.empty(0, self.board_size, self.board_size)
+        return torch.from_numpy(np.stack([board.board for board in boards])).to(torch.float32)
+    
+    def generate_valid_cell_data(self, boards: List[SudokuBoard], board_tensors: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Gera dados de treinamento para o predicate ValidCell
         
@@ -59,8 +75,10 @@ class SudokuTrainingDataGenerator:
         """
         rows, cols, values, board_states, labels = [], [], [], [], []
         
-        for board in boards:
-            board_tensor = board.to_tensor()
+        if board_tensors is None:
+            board_tensors = self.stack_boards(boards)
+        
+        for board_index, board in enumerate(boards):
             
             # Exemplos positivos: células já preenchidas (válidas)
             for r in range(self.board_size):
@@ -69,7 +87,7 @@ class SudokuTrainingDataGenerator:
                         rows.append(r)
                         cols.append(c)
                         values.append(board.board[r, c])
-                        board_states.append(board_tensor)
+                        board_states.append(board_index)
                         labels.append(1.0)  # Válido
             
             # Exemplos negativos: movimentos inválidos
@@ -84,18 +102,18 @@ class SudokuTrainingDataGenerator:
                     rows.append(r)
                     cols.append(c)
                     values.append(val)
-                    board_states.append(board_tensor)
+                    board_states.append(board_index)
                     labels.append(0.0)  # Inválido
         
         return (
             torch.tensor(rows, dtype=torch.long),
             torch.tensor(cols, dtype=torch.long),
             torch.tensor(values, dtype=torch.long),
-            torch.stack(board_states),
+            board_tensors[torch.tensor(board_states, dtype=torch.long)],
             torch.tensor(labels, dtype=torch.float32)
         )
     
-    def generate_constraint_data(self, boards: List[SudokuBoard]) -> Dict[str, Tuple]:
+    def generate_constraint_data(self, boards: List[SudokuBoard], board_tensors: Optional[torch.Tensor] = None) -> Dict[str, Tuple]:
         """
         Gera dados de treinamento para os predicates de constraint (Row, Col, Box)
         
@@ -108,8 +126,10 @@ class SudokuTrainingDataGenerator:
             'box': {'row_indices': [], 'col_indices': [], 'values': [], 'boards': [], 'labels': []}
         }
         
-        for board in boards:
-            board_tensor = board.to_tensor()
+        if board_tensors is None:
+            board_tensors = self.stack_boards(boards)
+        
+        for board_index, board in enumerate(boards):
             
             # Dados para Row Constraint
             for r in range(self.board_size):
@@ -119,7 +139,7 @@ class SudokuTrainingDataGenerator:
                     
                     constraint_data['row']['indices'].append(r)
                     constraint_data['row']['values'].append(val)
-                    constraint_data['row']['boards'].append(board_tensor)
+                    constraint_data['row']['boards'].append(board_index)
                     constraint_data['row']['labels'].append(0.0 if exists_in_row else 1.0)
             
             # Dados para Col Constraint
@@ -130,7 +150,7 @@ class SudokuTrainingDataGenerator:
                     
                     constraint_data['col']['indices'].append(c)
                     constraint_data['col']['values'].append(val)
-                    constraint_data['col']['boards'].append(board_tensor)
+                    constraint_data['col']['boards'].append(board_index)
                     constraint_data['col']['labels'].append(0.0 if exists_in_col else 1.0)
             
             # Dados para Box Constraint
@@ -145,7 +165,7 @@ class SudokuTrainingDataGenerator:
                         constraint_data['box']['row_indices'].append(box_r // self.box_size)
                         constraint_data['box']['col_indices'].append(box_c // self.box_size)
                         constraint_data['box']['values'].append(val)
-                        constraint_data['box']['boards'].append(board_tensor)
+                        constraint_data['box']['boards'].append(board_index)
                         constraint_data['box']['labels'].append(0.0 if exists_in_box else 1.0)
         
         # Converter para tensors
@@ -156,27 +176,29 @@ class SudokuTrainingDataGenerator:
                     torch.tensor(data['row_indices'], dtype=torch.long),
                     torch.tensor(data['col_indices'], dtype=torch.long),
                     torch.tensor(data['values'], dtype=torch.long),
-                    torch.stack(data['boards']),
+                    board_tensors[torch.tensor(data['boards'], dtype=torch.long)],
                     torch.tensor(data['labels'], dtype=torch.float32)
                 )
             else:
                 result[constraint_type] = (
                     torch.tensor(data['indices'], dtype=torch.long),
                     torch.tensor(data['values'], dtype=torch.long),
-                    torch.stack(data['boards']),
+                    board_tensors[torch.tensor(data['boards'], dtype=torch.long)],
                     torch.tensor(data['labels'], dtype=torch.float32)
                 )
         
         return result
     
-    def generate_naked_single_data(self, boards: List[SudokuBoard]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    def generate_naked_single_data(self, boards: List[SudokuBoard], board_tensors: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Gera dados de treinamento para o predicate NakedSingle
         """
         rows, cols, board_states, candidates_data, labels = [], [], [], [], []
         
-        for board in boards:
-            board_tensor = board.to_tensor()
+        if board_tensors is None:
+            board_tensors = self.stack_boards(boards)
+        
+        for board_index, board in enumerate(boards):
             candidates_matrix = board.get_candidates_matrix()
             
             # Verificar cada célula vazia
@@ -188,7 +210,7 @@ class SudokuTrainingDataGenerator:
                 
                 rows.append(r)
                 cols.append(c)
-                board_states.append(board_tensor)
+                board_states.append(board_index)
                 candidates_data.append(candidates_vector)
                 
                 # Label: 1.0 se é naked single (apenas 1 candidato), 0.0 caso contrário
@@ -207,19 +229,21 @@ class SudokuTrainingDataGenerator:
         return (
             torch.tensor(rows, dtype=torch.long),
             torch.tensor(cols, dtype=torch.long),
-            torch.stack(board_states),
+            board_tensors[torch.tensor(board_states, dtype=torch.long)],
             torch.stack(candidates_data),
             torch.tensor(labels, dtype=torch.float32)
         )
     
-    def generate_hidden_single_data(self, boards: List[SudokuBoard]) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    def generate_hidden_single_data(self, boards: List[SudokuBoard], board_tensors: Optional[torch.Tensor] = None) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
         """
         Gera dados de treinamento para o predicate HiddenSingle
         """
         rows, cols, values, board_states, unit_candidates_data, labels = [], [], [], [], [], []
         
-        for board in boards:
-            board_tensor = board.to_tensor()
+        if board_tensors is None:
+            board_tensors = self.stack_boards(boards)
+        
+        for board_index, board in enumerate(boards):
             
             # Verificar cada célula vazia e cada valor possível
             for r in range(self.board_size):
@@ -234,7 +258,7 @@ class SudokuTrainingDataGenerator:
                             rows.append(r)
                             cols.append(c)
                             values.append(val)
-                            board_states.append(board_tensor)
+                            board_states.append(board_index)
                             unit_candidates_data.append(unit_info)
                             
                             # Verificar se é hidden single
@@ -256,7 +280,7 @@ class SudokuTrainingDataGenerator:
             torch.tensor(rows, dtype=torch.long),
             torch.tensor(cols, dtype=torch.long),
             torch.tensor(values, dtype=torch.long),
-            torch.stack(board_states),
+            board_tensors[torch.tensor(board_states, dtype=torch.long)],
             torch.stack(unit_candidates_data),
             torch.tensor(labels, dtype=torch.float32)
         )
@@ -364,54 +388,80 @@ class SudokuTrainingDataGenerator:
         
         training_data = {}
         
+        # Empilhar os tabuleiros uma única vez para todos os predicates
+        board_tensors = self.stack_boards(boards)
+        
         print("Gerando dados para ValidCell...")
-        training_data['valid_cell'] = self.generate_valid_cell_data(boards)
+        training_data['valid_cell'] = self.generate_valid_cell_data(boards, board_tensors)
         
         print("Gerando dados para Constraints...")
-        training_data['constraints'] = self.generate_constraint_data(boards)
+        training_data['constraints'] = self.generate_constraint_data(boards, board_tensors)
         
         print("Gerando dados para NakedSingle...")
-        training_data['naked_single'] = self.generate_naked_single_data(boards)
+        training_data['naked_single'] = self.generate_naked_single_data(boards, board_tensors)
         
         print("Gerando dados para HiddenSingle...")
-        training_data['hidden_single'] = self.generate_hidden_single_data(boards)
+        training_data['hidden_single'] = self.generate_hidden_single_data(boards, board_tensors)
         
         print("Dados de treinamento gerados com sucesso!")
         return training_data
     
-    def generate_training_data_from_boards(self, boards: List[SudokuBoard], is_open_sudokus: bool = True) -> Dict[str, Tuple]:
+    def generate_training_data_from_boards(self, boards: Union[List[SudokuBoard], np.ndarray],
+                                           is_open_sudokus: Union[bool, np.ndarray] = True) -> Dict[str, Tuple]:
         """
         Gera todos os dados de treinamento a partir de uma lista de objetos SudokuBoard
         
         Args:
-            boards: lista de objetos SudokuBoard
-            is_open_sudokus: True se são sudokus abertos, False se são fechados
+            boards: lista de objetos SudokuBoard, ou array (N, n, n) int8 com os tabuleiros
+            is_open_sudokus: True se são sudokus abertos, False se são fechados, ou máscara
+                             booleana (N,) por tabuleiro quando o batch mistura os dois
             
         Returns:
             dicionário com todos os dados de treinamento
         """
-        if not boards:
+        if len(boards) == 0:
             print("Lista de tabuleiros vazia!")
             return {}
         
         print(f"Gerando dados de treinamento para {len(boards)} tabuleiros")
-        print(f"  - Tipo: {'Sudokus abertos' if is_open_sudokus else 'Sudokus fechados'}")
+        if isinstance(is_open_sudokus, np.ndarray):
+            open_count = int(np.count_nonzero(is_open_sudokus))
+            print(f"  - Tipo: {open_count} sudokus abertos, {len(boards) - open_count} fechados")
+        else:
+            print(f"  - Tipo: {'Sudokus abertos' if is_open_sudokus else 'Sudokus fechados'}")
         
         training_data = {}
         
+        # Empilhar os tabuleiros uma única vez para todos os predicates
+        board_tensors = self.stack_boards(boards)
+        if isinstance(boards, np.ndarray):
+            # As análises por tabuleiro usam visões do batch, sem copiar os dados
+            boards = [SudokuBoard.from_array(board_array) for board_array in boards]
+        
         print("Gerando dados para ValidCell...")
-        training_data['valid_cell'] = self.generate_valid_cell_data(boards)
+        training_data['valid_cell'] = self.generate_valid_cell_data(boards, board_tensors)
         
         print("Gerando dados para Constraints...")
-        training_data['constraints'] = self.generate_constraint_data(boards)
+        training_data['constraints'] = self.generate_constraint_data(boards, board_tensors)
         
         # Heurísticas só se aplicam a sudokus abertos (com células vazias)
-        if is_open_sudokus:
+        if isinstance(is_open_sudokus, np.ndarray):
+            # Batch misto: heurísticas geradas só a partir dos tabuleiros abertos
+            open_indices = np.flatnonzero(is_open_sudokus)
+            open_boards = [boards[i] for i in open_indices]
+            open_tensors = board_tensors[torch.from_numpy(open_indices)]
+            
+            print("Gerando dados para NakedSingle...")
+            training_data['naked_single'] = self.generate_naked_single_data(open_boards, open_tensors)
+            
+            print("Gerando dados para HiddenSingle...")
+            training_data['hidden_single'] = self.generate_hidden_single_data(open_boards, open_tensors)
+        elif is_open_sudokus:
             print("Gerando dados para NakedSingle...")
-            training_data['naked_single'] = self.generate_naked_single_data(boards)
+            training_data['naked_single'] = self.generate_naked_single_data(boards, board_tensors)
             
             print("Gerando dados para HiddenSingle...")
-            training_data['hidden_single'] = self.generate_hidden_single_data(boards)
+            training_data['hidden_single'] = self.generate_hidden_single_data(boards, board_tensors)
         else:
             print("⚠️  Pulando heurísticas - sudokus fechados não têm células vazias")
             # Gerar tensors vazios mas válidos para manter compatibilidade